@@ -7,9 +7,12 @@ http 接口封装
 import json
 
 from requests import Response, Session
+from requests.adapters import HTTPAdapter
 
 from conf.config import settings
 from src.utils.log_moudle import logger
+from src.utils.request_trace import get_request_tracer
+from src.utils.response_cache import CachingAdapter, ResponseCache, get_response_cache
 
 CUSTOM_USER_AGENT = "LiJiaXin/QA/ {}"
 
@@ -49,12 +52,39 @@ def logger_hook(resp: Response, *args, **kwargs) -> None:
 
 
 class BaseClient(object):
-    def __init__(self, host, timeout=10):
+    def __init__(
+        self,
+        host,
+        timeout=10,
+        response_cache: ResponseCache = None,
+        session: Session = None,
+    ):
+        """
+        :param response_cache: GET/HEAD响应缓存，默认根据配置 response_cache 决定是否开启（默认关闭）
+        :param session: 复用已有的会话（如已登录客户端的session），其适配器、钩子和请求头保持原样；
+            默认新建会话并完成配置
+        """
         self.host = host
         self.timeout = timeout
-        self.session = Session()
+        self.response_cache = (
+            response_cache if response_cache is not None else get_response_cache()
+        )
+        if session is not None:
+            self.session = session
+        else:
+            self.session = Session()
+            self._setup_session()
+
+    def _setup_session(self):
+        """配置新建的会话：挂载适配器、注册日志/追踪钩子、设置默认请求头"""
+        if self.response_cache is not None:
+            self.mount_adapter()
         if settings.get("logger_hook", True):
             self.session.hooks["response"].append(logger_hook)
+        # 配置了 request_trace 时，每次请求额外写一行JSONL追踪记录
+        tracer = get_request_tracer()
+        if tracer is not None:
+            self.session.hooks["response"].append(tracer.hook)
         # 更新 User-Agent 方便服务端日志排查
         headers = self.session.headers
         origin_user_agent = headers.get("User-Agent", "")
@@ -62,6 +92,19 @@ class BaseClient(object):
         headers["User-Agent"] = new_user_agent
         headers["Content-Type"] = "application/json; charset=utf-8"
 
+    def mount_adapter(self, **kwargs):
+        """
+        为会话挂载传输适配器，开启响应缓存时使用带缓存的适配器
+
+        :param kwargs: 传给 HTTPAdapter，如 pool_maxsize
+        """
+        if self.response_cache is not None:
+            adapter = CachingAdapter(self.response_cache, **kwargs)
+        else:
+            adapter = HTTPAdapter(**kwargs)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def request(
         self,
         method,
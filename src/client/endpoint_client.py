@@ -0,0 +1,492 @@
+"""
+根据接口描述生成客户端
+
+从声明式的YAML/字典或OpenAPI 3文档生成接口客户端类：每个接口生成一个参数签名固定的方法，
+URL模板、公共请求头、参数归属（路径/查询/请求体/请求头）在生成时确定，
+调用时只需拼接URL、组装 __slots__ 请求对象并发送，没有逐层 **kwargs 传递。
+同一份描述可以生成同步客户端和异步客户端（async def 方法，请求在线程池中发送）。
+
+接口描述格式：
+    base_path: /api
+    headers:                      # 所有接口的公共请求头
+      X-Client: qa
+    endpoints:
+      add_product:
+        method: POST
+        path: /product/add
+        body: [name, price, type, subtype, description, status]   # JSON请求体字段
+        required: [name, price, type, subtype]                    # 必填参数，其余为仅限关键字参数
+        defaults: {status: 2}
+      get_product:
+        method: GET
+        path: /product/{product_id}                               # 路径参数自动识别且必填
+        query: [fields]
+        headers: {Accept: application/json}
+        header_params: {trace_id: X-Trace-Id}                     # 参数名 -> 请求头
+
+使用说明：
+    from src.client.endpoint_client import generate_client
+
+    ProductApi = generate_client("conf/product_api.yaml")
+    api = ProductApi("http://localhost:5000")
+    api.add_product("商品", 9.9, "book", "novel")
+    api.get_product(1, fields="name")
+
+    AsyncProductApi = generate_client("conf/product_api.yaml", asynchronous=True)
+    async with AsyncProductApi("http://localhost:5000") as api:
+        await asyncio.gather(*(api.get_product(i) for i in range(10)))
+
+    # OpenAPI文档：方法名取 operationId（转为下划线风格），没有时为 方法_路径
+    PetApi = generate_client("petstore.yaml")
+"""
+
+import asyncio
+import keyword
+import re
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple, Type, Union
+from urllib.parse import quote
+
+from requests import Session
+
+from src.client.base_client import BaseClient
+from src.utils.openapi import OpenAPISpec, get_base_path, load_openapi_spec
+from src.utils.response_cache import ResponseCache
+from src.utils.retry_policy import RetryPolicy
+
+_PATH_PARAM = re.compile(r"{([^{}]+)}")
+
+
+class _Unset(object):
+    """未传入的可选参数"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "UNSET"
+
+
+UNSET = _Unset()
+
+
+def python_name(name: str) -> str:
+    """把接口描述中的名称转为合法的Python参数/方法名，如 productId -> product_id、from -> from_"""
+    name = re.sub(r"(?<=[a-z0-9])([A-Z])", r"_\1", name)
+    name = re.sub(r"[\W_]+", "_", name).strip("_").lower() or "param"
+    if name[0].isdigit():
+        name = f"_{name}"
+    if keyword.iskeyword(name):
+        name = f"{name}_"
+    return name
+
+
+class EndpointRequest(object):
+    """一次接口调用的请求"""
+
+    __slots__ = ("endpoint", "method", "url", "params", "json", "headers")
+
+    def __init__(self, endpoint, method, url, params, json, headers):
+        self.endpoint = endpoint
+        self.method = method
+        self.url = url
+        self.params = params
+        self.json = json
+        self.headers = headers
+
+    def __repr__(self):
+        return f"EndpointRequest({self.method} {self.url})"
+
+
+class Endpoint(object):
+    """一个接口的描述"""
+
+    __slots__ = (
+        "name",
+        "method",
+        "path",
+        "path_params",
+        "query_params",
+        "body_params",
+        "header_params",
+        "raw_body",
+        "required",
+        "defaults",
+        "headers",
+        "label",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        method: str,
+        path: str,
+        query: List[str] = None,
+        body: List[str] = None,
+        header_params: Dict[str, str] = None,
+        raw_body: bool = False,
+        required: List[str] = None,
+        defaults: Dict[str, Any] = None,
+        headers: Dict[str, str] = None,
+    ):
+        """
+        Args:
+            name: 方法名
+            method: HTTP方法
+            path: 路径模板，如 /product/{product_id}
+            query: 查询参数
+            body: JSON请求体字段
+            header_params: 参数名 -> 请求头名称
+            raw_body: 请求体不是对象（如数组）时为True，整个请求体通过 body 参数传入
+            required: 必填参数，路径参数总是必填
+            defaults: 可选参数的默认值
+            headers: 该接口固定的请求头
+        """
+        self.name = python_name(name)
+        self.method = method.upper()
+        self.path = path
+        self.path_params = _PATH_PARAM.findall(path)
+        self.query_params = list(query or [])
+        self.body_params = ["body"] if raw_body else list(body or [])
+        self.header_params = dict(header_params or {})
+        self.raw_body = raw_body
+        self.required = set(required or []) | set(self.path_params)
+        if raw_body and "body" in (required or []):
+            self.required.add("body")
+        self.defaults = dict(defaults or {})
+        self.headers = dict(headers or {})
+        # 重试统计等使用的接口名
+        self.label = f"{self.method} {path}"
+
+    def params(self) -> List[Tuple[str, str, str]]:
+        """(接口中的参数名, Python参数名, 位置) 列表，位置为 path/query/body/header"""
+        params = []
+        seen = set()
+        for location, names in (
+            ("path", self.path_params),
+            ("query", self.query_params),
+            ("body", self.body_params),
+            ("header", list(self.header_params)),
+        ):
+            for name in names:
+                arg = python_name(name)
+                if arg in seen or arg in ("self", "headers", "kwargs"):
+                    raise ValueError(f"接口 {self.name} 的参数名重复或不可用: {name}")
+                seen.add(arg)
+                params.append((name, arg, location))
+        return params
+
+
+def _endpoint_from_dict(name: str, config: Dict) -> Endpoint:
+    return Endpoint(
+        name,
+        config.get("method", "GET"),
+        config["path"],
+        query=config.get("query"),
+        body=config.get("body"),
+        header_params=config.get("header_params"),
+        raw_body=config.get("raw_body", False),
+        required=config.get("required"),
+        defaults=config.get("defaults"),
+        headers=config.get("headers"),
+    )
+
+
+def _endpoints_from_openapi(spec: Dict) -> List[Endpoint]:
+    api = OpenAPISpec(spec)
+    endpoints = []
+    for method, path, operation in api.iter_operations():
+        name = operation.get("operationId") or f"{method}_{path}"
+        path_item = api.resolve(spec["paths"][path])
+        query, header_params, required = [], {}, []
+        for param in (path_item.get("parameters") or []) + (
+            operation.get("parameters") or []
+        ):
+            param = api.resolve(param)
+            location = param.get("in")
+            if location == "query":
+                query.append(param["name"])
+            elif location == "header":
+                header_params[python_name(param["name"])] = param["name"]
+            else:
+                continue
+            if param.get("required"):
+                required.append(param["name"])
+
+        body, raw_body = [], False
+        request_body = api.resolve(operation.get("requestBody")) or {}
+        content = request_body.get("content") or {}
+        if content:
+            media_type = next(
+                (ct for ct in content if "json" in ct), next(iter(content))
+            )
+            schema = api.resolve((content[media_type] or {}).get("schema")) or {}
+            if schema.get("type", "object") == "object" and schema.get("properties"):
+                body = list(schema["properties"])
+                required.extend(schema.get("required") or [])
+            else:
+                raw_body = True
+                if request_body.get("required"):
+                    required.append("body")
+
+        endpoints.append(
+            Endpoint(
+                name,
+                method,
+                path,
+                query=query,
+                body=body,
+                header_params=header_params,
+                raw_body=raw_body,
+                required=[
+                    python_name(item) if item in header_params.values() else item
+                    for item in required
+                ],
+            )
+        )
+    return endpoints
+
+
+def load_endpoints(
+    spec: Union[str, Path, Dict],
+) -> Tuple[str, Dict[str, str], List[Endpoint]]:
+    """
+    加载接口描述
+
+    Args:
+        spec: 声明式描述或OpenAPI 3文档，文件路径（.json/.yaml/.yml）或已解析的字典
+
+    Returns:
+        (路径前缀, 公共请求头, 接口列表)
+    """
+    spec = load_openapi_spec(spec)
+    if "openapi" in spec:
+        return get_base_path(spec), {}, _endpoints_from_openapi(spec)
+    endpoints = [
+        _endpoint_from_dict(name, config)
+        for name, config in (spec.get("endpoints") or {}).items()
+    ]
+    return (
+        (spec.get("base_path") or "").rstrip("/"),
+        spec.get("headers") or {},
+        endpoints,
+    )
+
+
+def _method_source(endpoint: Endpoint, asynchronous: bool) -> str:
+    """生成接口方法的源码"""
+    params = endpoint.params()
+    required = [arg for name, arg, _ in params if name in endpoint.required]
+    optional = [
+        f"{arg}=_defaults[{name!r}]" if name in endpoint.defaults else f"{arg}=UNSET"
+        for name, arg, _ in params
+        if name not in endpoint.required
+    ]
+    signature = ", ".join(
+        ["self", *required, "*", *optional, "headers=None", "**kwargs"]
+    )
+
+    # 拼接URL：字面量部分在生成时确定，路径参数做URL编码
+    url_parts = ["self.base_url"]
+    pos = 0
+    for match in _PATH_PARAM.finditer(endpoint.path):
+        if match.start() > pos:
+            url_parts.append(repr(endpoint.path[pos : match.start()]))
+        url_parts.append(f"_quote(str({python_name(match.group(1))}), safe='')")
+        pos = match.end()
+    if pos < len(endpoint.path):
+        url_parts.append(repr(endpoint.path[pos:]))
+
+    lines = [
+        f"{'async ' if asynchronous else ''}def {endpoint.name}({signature}):",
+        f"    _url = {' + '.join(url_parts)}",
+    ]
+
+    def add_fields(var: str, location: str):
+        fields = [(name, arg) for name, arg, loc in params if loc == location]
+        if not fields:
+            lines.append(f"    {var} = None")
+            return
+        lines.append(
+            f"    {var} = {{"
+            + ", ".join(
+                f"{name!r}: {arg}" for name, arg in fields if name in endpoint.required
+            )
+            + "}"
+        )
+        for name, arg in fields:
+            if name not in endpoint.required:
+                lines.append(f"    if {arg} is not UNSET:")
+                lines.append(f"        {var}[{name!r}] = {arg}")
+
+    add_fields("_params", "query")
+    if endpoint.raw_body:
+        lines.append("    _body = None if body is UNSET else body")
+    else:
+        add_fields("_body", "body")
+
+    # 请求头：没有请求头参数且调用方未传headers时直接使用生成时合并好的公共请求头
+    header_fields = [
+        (endpoint.header_params[name], arg)
+        for name, arg, loc in params
+        if loc == "header"
+    ]
+    lines.append(
+        "    _request_headers = _headers if headers is None else {**_headers, **headers}"
+    )
+    for header, arg in header_fields:
+        lines.append(f"    if {arg} is not UNSET:")
+        lines.append("        if _request_headers is _headers:")
+        lines.append("            _request_headers = dict(_headers)")
+        lines.append(f"        _request_headers[{header!r}] = str({arg})")
+
+    lines.append(
+        f"    _request = _Request(_endpoint, {endpoint.method!r}, _url, _params, _body,"
+        " _request_headers)"
+    )
+    lines.append(
+        f"    return {'await ' if asynchronous else ''}self._send(_request, kwargs)"
+    )
+    return "\n".join(lines)
+
+
+def _make_method(endpoint: Endpoint, common_headers: Dict, asynchronous: bool):
+    namespace = {
+        "UNSET": UNSET,
+        "_quote": quote,
+        "_Request": EndpointRequest,
+        "_endpoint": endpoint,
+        "_defaults": endpoint.defaults,
+        "_headers": {**common_headers, **endpoint.headers},
+    }
+    source = _method_source(endpoint, asynchronous)
+    exec(compile(source, f"<endpoint {endpoint.name}>", "exec"), namespace)
+    method = namespace[endpoint.name]
+    method.__doc__ = f"{endpoint.method} {endpoint.path}"
+    method.__source__ = source
+    return method
+
+
+class EndpointClient(BaseClient):
+    """生成的同步客户端的基类"""
+
+    base_path = ""
+    endpoints: Dict[str, Endpoint] = {}
+
+    def __init__(
+        self,
+        host: str,
+        timeout: float = 10,
+        session: Session = None,
+        retry_policy: RetryPolicy = None,
+        response_class: Callable = None,
+        response_cache: ResponseCache = None,
+    ):
+        """
+        Args:
+            host: 服务地址
+            timeout: 超时时间（秒）
+            session: 复用已有的会话（如已登录的FlaskClient.session），默认新建
+            retry_policy: 重试策略，默认不重试
+            response_class: 响应包装类，如 FlaskValidatable，默认返回 requests.Response
+            response_cache: GET/HEAD响应缓存，见 BaseClient；复用会话时沿用该会话的设置
+        """
+        super(EndpointClient, self).__init__(host, timeout, response_cache, session)
+        self._own_session = session is None
+        self.base_url = host.rstrip("/") + self.base_path
+        self.retry_policy = retry_policy
+        self.response_class = response_class
+
+    def _send(self, request: EndpointRequest, kwargs: Dict):
+        kwargs.setdefault("timeout", self.timeout)
+        if self.retry_policy is None:
+            resp = self.session.request(
+                request.method,
+                request.url,
+                params=request.params,
+                json=request.json,
+                headers=request.headers,
+                **kwargs,
+            )
+        else:
+            resp = self.retry_policy.call(
+                request.endpoint.label,
+                self.session.request,
+                request.method,
+                request.url,
+                params=request.params,
+                json=request.json,
+                headers=request.headers,
+                **kwargs,
+            )
+        return resp if self.response_class is None else self.response_class(resp)
+
+
+class AsyncEndpointClient(EndpointClient):
+    """生成的异步客户端的基类，请求在线程池中发送，不阻塞事件循环"""
+
+    def __init__(self, host: str, max_workers: int = 10, **kwargs):
+        """
+        Args:
+            host: 服务地址
+            max_workers: 发送请求的线程数，即最大并发请求数
+            kwargs: 见 EndpointClient
+        """
+        super(AsyncEndpointClient, self).__init__(host, **kwargs)
+        if kwargs.get("session") is None:
+            # 连接池大小与线程数一致，并发请求时连接可以复用
+            self.mount_adapter(pool_maxsize=max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix=self.__class__.__name__
+        )
+
+    async def _send(self, request: EndpointRequest, kwargs: Dict):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, super(AsyncEndpointClient, self)._send, request, kwargs
+        )
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        if self._own_session:
+            self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+def generate_client(
+    spec: Union[str, Path, Dict],
+    class_name: str = None,
+    asynchronous: bool = False,
+    base_class: Type[EndpointClient] = None,
+) -> Type[EndpointClient]:
+    """
+    根据接口描述生成客户端类
+
+    Args:
+        spec: 声明式描述或OpenAPI 3文档（路径或字典）
+        class_name: 类名，默认为 GeneratedClient / AsyncGeneratedClient
+        asynchronous: 是否生成异步客户端（方法为 async def）
+        base_class: 基类，默认为 EndpointClient / AsyncEndpointClient
+
+    Returns:
+        客户端类
+    """
+    base_path, common_headers, endpoints = load_endpoints(spec)
+    base_class = base_class or (AsyncEndpointClient if asynchronous else EndpointClient)
+    namespace: Dict[str, Any] = {
+        "base_path": base_path,
+        "endpoints": {endpoint.name: endpoint for endpoint in endpoints},
+    }
+    for endpoint in endpoints:
+        if endpoint.name in namespace or hasattr(base_class, endpoint.name):
+            raise ValueError(f"接口方法名重复或与客户端方法冲突: {endpoint.name}")
+        namespace[endpoint.name] = _make_method(endpoint, common_headers, asynchronous)
+    class_name = class_name or (
+        "AsyncGeneratedClient" if asynchronous else "GeneratedClient"
+    )
+    return type(class_name, (base_class,), namespace)
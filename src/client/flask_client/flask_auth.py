@@ -1,12 +1,154 @@
+"""
+Flask服务的JWT鉴权
 
+同一进程内相同 host + account + 密码 的客户端共享一个 FlaskToken：第一次发请求时才登录，
+根据JWT的exp字段在token过期前自动重新登录；传入 TokenCache 时同一台机器上的多个进程共享token。
+接口返回401时丢弃当前token（包括缓存中的），下次请求重新登录
+
+使用方式:
+    token = FlaskToken(login=lambda: client.login().get_data_result_expression("token"))
+    session.auth = FlaskAuth(token)
+"""
+
+import base64
+import json
+import threading
+import time
+from functools import partial
+from typing import Callable, Dict, Optional, Tuple, Union
 
 from requests.auth import AuthBase
+
+from conf.constants import Config
 from src.utils.log_moudle import logger
+from src.utils.token_cache import TokenCache
+
+# token中没有exp字段时使用的有效期（秒），与服务端的 JWT_ACCESS_TOKEN_EXPIRES 一致
+DEFAULT_TOKEN_TTL = Config.JWT_ACCESS_TOKEN_EXPIRES.total_seconds()
+
+
+def jwt_expires_at(token: str) -> Optional[float]:
+    """读取JWT payload中的exp（不校验签名），无法解析时返回None"""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return None
+
+
+class FlaskToken(object):
+    """懒加载并自动刷新的JWT，多线程共享时只会有一个线程去登录"""
+
+    def __init__(
+        self,
+        login: Callable[[], str],
+        refresh_margin: float = 60,
+        default_ttl: float = DEFAULT_TOKEN_TTL,
+        cache: TokenCache = None,
+        cache_key: Tuple[str, str, str] = None,
+    ):
+        """
+        :param login: 登录并返回token的函数
+        :param refresh_margin: 提前多少秒刷新token，token有效期较短时最多提前一半有效期
+        :param default_ttl: token中没有exp字段时的有效期（秒）
+        :param cache: 跨进程的token缓存，为None时只在当前进程内共享
+        :param cache_key: 缓存键 (host, account, 密码摘要)
+        """
+        if cache is not None and cache_key is None:
+            raise ValueError(
+                "使用token缓存时需要指定 cache_key=(host, account, 密码摘要)"
+            )
+        self.login = login
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.cache = cache
+        self.cache_key = cache_key
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self.login_count = 0
+        self._lock = threading.Lock()
+
+    def _need_refresh(self) -> bool:
+        return self.token is None or time.time() >= self.refresh_at
+
+    def get(self) -> str:
+        """返回有效的token，未登录或即将过期时先登录"""
+        # 只读取一次 self.token：其他线程可能同时调用 invalidate() 把它置为None
+        token = self.token
+        if token is None or time.time() >= self.refresh_at:
+            with self._lock:
+                if self._need_refresh():
+                    self.refresh()
+                token = self.token
+        return token
+
+    def refresh(self):
+        """获取新token：优先读取其他进程缓存的token，没有时重新登录"""
+        if self.cache is not None:
+            host, account, credential = self.cache_key
+            entry = self.cache.get_or_login(
+                host, account, self._login, credential=credential
+            )
+        else:
+            entry = self._login()
+        self.token = entry["token"]
+        self.expires_at = entry["expires_at"]
+        self.refresh_at = entry["refresh_at"]
+
+    def _login(self) -> Dict:
+        now = time.time()
+        token = self.login()
+        expires_at = jwt_expires_at(token) or now + self.default_ttl
+        self.login_count += 1
+        logger.debug(
+            f"已获取token，{expires_at - now:.0f}秒后过期，第{self.login_count}次登录"
+        )
+        return {
+            "token": token,
+            "expires_at": expires_at,
+            "refresh_at": expires_at - min(self.refresh_margin, (expires_at - now) / 2),
+        }
+
+    def invalidate(self, token: str = None):
+        """
+        丢弃当前token（包括缓存中的），下次请求时重新登录
+
+        :param token: 只有当前仍是该token时才丢弃，避免并发请求收到401时丢掉其他线程刚登录得到的token
+        """
+        with self._lock:
+            if self.token is None or (token is not None and token != self.token):
+                return
+            if self.cache is not None:
+                host, account, credential = self.cache_key
+                self.cache.invalidate(
+                    host, account, token=self.token, credential=credential
+                )
+            self.token = None
+
 
 class FlaskAuth(AuthBase):
-    def __init__(self, jwt_token):
+    def __init__(self, jwt_token: Union[str, FlaskToken]):
+        """
+        :param jwt_token: 固定的token字符串，或者 FlaskToken（每次请求时取当前有效的token）
+        """
         self.jwt_token = jwt_token
 
     def __call__(self, r):
-        r.headers['Authorization'] = f'Bearer {self.jwt_token}'
-        return r
\ No newline at end of file
+        token = (
+            self.jwt_token.get()
+            if isinstance(self.jwt_token, FlaskToken)
+            else self.jwt_token
+        )
+        r.headers["Authorization"] = f"Bearer {token}"
+        if isinstance(self.jwt_token, FlaskToken):
+            r.register_hook("response", partial(self._handle_401, token))
+        return r
+
+    def _handle_401(self, token: str, resp, *args, **kwargs):
+        # token已失效（服务端注销、密钥轮换等），丢弃后下次请求重新登录
+        if resp.status_code == 401:
+            logger.debug(f"接口返回401，丢弃token: {resp.request.url}")
+            self.jwt_token.invalidate(token)
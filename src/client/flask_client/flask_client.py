@@ -1,25 +1,122 @@
-from requests.exceptions import RequestException
-from retry import retry
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
 from conf.config import settings
+from src.client.base_auth import BaseAuth
 from src.client.base_client import BaseClient
-from src.client.flask_client.flask_auth import FlaskAuth
+from src.client.flask_client.exceptions import FlaskClientException
+from src.client.flask_client.flask_auth import FlaskAuth, FlaskToken
 from src.client.flask_client.flask_validatable import FlaskValidatable
 from src.utils.log_moudle import logger
+from src.utils.retry_policy import RetryPolicy, retry_budget, retry_metrics
+from src.utils.token_cache import TOKEN_CACHE_DIR, TokenCache
 
-config = settings.flask
+# (host, account, 密码摘要) -> 进程内共享的token
+_tokens: Dict[Tuple[str, str, str], FlaskToken] = {}
+# (host, account, 密码摘要) -> 进程内共享的客户端
+_clients: Dict[Tuple[str, str, str], "FlaskClient"] = {}
+_registry_lock = threading.Lock()
+
+
+def _credential_key(host: str, account: str, password: str) -> Tuple[str, str, str]:
+    """共享token/客户端的键，包含密码摘要：密码不同的客户端不会复用彼此的登录态"""
+    digest = hashlib.blake2b(str(password).encode("utf-8"), digest_size=16).hexdigest()
+    return host, account, digest
+
+
+# 业务接口描述，用于生成 FlaskClient.api
+FLASK_API_SPEC = Path(__file__).with_name("flask_api.yaml")
+
+
+@lru_cache(maxsize=None)
+def flask_api_class(asynchronous: bool = False):
+    """根据 flask_api.yaml 生成的接口客户端类（第一次使用时生成）"""
+    from src.client.endpoint_client import generate_client
+
+    return generate_client(
+        FLASK_API_SPEC,
+        "AsyncFlaskApi" if asynchronous else "FlaskApi",
+        asynchronous=asynchronous,
+    )
+
+
+def _default_token_cache() -> Optional[TokenCache]:
+    """
+    默认的跨进程token缓存，token会落盘并在多次运行之间复用，需要环境变量
+    FLASK_TOKEN_CACHE=1 开启，FLASK_TOKEN_CACHE_DIR 指定缓存目录
+    """
+    if os.getenv("FLASK_TOKEN_CACHE", "0").lower() not in ("1", "true", "yes"):
+        return None
+    return TokenCache(os.getenv("FLASK_TOKEN_CACHE_DIR") or TOKEN_CACHE_DIR)
 
 
 class FlaskClient(BaseClient):
 
-    def __init__(self, host, account, password, timeout=10):
-        super(FlaskClient, self).__init__(host, timeout)
+    def __init__(
+        self,
+        host,
+        account,
+        password,
+        timeout=10,
+        token_cache=None,
+        retry_policy=None,
+        response_cache=None,
+    ):
+        """
+        :param token_cache: 跨进程的token缓存，默认见 _default_token_cache（默认关闭）
+        :param retry_policy: send_requests 的重试策略，默认最多请求3次，
+            所有客户端共享重试预算和统计
+        :param response_cache: GET/HEAD响应缓存，默认见 BaseClient
+        """
+        super(FlaskClient, self).__init__(host, timeout, response_cache)
         self.account = account
         self.password = password
-        # 根据用户名进行登录,获取jwk鉴权信息
-        jwt_token = self.login().get_data_result_expression("token")
-        self.session.auth = FlaskAuth(jwt_token)
+        self.retry_policy = retry_policy or RetryPolicy(
+            budget=retry_budget, metrics=retry_metrics
+        )
+        # 同一进程内相同 host + account + 密码 共享token，第一次请求时才登录获取jwt鉴权信息；
+        # 开启token缓存时，同一台机器上的多个进程（如xdist worker）只登录一次
+        key = _credential_key(host, account, password)
+        with _registry_lock:
+            self.token = _tokens.get(key)
+            if self.token is None:
+                self.token = _tokens[key] = FlaskToken(
+                    self._login_token,
+                    cache=token_cache or _default_token_cache(),
+                    cache_key=key,
+                )
+        self.session.auth = FlaskAuth(self.token)
         self.resp: FlaskValidatable = None
+        self._api = None
+
+    @property
+    def api(self):
+        """
+        根据 flask_api.yaml 生成的接口客户端，与当前客户端共享会话（登录态）和重试策略，
+        参数签名固定，调用开销比手写的业务方法小：
+            flask_clinet.api.add_product("商品", 9.9, "book", "novel", status=1)
+        """
+        if self._api is None:
+            self._api = flask_api_class()(
+                self.host,
+                self.timeout,
+                session=self.session,
+                retry_policy=self.retry_policy,
+                response_class=FlaskValidatable,
+            )
+        return self._api
+
+    def _login_token(self) -> str:
+        token = self.login().get_data_result_expression("token")
+        if not token:
+            raise FlaskClientException(
+                f"登录失败，未获取到token: {self.account}@{self.host}"
+            )
+        return token
 
     def request(
         self,
@@ -31,7 +128,7 @@ class FlaskClient(BaseClient):
         headers=None,
         auth=None,
         *args,
-        **kwargs
+        **kwargs,
     ):
         url = self.host + path
         resp = self.session.request(
@@ -43,7 +140,7 @@ class FlaskClient(BaseClient):
             headers=headers,
             auth=auth,
             *args,
-            **kwargs
+            **kwargs,
         )
         self.resp = FlaskValidatable(resp)
         return self.resp
@@ -57,7 +154,7 @@ class FlaskClient(BaseClient):
         headers=None,
         auth=None,
         *args,
-        **kwargs
+        **kwargs,
     ):
         return self.request(
             "GET",
@@ -68,7 +165,7 @@ class FlaskClient(BaseClient):
             headers=headers,
             auth=auth,
             *args,
-            **kwargs
+            **kwargs,
         )
 
     def post(
@@ -80,7 +177,7 @@ class FlaskClient(BaseClient):
         headers=None,
         auth=None,
         *args,
-        **kwargs
+        **kwargs,
     ):
         return self.request(
             "POST",
@@ -91,7 +188,7 @@ class FlaskClient(BaseClient):
             headers=headers,
             auth=auth,
             *args,
-            **kwargs
+            **kwargs,
         )
 
     def put(
@@ -103,7 +200,7 @@ class FlaskClient(BaseClient):
         headers=None,
         auth=None,
         *args,
-        **kwargs
+        **kwargs,
     ):
         return self.request(
             "PUT",
@@ -114,11 +211,10 @@ class FlaskClient(BaseClient):
             headers=headers,
             auth=auth,
             *args,
-            **kwargs
+            **kwargs,
         )
 
-    # send_requests函数,增加重试功能,当状态码!=200时,重试3次
-    @retry(tries=3, delay=10, exceptions=(RequestException))
+    # send_requests函数,增加重试功能：连接失败、超时或状态码为429/502/503/504时，按退避策略重试
     def send_requests(
         self,
         method,
@@ -129,22 +225,26 @@ class FlaskClient(BaseClient):
         headers=None,
         auth=None,
         *args,
-        **kwargs
+        **kwargs,
     ):
         url = self.host + path
-        return self.request(
+        # 重试的是原始请求，最后一次的响应才解析为 FlaskValidatable（网关返回的错误页不是json）
+        kwargs.setdefault("timeout", self.timeout)
+        resp = self.retry_policy.call(
+            f"{method.upper()} {path}",
+            self.session.request,
             method,
-            # url=url,
-            path=path,
+            url=url,
             params=params,
             data=data,
             json=json,
             headers=headers,
             auth=auth,
             *args,
-            **kwargs
+            **kwargs,
         )
-        # return self.session.request(method, url=url, params=params, data=data, json=json, headers=headers,auth=auth ,*args,**kwargs)
+        self.resp = FlaskValidatable(resp)
+        return self.resp
 
     # 登录接口
     def login(self, username: str = None, password: str = None):
@@ -152,8 +252,11 @@ class FlaskClient(BaseClient):
             username = self.account
         if not password:
             password = self.password
+        # 登录请求本身不带token
         return self.post(
-            "/api/user/login", json={"username": username, "password": password}
+            "/api/user/login",
+            json={"username": username, "password": password},
+            auth=BaseAuth(),
         )
 
     # 查询当前用户信息接口
@@ -168,7 +271,7 @@ class FlaskClient(BaseClient):
         email: str,
         access: int = 1,
         other_info: dict = None,
-        **kwargs
+        **kwargs,
     ):
         body = {
             "username": username,
@@ -188,7 +291,7 @@ class FlaskClient(BaseClient):
         email: str = None,
         access: int = 1,
         other_info: dict = None,
-        **kwargs
+        **kwargs,
     ):
         body = {
             "username": username,
@@ -202,7 +305,10 @@ class FlaskClient(BaseClient):
 
     # 退出登录
     def logout(self):
-        return self.send_requests("POST", "/api/user/logout")
+        resp = self.send_requests("POST", "/api/user/logout")
+        # 服务端已注销该token，其他客户端和进程需要重新登录
+        self.token.invalidate()
+        return resp
 
     # 添加商品信息
     def add_product(
@@ -214,7 +320,7 @@ class FlaskClient(BaseClient):
         description: str = None,
         status: int = 2,
         other_info: dict = None,
-        **kwargs
+        **kwargs,
     ):
         body = {
             "name": name,
@@ -239,7 +345,7 @@ class FlaskClient(BaseClient):
         description: str = None,
         status: int = 2,
         other_info: dict = None,
-        **kwargs
+        **kwargs,
     ):
         body = {
             "name": name,
@@ -266,19 +372,69 @@ class FlaskClient(BaseClient):
         type_: str = None,
         subtype: str = None,
         status: int = None,
-        **kwargs
+        **kwargs,
     ):
         return self.send_requests(
             "POST",
             "/api/product/search",
             json={"name": name, "type": type_, "subtype": subtype, "status": status},
-            **kwargs
+            **kwargs,
         )
 
 
-flask_clinet = FlaskClient(
-    host=config.HOST, account=config.ACCOUNT, password=config.PASSWORD
-)
+def get_flask_client(account=None, password=None, host=None) -> FlaskClient:
+    """
+    返回进程内共享的FlaskClient，相同 host + account + 密码 只创建一个，创建时不登录
+
+    :param account: 账号，默认使用配置 flask.ACCOUNT / flask.PASSWORD
+    :param password: 密码
+    :param host: 服务地址，默认使用配置 flask.HOST
+    """
+    if host is None or account is None:
+        config = settings.flask
+        host = host or config.HOST
+        if account is None:
+            account, password = config.ACCOUNT, config.PASSWORD
+    key = _credential_key(host, account, password)
+    client = _clients.get(key)
+    if client is None:
+        client = FlaskClient(host=host, account=account, password=password)
+        with _registry_lock:
+            client = _clients.setdefault(key, client)
+    return client
+
+
+def reset_flask_clients():
+    """清空进程内共享的客户端和token，如切换环境后"""
+    with _registry_lock:
+        _clients.clear()
+        _tokens.clear()
+
+
+class _LazyFlaskClient(object):
+    """
+    第一次访问属性时才创建的FlaskClient
+
+    导入本模块时不读取 flask 配置，未配置或后端不可用时收集用例不受影响
+    """
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> FlaskClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = self._factory()
+        return self._client
+
+    def __getattr__(self, name):
+        return getattr(self._get_client(), name)
+
+
+flask_clinet = _LazyFlaskClient(get_flask_client)
 
 if __name__ == "__main__":
     flask_clinet.login()
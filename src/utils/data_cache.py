@@ -0,0 +1,145 @@
+"""
+解析结果缓存模块
+
+将YAML/Excel等解析较慢的数据文件的解析结果以pickle二进制格式缓存到磁盘，
+以 文件路径 + 修改时间 + 内容哈希 判断缓存是否有效，文件变化后自动失效。
+缓存目录默认位于项目根目录的 .cache/data_driver 下，多个xdist worker共享同一份缓存。
+
+使用说明：
+    from src.utils.data_cache import DataCache
+
+    cache = DataCache("/tmp/cache")
+    data = cache.get_or_load(Path("data/cases.yaml"), lambda: yaml.safe_load(...))
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+from filelock import FileLock
+
+from src.utils.log_moudle import logger
+
+# 缓存格式版本，格式变化时递增，旧缓存自动失效
+CACHE_VERSION = 1
+
+
+def file_digest(file_path: Union[str, Path], chunk_size: int = 1024 * 1024) -> str:
+    """分块计算文件内容的哈希值"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DataCache:
+    """数据文件解析结果的磁盘缓存"""
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir)
+        self.logger = logger
+
+    def _cache_file(self, file_path: Path, variant: str) -> Path:
+        key = hashlib.blake2b(
+            f"{CACHE_VERSION}|{file_path.resolve()}|{variant}".encode("utf-8"),
+            digest_size=16,
+        ).hexdigest()
+        return self.cache_dir / f"{key}.pkl"
+
+    @staticmethod
+    def _read(cache_file: Path, with_data: bool = True) -> Tuple[Optional[dict], Any]:
+        """读取缓存文件，文件头为元信息，其后为数据；读取失败时返回 (None, None)"""
+        try:
+            with open(cache_file, "rb") as file:
+                meta = pickle.load(file)
+                data = pickle.load(file) if with_data else None
+            return meta, data
+        except Exception:
+            return None, None
+
+    def _write(self, cache_file: Path, meta: dict, data: Any):
+        """原子写入缓存文件，其他进程不会读到写了一半的文件"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(meta, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(data, file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            self.logger.warning(f"写入数据缓存失败: {cache_file}, 错误: {e}")
+
+    def get_or_load(
+        self, file_path: Union[str, Path], loader: Callable[[], Any], variant: str = ""
+    ) -> Any:
+        """
+        读取缓存，缓存无效时调用loader解析并写入缓存
+
+        判断顺序：
+            1. 修改时间和文件大小与缓存一致 -> 直接命中，无需读取源文件
+            2. 内容哈希与缓存一致（如git切换分支导致修改时间变化）-> 命中并刷新元信息
+            3. 其他情况 -> 加文件锁重新解析，其他进程等待后直接复用结果
+
+        Args:
+            file_path: 数据文件路径
+            loader: 解析函数
+            variant: 区分同一文件的不同解析方式，如工作表名称、编码
+
+        Returns:
+            解析结果
+        """
+        file_path = Path(file_path)
+        cache_file = self._cache_file(file_path, variant)
+
+        stat = os.stat(file_path)
+        meta, data = self._read(cache_file)
+        if meta and (meta["mtime_ns"], meta["size"]) == (
+            stat.st_mtime_ns,
+            stat.st_size,
+        ):
+            return data
+
+        with FileLock(f"{cache_file}.lock"):
+            # 等锁期间可能已有其他进程写好了缓存
+            meta, data = self._read(cache_file)
+            if meta and (meta["mtime_ns"], meta["size"]) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                return data
+
+            digest = file_digest(file_path)
+            new_meta = {
+                "path": str(file_path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+            }
+            if meta and meta.get("digest") == digest:
+                self._write(cache_file, new_meta, data)
+                return data
+
+            data = loader()
+            self._write(cache_file, new_meta, data)
+            self.logger.debug(f"已缓存数据文件解析结果: {file_path}")
+            return data
+
+    def clear(self):
+        """清空缓存目录"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.logger.info(f"数据缓存已清空: {self.cache_dir}")
@@ -5,39 +5,106 @@
 """
 
 import csv
+import hashlib
 import json
 import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, Generator, List, Optional, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
 
-import pandas as pd
+import click
 import yaml
-from faker import Faker
 
+from src.utils.data_cache import DataCache
 from src.utils.log_moudle import logger
 
+# pandas、Faker 导入较慢（合计约0.4秒），只在读写Excel/CSV、生成数据时才导入，
+# 避免 data_plugin 让每次pytest收集都付出这部分开销
+if TYPE_CHECKING:
+    import pyarrow as pa
+    from faker import Faker
+
+# 优先使用libyaml的C实现，解析速度约为纯Python实现的数倍；未编译libyaml时回退
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as YamlLoader
+
+
+def yaml_load(stream) -> Any:
+    """按safe_load的语义解析YAML（不构造任意Python对象）"""
+    return yaml.load(stream, Loader=YamlLoader)
+
 
 class DataDriver:
     """数据驱动测试类"""
 
-    def __init__(self, data_dir: str = "data"):
+    def __init__(
+        self, data_dir: str = "data", use_cache: bool = None, cache_dir: str = None
+    ):
         """
         初始化数据驱动器
 
         Args:
             data_dir: 数据文件目录
+            use_cache: 是否缓存YAML/Excel的解析结果，默认开启，
+                可通过环境变量 DATA_DRIVER_CACHE=0 关闭
+            cache_dir: 缓存目录，默认为环境变量 DATA_DRIVER_CACHE_DIR
+                或项目根目录下的 .cache/data_driver
         """
+        project_root = self._find_project_root()
         # 确保data_dir是绝对路径
         if not os.path.isabs(data_dir):
-            # 获取项目根目录
-            project_root = self._find_project_root()
             self.data_dir = Path(project_root) / data_dir
         else:
             self.data_dir = Path(data_dir)
 
-        self.faker = Faker("zh_CN")  # 中文数据生成器
+        if use_cache is None:
+            use_cache = os.getenv("DATA_DRIVER_CACHE", "1").lower() not in (
+                "0",
+                "false",
+                "no",
+            )
+        cache_dir = cache_dir or os.getenv("DATA_DRIVER_CACHE_DIR")
+        self.cache: Optional[DataCache] = (
+            DataCache(cache_dir or Path(project_root) / ".cache" / "data_driver")
+            if use_cache
+            else None
+        )
+
+        self.locale = "zh_CN"
+        self._faker = None
         self.logger = logger
 
+    @property
+    def faker(self) -> "Faker":
+        """中文数据生成器，首次使用时创建"""
+        if self._faker is None:
+            from faker import Faker
+
+            self._faker = Faker(self.locale)
+        return self._faker
+
+    def _load_with_cache(self, full_path: Path, variant: str, loader):
+        """开启缓存时从缓存读取解析结果，否则直接解析"""
+        if self.cache is None:
+            return loader()
+        return self.cache.get_or_load(full_path, loader, variant)
+
     def _find_project_root(self) -> str:
         """查找项目根目录"""
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -73,7 +140,10 @@ class DataDriver:
             测试数据列表
         """
         full_path = self.data_dir / file_path
-        try:
+
+        def parse():
+            import pandas as pd
+
             if sheet_name:
                 df = pd.read_excel(full_path, sheet_name=sheet_name)
             else:
@@ -81,7 +151,10 @@ class DataDriver:
 
             # 将NaN值替换为None
             df = df.where(pd.notnull(df), None)
-            data = df.to_dict("records")
+            return df.to_dict("records")
+
+        try:
+            data = self._load_with_cache(full_path, f"excel:{sheet_name}", parse)
 
             self.logger.info(f"从Excel文件加载了 {len(data)} 条测试数据: {full_path}")
             return data
@@ -155,9 +228,13 @@ class DataDriver:
             测试数据
         """
         full_path = self.data_dir / file_path
-        try:
+
+        def parse():
             with open(full_path, "r", encoding=encoding) as file:
-                data = yaml.safe_load(file)
+                return yaml_load(file)
+
+        try:
+            data = self._load_with_cache(full_path, f"yaml:{encoding}", parse)
 
             count = len(data) if isinstance(data, list) else 1
             self.logger.info(f"从YAML文件加载了 {count} 条测试数据: {full_path}")
@@ -167,58 +244,307 @@ class DataDriver:
             self.logger.error(f"加载YAML文件失败: {full_path}, 错误: {e}")
             raise
 
-    def generate_test_data(self, template: Dict, count: int = 1) -> List[Dict]:
+    def iter_csv(
+        self, file_path: str, encoding: str = "utf-8"
+    ) -> Generator[Dict, None, None]:
+        """
+        逐行读取CSV文件，内存占用与文件大小无关
+
+        Args:
+            file_path: CSV文件路径
+            encoding: 文件编码
+
+        Returns:
+            逐行产出测试数据的生成器
+        """
+        full_path = self.data_dir / file_path
+        count = 0
+        try:
+            with open(full_path, "r", encoding=encoding, newline="") as file:
+                for row in csv.DictReader(file):
+                    count += 1
+                    yield row
+        except Exception as e:
+            self.logger.error(f"读取CSV文件失败: {full_path}, 错误: {e}")
+            raise
+        self.logger.info(f"从CSV文件流式读取了 {count} 条测试数据: {full_path}")
+
+    def iter_jsonl(
+        self, file_path: str, encoding: str = "utf-8"
+    ) -> Generator[Any, None, None]:
+        """
+        逐行读取JSONL文件（每行一个JSON对象），空行会被跳过
+
+        Args:
+            file_path: JSONL文件路径
+            encoding: 文件编码
+
+        Returns:
+            逐行产出测试数据的生成器
+        """
+        full_path = self.data_dir / file_path
+        count = 0
+        try:
+            with open(full_path, "r", encoding=encoding) as file:
+                for line_no, line in enumerate(file, start=1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        row = json.loads(line)
+                    except json.JSONDecodeError as e:
+                        raise ValueError(f"第 {line_no} 行不是合法的JSON: {e}") from e
+                    count += 1
+                    yield row
+        except Exception as e:
+            self.logger.error(f"读取JSONL文件失败: {full_path}, 错误: {e}")
+            raise
+        self.logger.info(f"从JSONL文件流式读取了 {count} 条测试数据: {full_path}")
+
+    def load_jsonl(self, file_path: str, encoding: str = "utf-8") -> List[Any]:
+        """
+        从JSONL文件加载测试数据（每行一个JSON对象）
+
+        Args:
+            file_path: JSONL文件路径
+            encoding: 文件编码
+
+        Returns:
+            测试数据列表
+        """
+        return list(self.iter_jsonl(file_path, encoding))
+
+    def iter_parquet(
+        self,
+        file_path: str,
+        columns: List[str] = None,
+        batch_size: int = 10000,
+    ) -> Generator[Dict, None, None]:
+        """
+        按批读取Parquet文件，每次只解码一批数据，并且只读取需要的列
+
+        Args:
+            file_path: Parquet文件路径
+            columns: 需要读取的列，默认读取全部列
+            batch_size: 每批读取的行数
+
+        Returns:
+            逐行产出测试数据的生成器
+        """
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "读取Parquet文件需要安装pyarrow: pip install pyarrow"
+            ) from e
+
+        full_path = self.data_dir / file_path
+        count = 0
+        try:
+            parquet_file = pq.ParquetFile(full_path)
+            for batch in parquet_file.iter_batches(
+                batch_size=batch_size, columns=columns
+            ):
+                for row in batch.to_pylist():
+                    count += 1
+                    yield row
+        except Exception as e:
+            self.logger.error(f"读取Parquet文件失败: {full_path}, 错误: {e}")
+            raise
+        self.logger.info(f"从Parquet文件流式读取了 {count} 条测试数据: {full_path}")
+
+    def load_parquet(self, file_path: str, columns: List[str] = None) -> List[Dict]:
+        """
+        从Parquet文件加载测试数据
+
+        Args:
+            file_path: Parquet文件路径
+            columns: 需要读取的列，默认读取全部列
+
+        Returns:
+            测试数据列表
+        """
+        return list(self.iter_parquet(file_path, columns=columns))
+
+    def iter_excel(
+        self, file_path: str, sheet_name: str = None
+    ) -> Generator[Dict, None, None]:
+        """
+        逐行读取Excel文件（xlsx），使用openpyxl只读模式，不会一次性加载整个工作表
+
+        第一行作为表头，空单元格为None
+
+        Args:
+            file_path: Excel文件路径
+            sheet_name: 工作表名称，默认为第一个工作表
+
+        Returns:
+            逐行产出测试数据的生成器
+        """
+        full_path = self.data_dir / file_path
+        if full_path.suffix.lower() == ".xls":
+            # openpyxl不支持旧版xls格式，只能整体读取
+            self.logger.warning(f"xls格式不支持流式读取，将整体加载: {full_path}")
+            yield from self.load_excel(file_path, sheet_name)
+            return
+
+        from openpyxl import load_workbook
+
+        count = 0
+        try:
+            workbook = load_workbook(full_path, read_only=True, data_only=True)
+            try:
+                sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+                rows = sheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header is None:
+                    return
+                header = [str(name) if name is not None else "" for name in header]
+                for values in rows:
+                    if all(value is None for value in values):
+                        continue
+                    count += 1
+                    yield dict(zip(header, values))
+            finally:
+                workbook.close()
+        except Exception as e:
+            self.logger.error(f"读取Excel文件失败: {full_path}, 错误: {e}")
+            raise
+        self.logger.info(f"从Excel文件流式读取了 {count} 条测试数据: {full_path}")
+
+    def compile_template(self, template: Dict) -> "CompiledTemplate":
+        """
+        预编译数据模板，批量生成时模板只解析一次
+
+        Args:
+            template: 数据模板，语法见 CompiledTemplate
+
+        Returns:
+            编译后的模板
+        """
+        return CompiledTemplate(template, self.faker, self.locale)
+
+    def generate_test_data(
+        self,
+        template: Dict,
+        count: int = 1,
+        seed: int = None,
+        workers: int = 1,
+    ) -> List[Dict]:
         """
         根据模板生成测试数据
 
         Args:
-            template: 数据模板，支持Faker方法
+            template: 数据模板，语法见 CompiledTemplate
             count: 生成数据条数
+            seed: 随机种子，指定后每一行使用由 (seed, 行号) 决定的种子，
+                结果与是否并行、如何分批无关
+            workers: 进程数，大于1时分块并行生成
 
         Returns:
             生成的测试数据列表
         """
-        data_list = []
-
-        for _ in range(count):
-            data = {}
-            for key, value in template.items():
-                if isinstance(value, str) and value.startswith("faker."):
-                    # 执行Faker方法
-                    faker_method = value.replace("faker.", "")
-                    try:
-                        data[key] = getattr(self.faker, faker_method)()
-                    except AttributeError:
-                        self.logger.warning(f"Faker方法不存在: {faker_method}")
-                        data[key] = value
-                else:
-                    data[key] = value
-            data_list.append(data)
+        compiled = self.compile_template(template)
+        if workers > 1 and count > 1:
+            data_list = compiled.generate_parallel(count, seed=seed, workers=workers)
+        else:
+            data_list = compiled.generate(count, seed=seed)
 
         self.logger.info(f"生成了 {count} 条测试数据")
         return data_list
 
+    def generate_to_file(
+        self,
+        template: Dict,
+        count: int,
+        file_path: str,
+        file_type: str = None,
+        seed: int = None,
+        schema: "pa.Schema" = None,
+    ):
+        """
+        边生成边写入文件，适合百万级数据，内存中只保留当前行（Parquet为当前批）
+
+        Args:
+            template: 数据模板，语法见 CompiledTemplate
+            count: 生成数据总条数
+            file_path: 文件路径
+            file_type: 文件类型，jsonl 或 parquet，默认根据扩展名判断
+            seed: 随机种子，含义同 generate_test_data
+            schema: Parquet的列定义(pyarrow.Schema)，含义同 save_data
+        """
+        file_type = file_type or _file_type_of(file_path)
+        if file_type not in ["jsonl", "parquet"]:
+            raise ValueError(f"流式写入只支持jsonl/parquet格式: {file_type}")
+        compiled = self.compile_template(template)
+        self.save_data(
+            compiled.iter_rows(count, seed=seed), file_path, file_type, schema=schema
+        )
+        self.logger.info(f"生成了 {count} 条测试数据")
+
+    def iter_generated_batches(
+        self,
+        template: Dict,
+        count: int,
+        batch_size: int = 10000,
+        seed: int = None,
+    ) -> Generator[List[Dict], None, None]:
+        """
+        分批生成测试数据，适合配合 save_data 边生成边写入大文件
+
+        Args:
+            template: 数据模板，语法见 CompiledTemplate
+            count: 生成数据总条数
+            batch_size: 每批条数
+            seed: 随机种子，含义同 generate_test_data
+
+        Returns:
+            逐批产出数据列表的生成器
+        """
+        compiled = self.compile_template(template)
+        for start in range(0, count, batch_size):
+            yield compiled.generate(
+                min(batch_size, count - start), seed=seed, start=start
+            )
+
     def save_data(
         self,
-        data: Union[List[Dict], Dict],
+        data: Union[List[Dict], Dict, Iterable[Dict]],
         file_path: str,
         file_type: str = "json",
         encoding: str = "utf-8",
+        schema: "pa.Schema" = None,
     ):
         """
         保存数据到文件
 
         Args:
-            data: 要保存的数据
+            data: 要保存的数据，jsonl/parquet 格式也支持传入迭代器，边读边写
             file_path: 文件路径
-            file_type: 文件类型 (json, yaml, csv, excel)
+            file_type: 文件类型 (json, yaml, csv, excel, jsonl, parquet)
             encoding: 文件编码
+            schema: Parquet的列定义(pyarrow.Schema)，默认根据第一批数据推断；
+                第一批中某列全为空值时无法推断类型，需要显式传入
         """
         full_path = self.data_dir / file_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            if file_type.lower() == "json":
+            if file_type.lower() == "jsonl":
+                rows = [data] if isinstance(data, dict) else data
+                with open(full_path, "w", encoding=encoding) as file:
+                    for row in rows:
+                        file.write(json.dumps(row, ensure_ascii=False, default=str))
+                        file.write("\n")
+
+            elif file_type.lower() == "parquet":
+                self._write_parquet(
+                    [data] if isinstance(data, dict) else data,
+                    full_path,
+                    schema=schema,
+                )
+
+            elif file_type.lower() == "json":
                 with open(full_path, "w", encoding=encoding) as file:
                     json.dump(data, file, ensure_ascii=False, indent=2)
 
@@ -228,6 +554,8 @@ class DataDriver:
 
             elif file_type.lower() == "csv":
                 if isinstance(data, list) and data:
+                    import pandas as pd
+
                     df = pd.DataFrame(data)
                     df.to_csv(full_path, index=False, encoding=encoding)
                 else:
@@ -235,6 +563,8 @@ class DataDriver:
 
             elif file_type.lower() == "excel":
                 if isinstance(data, list) and data:
+                    import pandas as pd
+
                     df = pd.DataFrame(data)
                     df.to_excel(full_path, index=False)
                 else:
@@ -249,50 +579,572 @@ class DataDriver:
             self.logger.error(f"保存数据失败: {full_path}, 错误: {e}")
             raise
 
+    @staticmethod
+    def _write_parquet(
+        rows: Iterable[Dict],
+        full_path: Path,
+        batch_size: int = 10000,
+        schema: "pa.Schema" = None,
+    ):
+        """
+        分批写入Parquet文件，每批对应一个row group，内存占用只与批大小有关
+
+        所有批次共用同一个schema（传入或由第一批推断），后续批次出现schema之外的列、
+        或者值与推断出的类型不符（如第一批全为空值的列）时抛出ValueError，
+        而不是静默丢弃数据
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "写入Parquet文件需要安装pyarrow: pip install pyarrow"
+            ) from e
+
+        rows = iter(rows)
+        writer = None
+        try:
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                if schema is None:
+                    schema = pa.Table.from_pylist(batch).schema
+                unexpected = set().union(*batch).difference(schema.names)
+                if unexpected:
+                    raise ValueError(
+                        f"数据包含schema之外的列: {sorted(unexpected)}，"
+                        "请通过schema参数声明所有列"
+                    )
+                try:
+                    table = pa.Table.from_pylist(batch, schema=schema)
+                except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                    raise ValueError(
+                        f"数据与Parquet schema不匹配: {e}，"
+                        "第一批中全为空值的列需要通过schema参数声明类型"
+                    ) from e
+                if writer is None:
+                    writer = pq.ParquetWriter(full_path, schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            raise ValueError("Parquet格式需要非空的列表数据")
+
+    def convert_file(
+        self,
+        source: str,
+        target: str,
+        source_type: str = None,
+        target_type: str = None,
+    ):
+        """
+        转换数据文件格式，如 YAML/Excel -> JSONL/Parquet
+
+        源文件支持流式读取（csv/jsonl/xlsx/parquet）且目标为jsonl/parquet时边读边写，
+        不会把整个文件加载到内存
+
+        Args:
+            source: 源文件路径
+            target: 目标文件路径
+            source_type: 源文件类型，默认根据扩展名判断
+            target_type: 目标文件类型，默认根据扩展名判断
+        """
+        source_type = source_type or _file_type_of(source)
+        target_type = target_type or _file_type_of(target)
+        if target_type in ["xlsx", "xls"]:
+            target_type = "excel"
+        elif target_type == "yml":
+            target_type = "yaml"
+
+        if target_type in ["jsonl", "parquet"]:
+            data = iter_test_data(source, source_type, driver=self)
+        else:
+            data = load_test_data(source, source_type, driver=self)
+        self.save_data(data, target, file_type=target_type)
+        self.logger.info(f"数据文件已转换: {source} -> {target}")
+
+
+def _row_seed(seed: int, index: int) -> int:
+    """
+    每一行的随机种子只由 (seed, 行号) 决定
+
+    对 (seed, 行号) 取哈希，不同的种子不会因为行号偏移而得到相同的行种子
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _parse_faker_arg(arg: str) -> Any:
+    """解析 faker.method:arg1:arg2 中的参数，逗号分隔的参数解析为列表"""
+    if "," in arg:
+        return [_parse_faker_arg(item) for item in arg.split(",")]
+    for convert in (int, float):
+        try:
+            return convert(arg)
+        except ValueError:
+            pass
+    return arg
+
+
+def _resolve_path(data: Dict, path: List[str]) -> Any:
+    """按点号路径从已生成的数据中取值"""
+    value: Any = data
+    for part in path:
+        if isinstance(value, list):
+            value = value[int(part)]
+        else:
+            value = value[part]
+    return value
+
+
+def _hash_key(value: Any) -> int:
+    """唯一性校验只保存取值的哈希，避免保存大量原始数据"""
+    try:
+        return hash(value)
+    except TypeError:
+        return hash(json.dumps(value, sort_keys=True, ensure_ascii=False, default=str))
+
+
+class CompiledTemplate:
+    """
+    预编译的数据模板
+
+    模板中的每个字段在编译时被解析为一个生成函数 fn(root, obj) -> value，
+    其中root为正在生成的整行数据，obj为字段所在的（嵌套）对象，
+    生成时不再重复解析字符串和查找Faker方法
+
+    模板语法:
+        "faker.name"                        调用Faker方法
+        "faker.random_int:1:100"            带参数调用，逗号分隔的参数解析为列表
+        "ref.user.name"                     引用整行中已生成的字段（点号路径）
+        "fmt:{name}@example.com"            用当前对象中已生成的字段格式化字符串
+        lambda obj: ...                     自定义函数，参数为当前对象
+        {"key": ...}                        嵌套对象
+        {"$array": 模板, "min": 1, "max": 5}  数组，长度在[min, max]间随机，也可用 "length"
+        {"$choice": [...], "weights": [...]}  加权枚举
+        {"$unique": 模板, "max_retries": 100} 同一模板生成的值不重复
+        其他值                               原样输出
+    """
+
+    def __init__(self, template: Dict, faker: "Faker", locale: str = "zh_CN"):
+        """
+        编译数据模板
+
+        Args:
+            template: 数据模板
+            faker: Faker实例
+            locale: Faker语言，并行生成时子进程按此创建Faker
+        """
+        self.template = template
+        self.faker = faker
+        self.locale = locale
+        self.has_unique = False
+        self.has_callable = False
+        self.fields = [
+            (key, self._compile_value(value)) for key, value in template.items()
+        ]
+
+    def _compile_value(self, value: Any):
+        if callable(value):
+            self.has_callable = True
+            return lambda root, obj: value(obj)
+        if isinstance(value, dict):
+            if "$array" in value:
+                return self._compile_array(value)
+            if "$choice" in value:
+                return self._compile_choice(value)
+            if "$unique" in value:
+                return self._compile_unique(value)
+            return self._compile_object(value)
+        if isinstance(value, str):
+            if value.startswith("faker."):
+                return self._compile_faker(value, value.replace("faker.", "", 1))
+            if value.startswith("ref."):
+                path = value[len("ref.") :].split(".")
+                return lambda root, obj: _resolve_path(root, path)
+            if value.startswith("fmt:"):
+                fmt = value[len("fmt:") :]
+                return lambda root, obj: fmt.format_map(obj)
+        return lambda root, obj: value
+
+    def _compile_faker(self, value: str, spec: str):
+        faker_method, *args = spec.split(":")
+        try:
+            method = getattr(self.faker, faker_method)
+        except AttributeError:
+            logger.warning(f"Faker方法不存在: {faker_method}")
+            return lambda root, obj: value
+        if args:
+            args = [_parse_faker_arg(arg) for arg in args]
+            return lambda root, obj: method(*args)
+        return lambda root, obj: method()
+
+    def _compile_object(self, template: Dict):
+        fields = [(key, self._compile_value(value)) for key, value in template.items()]
+
+        def generate_object(root, obj):
+            new_obj = {}
+            for key, generator in fields:
+                new_obj[key] = generator(root, new_obj)
+            return new_obj
+
+        return generate_object
+
+    def _compile_array(self, spec: Dict):
+        item = self._compile_value(spec["$array"])
+        if "length" in spec:
+            min_length = max_length = spec["length"]
+        else:
+            min_length, max_length = spec.get("min", 1), spec.get("max", 1)
+        random_int = self.faker.random_int
+
+        def generate_array(root, obj):
+            length = (
+                min_length
+                if min_length == max_length
+                else random_int(min_length, max_length)
+            )
+            return [item(root, obj) for _ in range(length)]
+
+        return generate_array
+
+    def _compile_choice(self, spec: Dict):
+        choices = list(spec["$choice"])
+        weights = spec.get("weights")
+        faker = self.faker
+
+        def generate_choice(root, obj):
+            # seed_instance 会替换随机数对象，因此每次调用时再获取
+            return faker.random.choices(choices, weights=weights)[0]
+
+        return generate_choice
+
+    def _compile_unique(self, spec: Dict):
+        self.has_unique = True
+        inner = self._compile_value(spec["$unique"])
+        max_retries = spec.get("max_retries", 100)
+        seen = set()
+
+        def generate_unique(root, obj):
+            for _ in range(max_retries):
+                value = inner(root, obj)
+                key = _hash_key(value)
+                if key not in seen:
+                    seen.add(key)
+                    return value
+            raise ValueError(
+                f"重试 {max_retries} 次仍无法生成不重复的值: {spec['$unique']}"
+            )
+
+        return generate_unique
+
+    def generate_row(self) -> Dict:
+        """生成一行数据"""
+        row = {}
+        for key, generator in self.fields:
+            row[key] = generator(row, row)
+        return row
+
+    def iter_rows(
+        self, count: int, seed: int = None, start: int = 0
+    ) -> Generator[Dict, None, None]:
+        """
+        逐行生成数据，内存中只保留当前行
+
+        Args:
+            count: 生成条数
+            seed: 随机种子，为None时不重置Faker的随机状态
+            start: 起始行号，用于分批/并行生成时计算每行的种子
+
+        Returns:
+            逐行产出数据的生成器
+        """
+        if seed is None:
+            for _ in range(count):
+                yield self.generate_row()
+            return
+
+        seed_instance = self.faker.seed_instance
+        for index in range(start, start + count):
+            seed_instance(_row_seed(seed, index))
+            yield self.generate_row()
+
+    def generate(self, count: int, seed: int = None, start: int = 0) -> List[Dict]:
+        """
+        生成count行数据
+
+        Args:
+            count: 生成条数
+            seed: 随机种子，为None时不重置Faker的随机状态
+            start: 起始行号，用于分批/并行生成时计算每行的种子
+
+        Returns:
+            数据列表
+        """
+        return list(self.iter_rows(count, seed=seed, start=start))
+
+    def generate_parallel(
+        self, count: int, seed: int = None, workers: int = 4, chunk_size: int = None
+    ) -> List[Dict]:
+        """
+        多进程分块生成数据
+
+        Args:
+            count: 生成条数
+            seed: 随机种子，为None时随机选取一个，避免各子进程产生相同的数据
+            workers: 进程数
+            chunk_size: 每个任务的行数，默认按进程数均分为若干块
+
+        Returns:
+            数据列表（顺序与单进程生成一致）
+        """
+        if self.has_unique:
+            # 各子进程无法共享已生成的值，唯一性约束只能在单进程中保证
+            logger.warning("模板包含唯一性约束，改为单进程生成")
+            return self.generate(count, seed=seed)
+        if self.has_callable:
+            # 模板需要pickle后传给子进程，lambda等自定义函数无法序列化
+            logger.warning("模板包含自定义函数，改为单进程生成")
+            return self.generate(count, seed=seed)
+
+        if seed is None:
+            seed = random.randrange(2**32)
+        chunk_size = chunk_size or max(1, -(-count // (workers * 4)))
+        chunks = [
+            (start, min(chunk_size, count - start))
+            for start in range(0, count, chunk_size)
+        ]
+
+        rows: List[Dict] = []
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _generate_chunk, self.template, self.locale, seed, start, size
+                )
+                for start, size in chunks
+            ]
+            for future in futures:
+                rows.extend(future.result())
+        return rows
+
+
+def _generate_chunk(
+    template: Dict, locale: str, seed: int, start: int, count: int
+) -> List[Dict]:
+    """子进程中生成一块数据"""
+    from faker import Faker
+
+    return CompiledTemplate(template, Faker(locale), locale).generate(
+        count, seed=seed, start=start
+    )
+
 
 # 全局数据驱动器实例
 data_driver = DataDriver()
 
 
-def load_test_data(file_path: str, file_type: str = None) -> Union[List[Dict], Dict]:
+def _file_type_of(file_path: str) -> str:
+    """根据扩展名判断文件类型"""
+    return Path(file_path).suffix.lower().lstrip(".")
+
+
+def iter_test_data(
+    file_path: str, file_type: str = None, driver: DataDriver = None
+) -> Iterator[Any]:
+    """
+    逐条读取测试数据的便捷函数
+
+    CSV、JSONL、xlsx、Parquet 为真正的流式读取；JSON、YAML 需要整体解析，
+    解析后逐条产出（单个对象视为一条数据）
+
+    Args:
+        file_path: 文件路径
+        file_type: 文件类型，如果不指定则根据文件扩展名判断
+        driver: 使用的数据驱动器，默认为全局实例
+
+    Returns:
+        测试数据迭代器
+    """
+    driver = driver or data_driver
+    if file_type is None:
+        file_type = _file_type_of(file_path)
+
+    if file_type in ["xlsx", "xls"]:
+        return driver.iter_excel(file_path)
+    elif file_type == "csv":
+        return driver.iter_csv(file_path)
+    elif file_type == "jsonl":
+        return driver.iter_jsonl(file_path)
+    elif file_type == "parquet":
+        return driver.iter_parquet(file_path)
+    elif file_type in ["json", "yaml", "yml"]:
+        data = load_test_data(file_path, file_type, driver=driver)
+        return iter(data if isinstance(data, list) else [data])
+    else:
+        raise ValueError(f"不支持的文件类型: {file_type}")
+
+
+def load_test_data(
+    file_path: str,
+    file_type: str = None,
+    lazy: bool = False,
+    driver: DataDriver = None,
+) -> Union[List[Dict], Dict, Iterator[Any]]:
     """
     加载测试数据的便捷函数
 
     Args:
         file_path: 文件路径
         file_type: 文件类型，如果不指定则根据文件扩展名判断
+        lazy: 是否返回逐条读取的迭代器（适用于大数据文件），参见 iter_test_data
+        driver: 使用的数据驱动器，默认为全局实例
 
     Returns:
         测试数据
     """
+    if lazy:
+        return iter_test_data(file_path, file_type, driver=driver)
+
+    driver = driver or data_driver
     if file_type is None:
-        file_type = Path(file_path).suffix.lower().lstrip(".")
+        file_type = _file_type_of(file_path)
 
     if file_type in ["xlsx", "xls"]:
-        return data_driver.load_excel(file_path)
+        return driver.load_excel(file_path)
     elif file_type == "csv":
-        return data_driver.load_csv(file_path)
+        return driver.load_csv(file_path)
     elif file_type == "json":
-        return data_driver.load_json(file_path)
+        return driver.load_json(file_path)
+    elif file_type == "jsonl":
+        return driver.load_jsonl(file_path)
+    elif file_type == "parquet":
+        return driver.load_parquet(file_path)
     elif file_type in ["yaml", "yml"]:
-        return data_driver.load_yaml(file_path)
+        return driver.load_yaml(file_path)
     else:
         raise ValueError(f"不支持的文件类型: {file_type}")
 
 
-def parametrize_from_file(file_path: str, file_type: str = None):
+def parametrize_from_file(file_path: str, file_type: str = None, lazy: bool = False):
     """
     从文件生成pytest参数化装饰器的数据
 
     Args:
         file_path: 文件路径
         file_type: 文件类型
+        lazy: 是否返回逐条读取的迭代器，而不是一次性加载为列表
 
     Returns:
         参数化数据
     """
+    if lazy:
+        return iter_test_data(file_path, file_type)
+
     data = load_test_data(file_path, file_type)
     if isinstance(data, list):
         return data
     else:
         return [data]
+
+
+@click.group()
+def cli():
+    """数据文件工具"""
+
+
+@cli.command()
+@click.argument("source")
+@click.argument("target")
+@click.option("--data-dir", default="data", help="数据文件目录，相对路径基于项目根目录")
+def convert(source: str, target: str, data_dir: str):
+    """
+    转换数据文件格式，按扩展名识别类型
+
+    示例: python -m src.utils.data_driver convert api_test_cases.yaml api_test_cases.jsonl
+    """
+    DataDriver(data_dir=data_dir).convert_file(source, target)
+
+
+@cli.command()
+@click.option("--data-dir", default="data", help="数据文件目录，相对路径基于项目根目录")
+def precompile(data_dir: str):
+    """
+    预先解析数据目录下的YAML/Excel文件并写入缓存，之后加载时直接读取二进制结果
+
+    适合在CI中、启动xdist之前执行一次
+    """
+    driver = DataDriver(data_dir=data_dir)
+    if driver.cache is None:
+        raise click.UsageError("数据缓存已通过 DATA_DRIVER_CACHE 关闭")
+    loaders = {
+        ".yaml": driver.load_yaml,
+        ".yml": driver.load_yaml,
+        ".xlsx": driver.load_excel,
+        ".xls": driver.load_excel,
+    }
+    for path in sorted(driver.data_dir.rglob("*")):
+        loader = loaders.get(path.suffix.lower())
+        if loader and path.is_file():
+            loader(str(path.relative_to(driver.data_dir)))
+            click.echo(f"已缓存: {path}")
+
+
+def _best_of(func, repeat: int) -> float:
+    """执行repeat次，返回最短耗时（秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+@cli.command("bench-yaml")
+@click.argument("file_path")
+@click.option("--data-dir", default="data", help="数据文件目录，相对路径基于项目根目录")
+@click.option(
+    "--repeat", default=5, show_default=True, help="每种方式的执行次数，取最短耗时"
+)
+def bench_yaml(file_path: str, data_dir: str, repeat: int):
+    """
+    对比YAML文件的三种加载方式：纯Python safe_load、libyaml CSafeLoader、预编译缓存
+
+    示例: python -m src.utils.data_driver bench-yaml api_test_cases.yaml --repeat 10
+    """
+    full_path = DataDriver(data_dir=data_dir, use_cache=False).data_dir / file_path
+    text = full_path.read_text(encoding="utf-8")
+
+    results = [
+        (
+            "yaml.safe_load",
+            _best_of(lambda: yaml.load(text, Loader=yaml.SafeLoader), repeat),
+        ),
+        (YamlLoader.__name__, _best_of(lambda: yaml_load(text), repeat)),
+    ]
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DataCache(cache_dir)
+        cache.get_or_load(full_path, lambda: yaml_load(text), "bench")
+        results.append(
+            (
+                "precompiled cache",
+                _best_of(
+                    lambda: cache.get_or_load(
+                        full_path, lambda: yaml_load(text), "bench"
+                    ),
+                    repeat,
+                ),
+            )
+        )
+
+    baseline = results[0][1]
+    click.echo(
+        f"{full_path} ({full_path.stat().st_size / 1024:.1f} KB), best of {repeat}"
+    )
+    for name, seconds in results:
+        click.echo(f"{name:<20} {seconds * 1000:>10.2f} ms {baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    cli()
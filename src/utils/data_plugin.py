@@ -0,0 +1,273 @@
+"""
+数据文件参数化pytest插件
+
+收集阶段只扫描数据文件的ID列，生成以ID命名的用例；用例执行时才按需读取被选中的行，
+适合十万级以上的数据文件。插件已在 pytest.ini 中通过 -p 参数注册。
+
+使用说明：
+    @pytest.mark.data_file("users.jsonl", argname="user", id_key="user_id")
+    def test_user(user):
+        assert user["name"]
+
+    # 生成的用例ID为 test_user[10001]、test_user[10002]...
+    # 通过 -k / -m 过滤后只会读取剩余用例对应的行
+    # 多机分片执行：pytest --data-shard=0/4（只收集行号 % 4 == 0 的数据），
+    # 或在标记中指定 shard="0/4"
+
+argname 对应的夹具由插件注册，按间接参数化拿到行引用后才读取数据，
+因此不要与已有的夹具重名。
+"""
+
+import re
+import threading
+import types
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+import pytest
+
+from src.utils.data_driver import DataDriver, _file_type_of, data_driver, iter_test_data
+
+# 用例ID中不允许出现的字符
+_ID_UNSAFE = re.compile(r"[^\w.@:+\-]+")
+
+
+@dataclass(frozen=True)
+class DataRef:
+    """参数化时使用的行引用，由 argname 夹具在执行用例时读取为真实数据"""
+
+    source: "DataFileSource"
+    position: int
+    id: str
+
+    def __repr__(self) -> str:
+        return f"DataRef({self.source.file_path}#{self.position})"
+
+
+def parse_shard(
+    value: Union[str, Tuple[int, int], None],
+) -> Optional[Tuple[int, int]]:
+    """
+    解析分片参数
+
+    Args:
+        value: 形如 "0/4" 的字符串或 (0, 4) 元组，表示共4片中的第0片
+
+    Returns:
+        (分片序号, 分片总数)，value为空时返回None
+    """
+    if not value:
+        return None
+    try:
+        parts = value.split("/") if isinstance(value, str) else value
+        index, total = (int(part) for part in parts)
+    except (TypeError, ValueError):
+        raise pytest.UsageError(f"数据分片格式应为 INDEX/TOTAL: {value}")
+    if total <= 0 or not 0 <= index < total:
+        raise pytest.UsageError(f"数据分片序号超出范围: {value}")
+    return index, total
+
+
+class DataFileSource:
+    """
+    一个数据文件的行索引
+
+    收集阶段只保存行号和ID；执行阶段顺序流式读取文件，只缓存被选中且尚未执行的行，
+    用例按行号顺序执行时整个文件只读取一遍
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        file_type: str = None,
+        driver: DataDriver = None,
+        window: int = 1000,
+    ):
+        """
+        初始化行索引
+
+        Args:
+            file_path: 数据文件路径（相对于driver的数据目录）
+            file_type: 文件类型，默认根据扩展名判断
+            driver: 使用的数据驱动器，默认为全局实例
+            window: 每次读取时最多预先缓存的行数
+        """
+        self.file_path = file_path
+        self.file_type = file_type or _file_type_of(file_path)
+        self.driver = driver or data_driver
+        self.window = window
+        # 行号 -> 尚未执行的引用该行的用例数
+        self.selected: Dict[int, int] = {}
+        self._rows: Dict[int, Any] = {}
+        self._iterator: Optional[Iterator[Tuple[int, Any]]] = None
+        self._position = 0
+        self._lock = threading.Lock()
+
+    def _iter_rows(self, columns: List[str] = None) -> Iterator[Any]:
+        if self.file_type == "parquet":
+            return self.driver.iter_parquet(self.file_path, columns=columns)
+        return iter_test_data(self.file_path, self.file_type, driver=self.driver)
+
+    def scan(
+        self, id_key: str = None, shard: Union[str, Tuple[int, int]] = None
+    ) -> List[Tuple[int, str]]:
+        """
+        扫描文件，生成 (行号, 用例ID) 列表，不保留行数据
+
+        Args:
+            id_key: 作为用例ID的字段，为空或字段缺失时使用行号
+            shard: "分片序号/分片总数" 或 (分片序号, 分片总数)，只保留属于该分片的行
+
+        Returns:
+            (行号, 用例ID) 列表
+        """
+        shard = parse_shard(shard)
+        columns = [id_key] if id_key else None
+        entries = []
+        seen = set()
+        for position, row in enumerate(self._iter_rows(columns)):
+            if shard and position % shard[1] != shard[0]:
+                continue
+            value = row.get(id_key) if id_key and isinstance(row, dict) else None
+            case_id = _ID_UNSAFE.sub("_", str(value)) if value not in (None, "") else ""
+            case_id = case_id or str(position)
+            if case_id in seen:
+                case_id = f"{case_id}-{position}"
+            seen.add(case_id)
+            entries.append((position, case_id))
+        return entries
+
+    def get(self, position: int) -> Any:
+        """
+        读取指定行，所有引用该行的用例都取过后从缓存中移除
+
+        Args:
+            position: 行号
+
+        Returns:
+            行数据
+        """
+        with self._lock:
+            if position not in self._rows:
+                self._fill(position)
+            row = self._rows[position]
+            remaining = self.selected.get(position, 1) - 1
+            if remaining > 0:
+                self.selected[position] = remaining
+            else:
+                self.selected.pop(position, None)
+                del self._rows[position]
+            return row
+
+    def _fill(self, position: int):
+        # 已经读过的位置只能重新打开文件；缓存中剩余的行属于被跳过的用例（如xdist分给其他worker），不再保留
+        if self._iterator is None or position < self._position:
+            self._iterator = enumerate(self._iter_rows())
+        self._rows.clear()
+
+        for current, row in self._iterator:
+            self._position = current + 1
+            if current == position or (current > position and current in self.selected):
+                self._rows[current] = row
+            if current >= position and len(self._rows) >= self.window:
+                break
+
+        if position not in self._rows:
+            raise LookupError(
+                f"数据文件 {self.file_path} 中不存在第 {position} 行，收集后文件可能被修改"
+            )
+
+
+def _get_source(
+    config: pytest.Config, file_path: str, file_type: str
+) -> DataFileSource:
+    sources = config.stash[_sources_key]
+    key = (file_path, file_type)
+    if key not in sources:
+        sources[key] = DataFileSource(file_path, file_type)
+    return sources[key]
+
+
+_sources_key = pytest.StashKey[Dict[Tuple[str, str], DataFileSource]]()
+_fixtures_key = pytest.StashKey[Set[str]]()
+
+
+def _row_fixture_plugin(argname: str) -> types.ModuleType:
+    """生成只包含 argname 夹具的插件，夹具把间接参数化传入的行引用读取为行数据"""
+
+    @pytest.fixture(name=argname)
+    def row(request: pytest.FixtureRequest) -> Any:
+        ref = getattr(request, "param", None)
+        if not isinstance(ref, DataRef):
+            raise pytest.UsageError(
+                f"夹具 {argname} 只能配合 data_file 标记使用: {request.node.nodeid}"
+            )
+        return ref.source.get(ref.position)
+
+    plugin = types.ModuleType(f"{__name__}.{argname}")
+    plugin.row = row
+    return plugin
+
+
+def _register_row_fixture(config: pytest.Config, argname: str):
+    registered = config.stash[_fixtures_key]
+    if argname not in registered:
+        config.pluginmanager.register(
+            _row_fixture_plugin(argname), f"data_file-{argname}"
+        )
+        registered.add(argname)
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.addoption(
+        "--data-shard",
+        default=None,
+        help="只收集数据文件中属于该分片的行，格式 INDEX/TOTAL，如 0/4",
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    config.addinivalue_line(
+        "markers",
+        "data_file(file_path, argname='data', id_key=None, file_type=None, "
+        "shard='INDEX/TOTAL'): "
+        "按数据文件参数化，执行时才读取对应的行",
+    )
+    config.stash[_sources_key] = {}
+    config.stash[_fixtures_key] = set()
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    for marker in metafunc.definition.iter_markers("data_file"):
+        file_path = marker.args[0] if marker.args else marker.kwargs["file_path"]
+        argname = marker.kwargs.get("argname", "data")
+        file_type = marker.kwargs.get("file_type") or _file_type_of(file_path)
+        shard = marker.kwargs.get("shard") or metafunc.config.getoption("--data-shard")
+
+        source = _get_source(metafunc.config, file_path, file_type)
+        entries = source.scan(marker.kwargs.get("id_key"), shard)
+        _register_row_fixture(metafunc.config, argname)
+        metafunc.parametrize(
+            argname,
+            [DataRef(source, position, case_id) for position, case_id in entries],
+            ids=[case_id for _, case_id in entries],
+            indirect=True,
+        )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(items: List[pytest.Item]):
+    # 在 -k/-m 等过滤之后执行，只登记最终保留的用例
+    for item in items:
+        for ref in _data_refs(item):
+            selected = ref.source.selected
+            selected[ref.position] = selected.get(ref.position, 0) + 1
+
+
+def _data_refs(item: pytest.Item) -> Iterator[DataRef]:
+    callspec = getattr(item, "callspec", None)
+    if callspec is None:
+        return
+    for value in callspec.params.values():
+        if isinstance(value, DataRef):
+            yield value
@@ -17,8 +17,14 @@
     上述功能在下面的函数中中，都变成了原子能力，业务需求放在业务逻辑的模块进行书写。
 """
 
+import csv
+import json
+import math
 import os
-from typing import Union
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -26,6 +32,9 @@ import pandas as pd
 from conf.constants import logs_dir
 from src.utils.log_moudle import logger
 
+if TYPE_CHECKING:
+    import pyarrow as pa
+
 
 class DataSovle(object):
     def __init__(self):
@@ -33,68 +42,131 @@ class DataSovle(object):
         pass
 
     # @property
-    def read_csv(self, *args, **kwargs):
+    def read_csv(self, path: Union[str, os.PathLike, list, tuple], **kwargs):
         """
         可以直接给一个文件目录，也可以给一个或者多个文件地址
         读取csv文件，多个的话会合成为一个文件
-        :param args:
-        :param kwargs:
+        :param path: 目录，或者文件路径列表
+        :param kwargs: 见 read_csv_files
         :return:
         """
-        # logger.info(*args)
-        ## 判断args是str还是list，如果是str则走dir模式，如果是list则走file模式
-        # logger.info(mode_a)
-        if isinstance(*args, str):
-            res = self.read_csv_dir_mode(*args, **kwargs)
-        elif isinstance(*args, (list, tuple)):
-            res = self.read_csv_file_mode(*args, **kwargs)
+        ## 判断path是目录还是列表，如果是目录则走dir模式，如果是列表则走file模式
+        if isinstance(path, (str, os.PathLike)):
+            res = self.read_csv_dir_mode(path, **kwargs)
+        elif isinstance(path, (list, tuple)):
+            res = self.read_csv_file_mode(path, **kwargs)
         else:
             raise ValueError(f" we nead mode deliver files or dir ")
         return res
 
-    def read_csv_dir_mode(self, *args, **kwargs):
-        all_data_frame = pd.DataFrame()
-        # logger.info(args)
-        all_csv_list = os.listdir(args[0])  # get csv list
-        for i in all_csv_list:
-            if os.path.splitext(i)[1] != ".csv":
-                all_csv_list.remove(i)
-        # logger.info(all_csv_list)
-        for single_csv in all_csv_list:
-            single_data_frame = pd.read_csv(
-                os.path.join(args[0], single_csv), sep=",", encoding="utf-8"
-            )
-            #     print(single_data_frame.info())
-            if single_csv == all_csv_list[0]:
-                # print(single_csv)
-                all_data_frame = single_data_frame
-            else:  # concatenate all csv to a single dataframe, ingore index
-                # print(single_csv)
-                all_data_frame = pd.concat(
-                    [all_data_frame, single_data_frame], ignore_index=True
-                )
-        self.df = all_data_frame
-        # self.df_info()
-        return all_data_frame
+    def read_csv_dir_mode(self, dir_path: Union[str, os.PathLike], **kwargs):
+        """
+        读取目录下的全部csv文件（按文件名排序）
+        :param dir_path:
+        :param kwargs: 见 read_csv_files
+        :return:
+        """
+        all_csv_list = sorted(
+            os.path.join(dir_path, name)
+            for name in os.listdir(dir_path)
+            if os.path.splitext(name)[1] == ".csv"
+        )
+        return self.read_csv_files(all_csv_list, **kwargs)
 
-    def read_csv_file_mode(self, *args, **kwargs):
-        args = list(set(args[0]))
-        ## 声明一个空的dataframe
-        all_data_frame = pd.DataFrame()
-        # logger.info(args)
-        for file_path in args:
-            single_data_frame = pd.read_csv(file_path)
-            if args.index(file_path) == 0:
-                all_data_frame = single_data_frame
-            else:
-                all_data_frame = pd.concat(
-                    objs=[all_data_frame, single_data_frame], ignore_index=True
-                )
-        # print(all_data_frame.index)
-        # print(all_data_frame.head())
+    def read_csv_file_mode(self, files: Union[list, tuple], **kwargs):
+        """
+        读取多个csv文件，重复的路径只读取一次
+        :param files:
+        :param kwargs: 见 read_csv_files
+        :return:
+        """
+        return self.read_csv_files(list(dict.fromkeys(files)), **kwargs)
+
+    def read_csv_files(
+        self,
+        files: list,
+        workers: int = None,
+        use_processes: bool = False,
+        dtype: dict = None,
+        usecols: list = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """
+        并发解析多个csv文件，最后只合并一次，耗时与文件数成线性关系
+        :param files: 文件路径列表，合并后的行顺序与列表顺序一致
+        :param workers: 并发数，默认由线程池/进程池决定
+        :param use_processes: 使用进程池解析；默认线程池（pandas的C解析器解析时会释放GIL）
+        :param dtype: 列类型提示，如 {"status": "category", "cost": "float32"}，省去类型推断并减少内存
+        :param usecols: 只读取需要的列
+        :param kwargs: 其他透传给 pd.read_csv 的参数
+        :return:
+        """
+        kwargs.setdefault("sep", ",")
+        kwargs.setdefault("encoding", "utf-8")
+        read = partial(pd.read_csv, dtype=dtype, usecols=usecols, **kwargs)
+
+        if len(files) <= 1:
+            frames = [read(file_path) for file_path in files]
+        else:
+            pool = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+            with pool(max_workers=workers) as executor:
+                frames = list(executor.map(read, files))
+
+        if frames:
+            all_data_frame = pd.concat(frames, ignore_index=True)
+        else:
+            all_data_frame = pd.DataFrame(columns=usecols)
+        logger.info(f"读取了 {len(files)} 个csv文件，共 {len(all_data_frame)} 行")
         self.df = all_data_frame
         return all_data_frame
 
+    def read_traces(
+        self, path: Union[str, os.PathLike, list, tuple], workers: int = None
+    ) -> pd.DataFrame:
+        """
+        读取请求追踪文件（见 src.utils.request_trace），用于耗时分析
+        :param path: 追踪文件、目录（读取其中全部 .jsonl 文件，如各xdist worker的文件），或者文件列表
+        :param workers: 并发读取的线程数
+        :return: 每次请求一行，ts 列转换为时间类型
+        """
+        if isinstance(path, (list, tuple)):
+            files = list(dict.fromkeys(path))
+        elif os.path.isdir(path):
+            files = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if os.path.splitext(name)[1] == ".jsonl"
+            )
+        else:
+            files = [path]
+
+        read = partial(pd.read_json, lines=True, dtype={"status": "Int64"})
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = [frame for frame in executor.map(read, files) if not frame.empty]
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if "ts" in df:
+            df["ts"] = pd.to_datetime(df["ts"], unit="s")
+            df = df.sort_values("ts", ignore_index=True)
+        logger.info(f"读取了 {len(files)} 个追踪文件，共 {len(df)} 条请求")
+        self.df = df
+        return df
+
+    def read_csv_chunked(
+        self,
+        path: Union[str, os.PathLike, list, tuple],
+        chunksize: int = 100_000,
+        **kwargs,
+    ) -> "ChunkedDataSovle":
+        """
+        分块读取模式，用于内存放不下的超大结果文件
+        返回的对象支持与DataSovle相同的链式过滤，统计时逐块读取，内存占用与文件大小无关
+        :param path: 文件、目录，或者文件路径列表
+        :param chunksize: 每块的行数
+        :param kwargs: 透传给 pd.read_csv 的参数，如 dtype
+        :return:
+        """
+        return ChunkedDataSovle(path, chunksize=chunksize, **kwargs)
+
     def createdaframe(self, dict_content):
         return pd.DataFrame(dict_content)
 
@@ -104,33 +176,58 @@ class DataSovle(object):
         self,
         file: str = os.path.join(logs_dir, "tests.csv"),
         df: Union[dict, pd.DataFrame] = None,
+        mode: str = "a",
     ):
         """
         其实这块应该一步到位，应该写一个函数，判断df是字典还是dataframe，如果都不是报异常
         如果是字典，那么按照字典的方式处理，如果是dataframe就按照dataframe的方式处理
 
-        先判断文件在不在，如果不在，那么mode="w"
-        如果存在，文件mode="a+",header=None
+        csv和parquet（扩展名为.parquet，需要安装pyarrow）的行为一致：
+        文件不存在时新建；存在时 mode="a" 追加，mode="w" 覆盖
+        追加时列以已有文件为准，df中出现文件之外的列时抛出ValueError
+        parquet不支持原地追加，会读出已有数据合并后整体重写
         :param file:
         :param df:
+        :param mode: a 追加，w 覆盖
         :return:
         """
-        if os.path.exists(file):
-            if isinstance(df, pd.DataFrame):
-                df.to_csv(file, mode="a+", header=None, index=False)
-            elif isinstance(df, dict):
-                df = pd.DataFrame(df)
-                df.to_csv(file, mode="a+", header=None, index=False)
+        if isinstance(df, dict):
+            df = pd.DataFrame(df)
+        elif not isinstance(df, pd.DataFrame):
+            raise ValueError("expect dict or dataframe")
+        if mode not in ("a", "w"):
+            raise ValueError(f"mode只能为a或w: {mode}")
+
+        parquet = os.path.splitext(file)[1] == ".parquet"
+        append = mode == "a" and os.path.exists(file) and os.path.getsize(file)
+        if append:
+            if parquet:
+                existing = pd.read_parquet(file)
+                columns = list(existing.columns)
             else:
-                raise ValueError("expect dict or dataframe")
+                columns = list(pd.read_csv(file, nrows=0).columns)
+            _check_columns(df.columns, columns)
+            df = df.reindex(columns=columns)
+            if parquet:
+                df = pd.concat([existing, df], ignore_index=True)
+        if parquet:
+            df.to_parquet(file, index=False)
+        elif append:
+            df.to_csv(file, mode="a", header=False, index=False)
         else:
-            if isinstance(df, pd.DataFrame):
-                df.to_csv(file, mode="w", index=False)
-            elif isinstance(df, dict):
-                df = pd.DataFrame(df)
-                df.to_csv(file, mode="w", index=False)
-            else:
-                raise ValueError("expect dict or dataframe")
+            df.to_csv(file, mode="w", index=False)
+
+    def result_writer(
+        self, file: str = os.path.join(logs_dir, "tests.csv"), **kwargs
+    ) -> "ResultWriter":
+        """
+        逐条写入结果时使用：行先在内存中缓冲，按批或按时间间隔写入同一个打开的文件
+        save_file 每次调用都会创建DataFrame并重新打开文件，不适合在每个请求的回调中使用
+        :param file:
+        :param kwargs: 见 ResultWriter
+        :return:
+        """
+        return ResultWriter(file, **kwargs)
 
     def df_dtypes(self, df: pd.DataFrame = pd.DataFrame()):
         """
@@ -184,6 +281,57 @@ class DataSovle(object):
         )
         return np.percentile(self.df.loc[:, colunms], num)
 
+    def df_group_report(
+        self,
+        by: Union[str, List[str]],
+        colunms: Union[str, List[str]],
+        aggregates: Iterable[str] = ("count", "mean", "min", "max"),
+        percentiles: Iterable[float] = (50, 95, 99),
+        file: str = None,
+    ) -> pd.DataFrame:
+        """
+        分组统计报表，如按接口统计耗时的 count/mean/p50/p95/p99
+        所有分组、所有统计项在一次分组中向量化计算，不需要对每个分组、每个分位数单独扫描
+        :param by: 分组列，如 "endpoint" 或 ["endpoint", "status"]
+        :param colunms: 需要统计的列
+        :param aggregates: 聚合函数名，与 DataFrame.agg 一致
+        :param percentiles: 分位数，取值0-100，列名为 p50/p95/p99
+        :param file: 写入的文件，.csv 或 .parquet，为空时不写文件
+        :return: 每个分组一行，列名为 {列}_{统计项}
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        colunms = [colunms] if isinstance(colunms, str) else list(colunms)
+        percentiles = list(percentiles)
+
+        grouped = self.df.groupby(by, sort=True, observed=True)[colunms]
+        aggregates = list(aggregates)
+        parts = []
+        if aggregates:
+            stats = grouped.agg(aggregates)
+            stats.columns = [f"{column}_{agg}" for column, agg in stats.columns]
+            parts.append(stats)
+        if percentiles:
+            # 一次调用计算全部分位数，结果索引为 (分组..., 分位数)
+            names = {num / 100: f"p{num:g}" for num in percentiles}
+            quantiles = grouped.quantile(list(names)).unstack(-1)
+            quantiles.columns = [
+                f"{column}_{names[q]}" for column, q in quantiles.columns
+            ]
+            parts.append(quantiles)
+        if not parts:
+            raise ValueError("aggregates 和 percentiles 不能同时为空")
+
+        order = [
+            f"{column}_{name}"
+            for column in colunms
+            for name in [*aggregates, *(f"p{num:g}" for num in percentiles)]
+        ]
+        report = pd.concat(parts, axis=1)[order].reset_index()
+        logger.info(f"分组统计完成，分组列:{by} 统计列:{colunms} 共 {len(report)} 组")
+        if file:
+            self.save_file(file, report)
+        return report
+
     def df_filter_not(
         self,
         columns,
@@ -227,6 +375,513 @@ class DataSovle(object):
         return res
 
 
+class ResultWriter(object):
+    """
+    缓冲的结果写入器，可在多个线程中同时调用 write
+    行先放入内存缓冲区，达到 batch_size 或距上次写入超过 flush_interval 秒时批量写入；
+    整个生命周期只打开一次文件。支持 csv、jsonl、parquet（每批一个row group），
+    与 save_file 一致：文件已存在时 mode="a" 追加，mode="w" 覆盖；
+    parquet不支持原地追加，追加时会先读出已有数据再重新写入
+    csv/parquet的列在第一次写入时确定，之后出现列之外的键时抛出ValueError，而不是静默丢弃
+    """
+
+    FORMATS = ("csv", "jsonl", "parquet")
+
+    def __init__(
+        self,
+        file: str,
+        file_type: str = None,
+        batch_size: int = 1000,
+        flush_interval: Optional[float] = 1.0,
+        columns: List[str] = None,
+        schema: "pa.Schema" = None,
+        mode: str = "a",
+    ):
+        """
+        :param file: 文件路径
+        :param file_type: csv/jsonl/parquet，默认根据扩展名判断
+        :param batch_size: 缓冲多少行写入一次
+        :param flush_interval: 后台定时写入的间隔（秒），为None时只按批写入
+        :param columns: csv/parquet的全部列及顺序，默认取已有文件的列，没有时取第一批出现的键
+        :param schema: parquet的pyarrow schema，默认由第一批数据推断，第一批中全为空值的列需要声明
+        :param mode: a 追加，w 覆盖
+        """
+        self.file = file
+        self.file_type = file_type or os.path.splitext(file)[1].lstrip(".").lower()
+        if self.file_type not in self.FORMATS:
+            raise ValueError(f"不支持的结果文件类型: {self.file_type}")
+        if mode not in ("a", "w"):
+            raise ValueError(f"mode只能为a或w: {mode}")
+        self.batch_size = batch_size
+        self.columns = columns
+        if schema is not None:
+            self.columns = columns or schema.names
+        self.schema = schema
+        self.mode = mode
+        self.rows_written = 0
+        self._buffer: List[dict] = []
+        self._buffer_lock = threading.Lock()
+        # 保证各批按顺序写入，写文件时不阻塞其他线程继续 write
+        self._write_lock = threading.Lock()
+        self._handle = None
+        self._writer = None
+        self._closed = False
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_periodically,
+                args=(flush_interval,),
+                name="ResultWriter-flush",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def write(self, row: dict):
+        """
+        写入一行
+        :param row:
+        :return:
+        """
+        with self._buffer_lock:
+            if self._closed:
+                raise ValueError("ResultWriter已关闭")
+            self._buffer.append(row)
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def write_many(self, rows: Iterable[dict]):
+        """
+        写入多行
+        :param rows:
+        :return:
+        """
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        """
+        把缓冲区中的行写入文件
+        :return:
+        """
+        with self._write_lock:
+            with self._buffer_lock:
+                rows, self._buffer = self._buffer, []
+            if rows:
+                self._write_rows(rows)
+                self.rows_written += len(rows)
+
+    def close(self):
+        """
+        写入剩余的行并关闭文件
+        :return:
+        """
+        with self._buffer_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+        with self._write_lock:
+            if self.file_type == "parquet" and self._writer is not None:
+                self._writer.close()
+            if self._handle is not None:
+                self._handle.close()
+        logger.info(f"结果写入完成，共 {self.rows_written} 行: {self.file}")
+
+    def _flush_periodically(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"定时写入结果失败: {self.file}, 错误: {e}")
+
+    def _write_rows(self, rows: List[dict]):
+        if self._handle is None and self._writer is None:
+            self._open(rows)
+        if self.file_type == "jsonl":
+            self._handle.write(
+                "".join(
+                    json.dumps(row, ensure_ascii=False, default=str) + "\n"
+                    for row in rows
+                )
+            )
+            self._handle.flush()
+            return
+
+        _check_columns(set().union(*rows), self.columns)
+        if self.file_type == "csv":
+            self._writer.writerows(rows)
+            self._handle.flush()
+        else:
+            import pyarrow as pa
+
+            try:
+                table = pa.Table.from_pylist(rows, schema=self._writer.schema)
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+                raise ValueError(
+                    f"结果与Parquet schema不匹配: {e}，"
+                    "第一批中全为空值的列需要通过schema参数声明类型"
+                ) from e
+            self._writer.write_table(table)
+
+    def _open(self, rows: List[dict]):
+        """第一次写入时打开文件，确定csv/parquet的列"""
+        exists = os.path.exists(self.file) and os.path.getsize(self.file) > 0
+        append = self.mode == "a" and exists
+        if self.file_type == "jsonl":
+            self._handle = open(self.file, self.mode, encoding="utf-8")
+        elif self.file_type == "csv":
+            if append:
+                with open(self.file, encoding="utf-8", newline="") as f:
+                    header = next(csv.reader(f))
+                self._check_existing_columns(header)
+            self.columns = self.columns or _union_keys(rows)
+            self._handle = open(self.file, self.mode, encoding="utf-8", newline="")
+            self._writer = csv.DictWriter(self._handle, fieldnames=self.columns)
+            if not append:
+                self._writer.writeheader()
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            existing = pq.read_table(self.file) if append else None
+            if existing is not None:
+                self._check_existing_columns(existing.schema.names)
+                self.schema = self.schema or existing.schema
+            self.columns = self.columns or _union_keys(rows)
+            if self.schema is None:
+                self.schema = pa.Table.from_pylist(
+                    [
+                        {column: row.get(column) for column in self.columns}
+                        for row in rows
+                    ]
+                ).schema
+            self._writer = pq.ParquetWriter(self.file, self.schema)
+            if existing is not None:
+                self._writer.write_table(existing.cast(self.schema))
+
+    def _check_existing_columns(self, columns: List[str]):
+        if self.columns is not None and list(self.columns) != list(columns):
+            raise ValueError(
+                f"columns与已有文件的列不一致: {self.columns} != {columns}，"
+                '请使用mode="w"覆盖写入'
+            )
+        self.columns = list(columns)
+
+
+def _union_keys(rows: List[dict]) -> List[str]:
+    """按出现顺序合并各行的键"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+
+def _check_columns(keys: Iterable[str], columns: List[str]):
+    """结果中出现列之外的键时抛出ValueError，而不是静默丢弃"""
+    unexpected = set(keys).difference(columns)
+    if unexpected:
+        raise ValueError(
+            f"结果包含列之外的键: {sorted(unexpected)}，请通过columns参数声明所有列"
+        )
+
+
+class QuantileSketch(object):
+    """
+    可合并的近似分位数草图（DDSketch）
+    按对数分桶计数，任意分位数的相对误差不超过 relative_accuracy，
+    内存只与数值的量级跨度有关，多个草图可以直接合并（分块/多进程统计）
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive: Dict[int, int] = {}
+        self.negative: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def update(self, values):
+        """
+        批量添加数值，空值会被忽略
+        :param values:
+        :return:
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += values.size
+        self.zero_count += int(np.count_nonzero(values == 0))
+        self._add(self.positive, values[values > 0])
+        self._add(self.negative, -values[values < 0])
+        return self
+
+    def _add(self, store: Dict[int, int], values: np.ndarray):
+        if not values.size:
+            return
+        keys, counts = np.unique(
+            np.ceil(np.log(values) / self._log_gamma).astype(np.int64),
+            return_counts=True,
+        )
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            store[key] = store.get(key, 0) + count
+
+    def merge(self, other: "QuantileSketch"):
+        """
+        合并另一个草图，两者的精度必须相同
+        :param other:
+        :return:
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("只能合并相同精度的分位数草图")
+        for store, other_store in (
+            (self.positive, other.positive),
+            (self.negative, other.negative),
+        ):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def percentile(self, num: float) -> float:
+        """
+        近似分位数，num取值0-100，与np.percentile一致
+        :param num:
+        :return:
+        """
+        if not self.count:
+            return float("nan")
+        rank = num / 100 * (self.count - 1)
+        cumulative = 0
+        for key in sorted(self.negative, reverse=True):
+            cumulative += self.negative[key]
+            if cumulative > rank:
+                return -self._value(key)
+        cumulative += self.zero_count
+        if cumulative > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            cumulative += self.positive[key]
+            if cumulative > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+class StreamStats(object):
+    """分块统计的中间结果：计数、求和、取值频次和分位数草图，均可合并"""
+
+    def __init__(
+        self,
+        mean: Iterable[str] = (),
+        percentile: Iterable[str] = (),
+        value_counts: Iterable[str] = (),
+        relative_accuracy: float = 0.01,
+    ):
+        self.rows = 0
+        self.sums: Dict[str, float] = {column: 0.0 for column in mean}
+        self.counts: Dict[str, int] = {column: 0 for column in mean}
+        self.sketches: Dict[str, QuantileSketch] = {
+            column: QuantileSketch(relative_accuracy) for column in percentile
+        }
+        self.value_counts: Dict[str, pd.Series] = {
+            column: pd.Series(dtype="int64") for column in value_counts
+        }
+
+    @property
+    def columns(self) -> List[str]:
+        """统计需要读取的列"""
+        return list(dict.fromkeys([*self.sums, *self.sketches, *self.value_counts]))
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+        for column in self.sums:
+            values = chunk[column]
+            self.sums[column] += float(values.sum())
+            self.counts[column] += int(values.count())
+        for column, sketch in self.sketches.items():
+            sketch.update(chunk[column].to_numpy(dtype=float, na_value=np.nan))
+        for column, counts in self.value_counts.items():
+            self.value_counts[column] = counts.add(
+                chunk[column].value_counts(), fill_value=0
+            )
+        return self
+
+    def merge(self, other: "StreamStats"):
+        self.rows += other.rows
+        for column in self.sums:
+            self.sums[column] += other.sums[column]
+            self.counts[column] += other.counts[column]
+        for column, sketch in self.sketches.items():
+            sketch.merge(other.sketches[column])
+        for column, counts in self.value_counts.items():
+            self.value_counts[column] = counts.add(
+                other.value_counts[column], fill_value=0
+            )
+        return self
+
+    def mean(self, columns: str) -> float:
+        count = self.counts[columns]
+        return self.sums[columns] / count if count else float("nan")
+
+    def percentile(self, columns: str, num: float) -> float:
+        return self.sketches[columns].percentile(num)
+
+    def count_prentage(self, columns: str, params) -> float:
+        counts = self.value_counts[columns]
+        total = counts.sum()
+        return float(counts.get(params, 0) / total) if total else float("nan")
+
+
+def _aggregate_csv(
+    file_path: str,
+    predicates: List[Tuple[str, bool, object]],
+    stats: StreamStats,
+    chunksize: int,
+    read_kwargs: dict,
+) -> StreamStats:
+    """逐块读取单个csv文件，应用过滤条件后累加到stats"""
+    if "usecols" not in read_kwargs:
+        read_kwargs = dict(
+            read_kwargs,
+            usecols=list(dict.fromkeys([*(p[0] for p in predicates), *stats.columns])),
+        )
+    for chunk in pd.read_csv(file_path, chunksize=chunksize, **read_kwargs):
+        for columns, equal, params in predicates:
+            mask = chunk[columns] == params
+            chunk = chunk.loc[mask if equal else ~mask]
+        stats.update(chunk)
+    return stats
+
+
+class ChunkedDataSovle(object):
+    """
+    DataSovle的分块统计模式
+    过滤条件只被记录下来，统计时对每一块数据生效；一次统计只需顺序读取一遍文件
+    """
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike, list, tuple],
+        chunksize: int = 100_000,
+        workers: int = 1,
+        relative_accuracy: float = 0.01,
+        **kwargs,
+    ):
+        """
+        :param path: 文件、目录，或者文件路径列表
+        :param chunksize: 每块的行数
+        :param workers: 多个文件时用进程池并行统计，各文件的结果合并
+        :param relative_accuracy: 分位数的相对误差
+        :param kwargs: 透传给 pd.read_csv 的参数
+        """
+        if isinstance(path, (list, tuple)):
+            self.files = list(dict.fromkeys(path))
+        elif os.path.isdir(path):
+            self.files = sorted(
+                os.path.join(path, name)
+                for name in os.listdir(path)
+                if os.path.splitext(name)[1] == ".csv"
+            )
+        else:
+            self.files = [path]
+        self.chunksize = chunksize
+        self.workers = workers
+        self.relative_accuracy = relative_accuracy
+        self.read_kwargs = kwargs
+        self.predicates: List[Tuple[str, bool, object]] = []
+
+    def df_filter_not(self, columns, params):
+        """
+        过滤掉某一列等于某个值的行
+        :return:
+        """
+        self.predicates.append((columns, False, params))
+        return self
+
+    def df_filter_is(self, columns, params):
+        """
+        只保留某一列等于某个值的行
+        :return:
+        """
+        self.predicates.append((columns, True, params))
+        return self
+
+    def aggregate(
+        self,
+        mean: Iterable[str] = (),
+        percentile: Iterable[str] = (),
+        value_counts: Iterable[str] = (),
+    ) -> StreamStats:
+        """
+        一遍读取完成全部统计
+        :param mean: 需要求平均值的列
+        :param percentile: 需要求分位数的列
+        :param value_counts: 需要统计取值频次的列
+        :return: StreamStats，通过 mean/percentile/count_prentage 取结果
+        """
+        make_stats = partial(
+            StreamStats, mean, percentile, value_counts, self.relative_accuracy
+        )
+        aggregate = partial(
+            _aggregate_csv,
+            predicates=list(self.predicates),
+            chunksize=self.chunksize,
+            read_kwargs=self.read_kwargs,
+        )
+        stats = make_stats()
+        if self.workers > 1 and len(self.files) > 1:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = [
+                    executor.submit(aggregate, file_path, stats=make_stats())
+                    for file_path in self.files
+                ]
+                for future in futures:
+                    stats.merge(future.result())
+        else:
+            for file_path in self.files:
+                aggregate(file_path, stats=stats)
+        logger.info(f"分块统计了 {len(self.files)} 个csv文件，共 {stats.rows} 行")
+        return stats
+
+    def df_mean(self, colunms):
+        """
+        拿到某一列的平均值
+        :return:
+        """
+        res = self.aggregate(mean=[colunms]).mean(colunms)
+        logger.info(f"colunms :{colunms}  mean:  {res}")
+        return res
+
+    def df_percentile(self, colunms, num):
+        """
+        拿到某一列的近似分位数
+        :return:
+        """
+        res = self.aggregate(percentile=[colunms]).percentile(colunms, num)
+        logger.info(f"colunms:{colunms} percentile:{num}  vaulue:  {res}")
+        return res
+
+    def df_count_prentage(self, columns, params):
+        """
+        统计某一列中，某个字段出现的概率
+        :return:
+        """
+        res = self.aggregate(value_counts=[columns]).count_prentage(columns, params)
+        logger.info(f"列名:{columns} 字段:{params} 出现的概率为{res}")
+        return res
+
+
 datasolve = DataSovle()
 if __name__ == "__main__":
     pass
@@ -17,12 +17,20 @@
 
 """
 
+import atexit
+import copy
+import glob
+import heapq
+import logging
 import os
+import queue
+import re
 import sys
+import threading
+import time
+import weakref
 
 from loguru import logger
-import logging
-
 
 from conf.constants import base_dir
 
@@ -31,8 +39,6 @@ from conf.constants import base_dir
 # BASE_PATH = os.getcwd()
 BASE_PATH = base_dir
 LOG_PATH = os.path.join(BASE_PATH, "logs")
-if not os.path.exists(LOG_PATH):
-    os.mkdir(LOG_PATH)
 
 
 ##测试代码
@@ -47,6 +53,245 @@ if not os.path.exists(LOG_PATH):
 # logger.add(os.path.join(LOG_PATH,"test2.log"),level=["DEBUG","WARNING"],filter=lambda x: "INFO" in str(x["level"]).upper())
 
 
+# 不带任何handler的logger副本，后台写入线程用它来复用loguru的文件轮转与清理功能
+# 参见 https://loguru.readthedocs.io/en/stable/resources/recipes.html#creating-independent-loggers-with-separate-set-of-handlers
+logger.remove()
+_bare_logger = copy.deepcopy(logger)
+
+_STOP = object()
+
+# 存活的AsyncSink；fork后由模块级钩子统一重建，避免每个sink各注册一次且无法注销
+_live_sinks = weakref.WeakSet()
+
+
+def _restart_sinks_after_fork():
+    for sink in list(_live_sinks):
+        if not sink._closed:
+            sink._start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_sinks_after_fork)
+
+
+class AsyncSink(object):
+    """
+    后台线程写入的日志sink
+
+    调用线程只负责格式化并放入有界队列，真正的写文件由后台线程完成，
+    压测线程之间不再争抢文件sink的锁。队列满时：
+        block: 调用线程等待队列有空位（背压，不丢日志）
+        drop:  直接丢弃这条日志，并计入 dropped
+    fork出的子进程会重新创建队列和后台线程，子进程与父进程各自写入
+    """
+
+    def __init__(self, sink, maxsize: int = 10000, overflow: str = "block", **options):
+        """
+        :param sink: 文件路径或者流（如 sys.stdout）
+        :param maxsize: 队列长度
+        :param overflow: 队列满时的策略，block 或 drop
+        :param options: 传给 logger.add 的参数，如 rotation、retention、encoding
+        """
+        if overflow not in ("block", "drop"):
+            raise ValueError(f"overflow must be block or drop: {overflow}")
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.dropped = 0
+        self._closed = False
+        self._writer = copy.deepcopy(_bare_logger)
+        self._writer.add(sink, format="{message}", level=0, **options)
+        self._start()
+        _live_sinks.add(self)
+
+    def _start(self):
+        self._queue = queue.Queue(self.maxsize)
+        self._dropped_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="AsyncSink-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message):
+        if self._closed:
+            return
+        if self.overflow == "block":
+            self._queue.put(message)
+        else:
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                with self._dropped_lock:
+                    self.dropped += 1
+
+    def _run(self):
+        # 一次取出队列中已有的全部日志，合并为一次写入，摊薄写入logger本身的开销
+        write = self._writer.opt(raw=True).log
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.maxsize:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            stop = batch[-1] is _STOP
+            messages = batch[:-1] if stop else batch
+            try:
+                if messages:
+                    level = max(message.record["level"].no for message in messages)
+                    write(level, "".join(messages))
+            except Exception as e:
+                sys.stderr.write(f"AsyncSink write failed: {e}\n")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def flush(self):
+        """等待队列中已有的日志全部写入"""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self):
+        """写入剩余日志并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        _live_sinks.discard(self)
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._writer.remove()
+        if self.dropped:
+            sys.stderr.write(f"AsyncSink dropped {self.dropped} log messages\n")
+
+
+class EveryN(object):
+    """每N条保留1条（保留第1、N+1、2N+1...条）"""
+
+    def __init__(self, n: int):
+        self.n = n
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            self._count += 1
+            return (self._count - 1) % self.n == 0
+
+
+class TokenBucket(object):
+    """令牌桶：平均每秒最多rate条，允许突发burst条"""
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate = rate
+        self.capacity = burst or rate
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last) * self.rate
+            )
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class LogSampler(object):
+    """
+    按模块和等级对日志采样/限流，作为loguru的filter使用
+
+    规则格式 {"模块前缀:等级": "策略"}，模块和等级都可以写 *，按模块前缀最长匹配：
+        "src.client.base_client:DEBUG": "1/100"   每100条保留1条
+        "src.utils.mock_server:*": "50/s"         每秒最多50条（令牌桶）
+    也可以写成一个字符串，规则之间用分号分隔（环境变量 LOG_SAMPLING）：
+        "src.client.base_client:DEBUG=1/100;src.utils.mock_server:*=50/s"
+    WARNING及以上等级的日志不会被采样
+    """
+
+    def __init__(self, rules):
+        if isinstance(rules, str):
+            rules = dict(
+                rule.split("=", 1) for rule in rules.split(";") if rule.strip()
+            )
+        self.rules = {}
+        for key, policy in rules.items():
+            module, _, level = key.strip().partition(":")
+            self.rules[(module or "*", (level or "*").upper())] = policy.strip()
+        # (模块, 等级) -> (规则, 策略实例)，同一规则下的模块共享一个策略实例
+        self._policies = {}
+        self._resolved = {}
+        self._lock = threading.Lock()
+        self.suppressed = {}
+
+    @staticmethod
+    def _make_policy(policy: str):
+        count, _, unit = policy.partition("/")
+        if unit == "s":
+            return TokenBucket(float(count))
+        if count.strip() == "1" and unit.isdigit():
+            return EveryN(int(unit))
+        raise ValueError(f"无法识别的日志采样策略: {policy}，应为 1/N 或 R/s")
+
+    def _resolve(self, name: str, level: str):
+        best = None
+        for (module, rule_level), policy in self.rules.items():
+            if rule_level not in ("*", level):
+                continue
+            if module != "*" and name != module and not name.startswith(module + "."):
+                continue
+            # 模块越具体越优先，其次是明确指定等级的规则
+            rank = (0 if module == "*" else len(module), rule_level != "*")
+            if best is None or rank > best[0]:
+                best = (rank, (module, rule_level), policy)
+        if best is None:
+            return None
+        rule = best[1]
+        if rule not in self._policies:
+            self._policies[rule] = self._make_policy(best[2])
+        return rule, self._policies[rule]
+
+    def __call__(self, record) -> bool:
+        # 同一条日志会经过每个sink的filter，只在第一次判断时采样
+        extra = record["extra"]
+        decision = extra.get("_sampled")
+        if decision is not None:
+            return decision
+
+        level = record["level"]
+        if level.no >= 30:
+            decision = True
+        else:
+            key = (record["name"], level.name)
+            resolved = self._resolved.get(key, False)
+            if resolved is False:
+                with self._lock:
+                    resolved = self._resolved[key] = self._resolve(*key)
+            if resolved is None:
+                decision = True
+            else:
+                rule, policy = resolved
+                decision = policy.allow()
+                if not decision:
+                    with self._lock:
+                        self.suppressed[rule] = self.suppressed.get(rule, 0) + 1
+        extra["_sampled"] = decision
+        return decision
+
+    def summary(self) -> dict:
+        """被抑制的日志条数，键为 模块:等级"""
+        return {
+            f"{module}:{level}": count
+            for (module, level), count in sorted(self.suppressed.items())
+        }
+
+
 ## 封装成类
 class MyLogger(object):
     def __init__(
@@ -54,36 +299,70 @@ class MyLogger(object):
         log_test_path=os.path.join(LOG_PATH, "tests.log"),
         log_error_path=os.path.join(LOG_PATH, "error.log"),
         log_warn_path=os.path.join(LOG_PATH, "debug.log"),
+        async_mode: bool = None,
+        queue_size: int = None,
+        overflow: str = None,
+        console: bool = True,
+        sampling=None,
+        worker_id: str = None,
     ):
+        """
+        :param console: 是否输出到控制台
+        :param worker_id: pytest-xdist的worker id（如 gw0），默认读取环境变量 PYTEST_XDIST_WORKER；
+            设置后日志写入各自的文件（tests.gw0.log），避免多个进程写同一个文件和轮转冲突，
+            用例结束后由 merge_worker_logs 合并
+        :param sampling: 日志采样规则，见 LogSampler，默认读取环境变量 LOG_SAMPLING
+        :param async_mode: 后台线程写日志，默认读取环境变量 LOG_ASYNC（1/true/yes 开启）
+        :param queue_size: 后台写入队列长度，默认读取环境变量 LOG_QUEUE_SIZE，否则为10000
+        :param overflow: 队列满时的策略 block/drop，默认读取环境变量 LOG_OVERFLOW，否则为block
+        """
+        if async_mode is None:
+            async_mode = os.getenv("LOG_ASYNC", "0").lower() in ("1", "true", "yes")
+        self.async_mode = async_mode
+        self.queue_size = queue_size or int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        self.overflow = overflow or os.getenv("LOG_OVERFLOW", "block")
+        self.async_sinks = []
+        self.worker_id = worker_id or os.getenv("PYTEST_XDIST_WORKER")
+        if self.worker_id:
+            log_test_path = worker_log_path(log_test_path, self.worker_id)
+            log_warn_path = worker_log_path(log_warn_path, self.worker_id)
+        self.log_test_path = log_test_path
+        self.log_warn_path = log_warn_path
+        sampling = sampling or os.getenv("LOG_SAMPLING")
+        self.sampler = LogSampler(sampling) if sampling else None
+
         self.logger = logger
         # 清空所有设置
         self.logger.remove()
         # 添加控制台输出的格式,sys.stdout为输出到屏幕;关于这些配置还需要自定义请移步官网查看相关参数说明
-        self.logger.add(
-            sys.stdout,
-            format="<green>{time:YYYY-MM-DD HH:mm:ss:sss}</green> | "  # 颜色>时间
-            "{process.name} | "  # 进程名
-            "{thread.name} | "  # 线程名
-            "<cyan>{module}</cyan>.<cyan>{function}</cyan>"  # 模块名.方法名
-            ":<cyan>{line}</cyan> | "  # 行号
-            "<level>{level}</level>: "  # 等级
-            "<level>{message}</level>",  # 日志内容
-        )
+        if console:
+            self._add(
+                sys.stdout,
+                format="<green>{time:YYYY-MM-DD HH:mm:ss:sss}</green> | "  # 颜色>时间
+                "{process.name} | "  # 进程名
+                "{thread.name} | "  # 线程名
+                "<cyan>{module}</cyan>.<cyan>{function}</cyan>"  # 模块名.方法名
+                ":<cyan>{line}</cyan> | "  # 行号
+                "<level>{level}</level>: "  # 等级
+                "<level>{message}</level>",  # 日志内容
+            )
         # 输出到文件的格式,注释下面的add',则关闭日志写入
-        self.logger.add(
+        self._add(
             log_test_path,
-            format="{time:YYYYMMDD HH:mm:ss:sss} - "  # 时间
+            format="{time:YYYYMMDD HH:mm:ss.SSSSSS} - "  # 时间（微秒，合并日志时按此排序）
             "{process.name} | "  # 进程名
             "{thread.name} | "  # 线程名
             "{module}.{function}:{line} - {level} -{message}",  # 模块名.方法名:行号
             rotation="100 MB",
             retention="10 days",
             encoding="utf-8",
+            # 第一次写日志时才创建日志目录和文件，导入本模块没有文件系统副作用
+            delay=True,
         )
         # self.logger.add(
         #     log_error_path,
         #     level="ERROR",
-        #     format="{time:YYYYMMDD HH:mm:ss:sss} - "  # 时间
+        #     format="{time:YYYYMMDD HH:mm:ss.SSSSSS} - "  # 时间（微秒，合并日志时按此排序）
         #     "{process.name} | "  # 进程名
         #     "{thread.name} | "  # 线程名
         #     "{module}.{function}:{line} - {level} -{message}",  # 模块名.方法名:行号
@@ -91,33 +370,234 @@ class MyLogger(object):
         #     retention="10 days",
         #     encoding="utf-8",
         # )
-        self.logger.add(
+        self._add(
             log_warn_path,
             level="WARNING",
-            format="{time:YYYYMMDD HH:mm:ss:sss} - "  # 时间
+            format="{time:YYYYMMDD HH:mm:ss.SSSSSS} - "  # 时间（微秒，合并日志时按此排序）
             "{process.name} | "  # 进程名
             "{thread.name} | "  # 线程名
             "{module}.{function}:{line} - {level} -{message}",  # 模块名.方法名:行号
             rotation="100 MB",
             retention="10 days",
             encoding="utf-8",
+            delay=True,
         )
         # self.logger.add(PropagateHandler())
 
+    def _add(self, sink, level="DEBUG", format=None, **options):
+        """
+        添加sink，异步模式下包装为 AsyncSink：
+        格式化与过滤仍在调用线程完成，文件轮转、清理等参数交给后台线程的写入logger
+        """
+        if self.sampler is not None:
+            options.setdefault("filter", self.sampler)
+        if not self.async_mode:
+            return self.logger.add(sink, level=level, format=format, **options)
+
+        colorize = options.pop("colorize", None)
+        if colorize is None:
+            colorize = hasattr(sink, "isatty") and sink.isatty()
+        log_filter = options.pop("filter", None)
+        async_sink = AsyncSink(
+            sink, maxsize=self.queue_size, overflow=self.overflow, **options
+        )
+        self.async_sinks.append(async_sink)
+        return self.logger.add(
+            async_sink,
+            level=level,
+            format=format,
+            colorize=colorize,
+            filter=log_filter,
+        )
+
+    @property
+    def dropped(self) -> int:
+        """队列满时被丢弃的日志条数"""
+        return sum(sink.dropped for sink in self.async_sinks)
+
+    def sampling_summary(self) -> dict:
+        """被采样规则抑制的日志条数，键为 模块:等级"""
+        return self.sampler.summary() if self.sampler is not None else {}
+
+    def flush(self):
+        """等待后台写入线程把队列中的日志全部写入，用例结束时调用"""
+        for sink in self.async_sinks:
+            sink.flush()
+
+    def close(self):
+        """移除全部sink并停止后台写入线程"""
+        self.logger.remove()
+        for sink in self.async_sinks:
+            sink.close()
+
     def get_logger(self):
         return self.logger
 
+
+def benchmark(threads: int = 50, messages: int = 2000, log_dir: str = None, **kwargs):
+    """
+    日志吞吐量基准：多个线程同时写日志，返回每秒日志调用次数
+    注意：会替换全局logger的sink，仅用于命令行执行
+    :param threads: 线程数
+    :param messages: 每个线程写入的日志条数
+    :param log_dir: 日志目录，默认为临时目录
+    :param kwargs: 传给 MyLogger 的参数，如 async_mode、overflow
+    :return: (每秒调用次数, 丢弃条数)
+    """
+    import tempfile
+    from concurrent.futures import ThreadPoolExecutor
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_dir = log_dir or tmp_dir
+        my_logger = MyLogger(
+            log_test_path=os.path.join(log_dir, "tests.log"),
+            log_warn_path=os.path.join(log_dir, "debug.log"),
+            console=False,
+            **kwargs,
+        )
+
+        def work(index):
+            for seq in range(messages):
+                my_logger.logger.debug(f"worker {index} message {seq}")
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(work, range(threads)))
+        elapsed = time.perf_counter() - started
+        my_logger.close()
+        return threads * messages / elapsed, my_logger.dropped
+
+
+def worker_log_path(path: str, worker_id: str) -> str:
+    """tests.log -> tests.gw0.log"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker_id}{ext}"
+
+
+# 文件日志每条记录的开头：固定宽度的时间戳，字符串顺序即时间顺序
+_RECORD_START = re.compile(r"^\d{8} \d{2}:\d{2}:\d{2}\.\d{6} - ")
+
+
+def _iter_log_records(path: str, index: int, since: str = ""):
+    """
+    逐条读取日志记录，不以时间戳开头的行（如多行的请求/响应内容）属于上一条记录
+    :param since: 只读取时间戳不早于此值的记录（与日志相同的格式）
+    :return: (时间戳, 文件序号, 记录文本) 迭代器
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as file:
+        timestamp, lines = "", []
+        for line in file:
+            if _RECORD_START.match(line):
+                if lines and timestamp >= since:
+                    yield timestamp, index, "".join(lines)
+                timestamp, lines = line[:24], [line]
+            else:
+                lines.append(line)
+        if lines and timestamp >= since:
+            yield timestamp, index, "".join(lines)
+
+
+def merge_log_files(files, output: str, since: str = "") -> int:
+    """
+    按时间戳把多个日志文件合并为一个（k路归并）
+    每个文件内部已按时间排序，合并时每个文件只保留当前一条记录在内存中
+    :param files: 日志文件列表
+    :param output: 合并后的文件
+    :param since: 只合并时间戳不早于此值的记录
+    :return: 合并的记录条数
+    """
+    streams = [
+        _iter_log_records(path, index, since) for index, path in enumerate(files)
+    ]
+    count = 0
+    with open(output, "w", encoding="utf-8") as out:
+        for _, _, text in heapq.merge(*streams):
+            out.write(text)
+            count += 1
+    return count
+
+
+def merge_worker_logs(
+    log_dir: str = LOG_PATH,
+    names=("tests.log", "debug.log"),
+    workers: int = None,
+    since: float = None,
+    remove: bool = False,
+):
+    """
+    合并各xdist worker的日志文件（含轮转后的旧文件）：tests.gw*.log -> tests.merged.log
+    worker文件按追加方式写入并保留10天，目录中可能残留之前运行的文件和worker，
+    用例结束后合并时应通过 workers、since 只选取本次运行的日志，并删除已合并的文件
+    :param log_dir: 日志目录
+    :param names: 需要合并的日志文件名
+    :param workers: worker数量，只合并 gw0..gw{workers-1}，为None时合并所有 gw* 文件
+    :param since: 开始时间（时间戳），只合并此后写入的记录
+    :param remove: 合并成功后删除worker的日志文件
+    :return: {合并后的文件: 记录条数}
+    """
+    since_text = ""
+    if since is not None:
+        since_text = time.strftime("%Y%m%d %H:%M:%S", time.localtime(since))
+        since_text += f".{int(since % 1 * 1_000_000):06d}"
+    result = {}
+    for name in names:
+        root, ext = os.path.splitext(name)
+        if workers is None:
+            patterns = [f"{root}.gw*{ext}"]
+        else:
+            # 轮转后的旧文件名为 tests.gw0.2024-01-01_10-00-00_000000.log
+            patterns = [
+                pattern
+                for index in range(workers)
+                for pattern in (f"{root}.gw{index}{ext}", f"{root}.gw{index}.*{ext}")
+            ]
+        files = sorted(
+            path
+            for pattern in patterns
+            for path in glob.glob(os.path.join(log_dir, pattern))
+            if since is None or os.path.getmtime(path) >= since
+        )
+        if files:
+            output = os.path.join(log_dir, f"{root}.merged{ext}")
+            result[output] = merge_log_files(files, output, since_text)
+            if remove:
+                for path in files:
+                    os.remove(path)
+    return result
+
+
 class PropagateHandler(logging.Handler):
     def emit(self, record):
         logging.getLogger(record.name).handle(record)
 
 
-
 # logger.info("hello world")
-logger = MyLogger().get_logger()
+my_logger = MyLogger()
+logger = my_logger.get_logger()
+# 异步模式下，进程退出前把队列中的日志写完
+atexit.register(my_logger.flush)
 
 if __name__ == "__main__":
-    print(LOG_PATH)
-    logger.info("tests info")
-    logger.debug("tests debug")
-    logger.warning(" error")
+    import argparse
+
+    # python -m src.utils.log_moudle bench   日志吞吐量基准
+    # python -m src.utils.log_moudle merge   合并各xdist worker的日志
+    parser = argparse.ArgumentParser(prog="python -m src.utils.log_moudle")
+    parser.add_argument("command", choices=["bench", "merge"])
+    parser.add_argument("--log-dir", default=LOG_PATH)
+    parser.add_argument("--workers", type=int, help="只合并 gw0..gw{workers-1}")
+    args = parser.parse_args()
+
+    if args.command == "merge":
+        for output, count in merge_worker_logs(
+            args.log_dir, workers=args.workers
+        ).items():
+            print(f"merged {count} records -> {output}")
+    else:
+        for options in (
+            {"async_mode": False},
+            {"async_mode": True, "overflow": "block"},
+            {"async_mode": True, "overflow": "drop", "queue_size": 1000},
+        ):
+            calls, dropped = benchmark(**options)
+            print(f"{options}: {calls:,.0f} calls/s from 50 threads, dropped {dropped}")
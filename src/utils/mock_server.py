@@ -4,11 +4,21 @@ Mock服务器工具模块
 提供轻量级的Mock服务器，用于模拟API响应
 """
 
+import heapq
+import itertools
 import json
+import multiprocessing
+import os
+import re
+import socket
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
 from urllib.parse import parse_qs, urlparse
 
 from src.utils.log_moudle import logger
@@ -39,6 +49,80 @@ class MockResponse:
         self.delay = delay
 
 
+class LazyMockResponse(MockResponse):
+    """响应体在首次使用时才生成并缓存的Mock响应"""
+
+    def __init__(
+        self,
+        body_factory: Callable[[], Any],
+        status_code: int = 200,
+        headers: Dict[str, str] = None,
+        delay: float = 0,
+    ):
+        """
+        初始化延迟生成的Mock响应
+
+        Args:
+            body_factory: 生成响应体的无参函数，只会被调用一次
+            status_code: HTTP状态码
+            headers: 响应头
+            delay: 响应延迟（秒）
+        """
+        super().__init__(status_code, headers, None, delay)
+        self._body_factory = body_factory
+        self._body_ready = False
+
+    @property
+    def body(self) -> Any:
+        if not self._body_ready:
+            body = self._body_factory()
+            self._body = {} if body is None else body
+            self._body_ready = True
+        return self._body
+
+    @body.setter
+    def body(self, value: Any):
+        self._body = value
+        self._body_ready = True
+
+    def __getstate__(self):
+        # 传递给工作进程前先生成响应体，避免序列化整个生成上下文
+        state = self.__dict__.copy()
+        state["_body"] = self.body
+        state["_body_ready"] = True
+        state["_body_factory"] = None
+        return state
+
+
+def _compile_path_template(path: str) -> Optional["re.Pattern"]:
+    """将路径模板编译为正则，如 /users/{id} -> /users/[^/]+，非模板路径返回None"""
+    pieces = re.split(r"\{[^/{}]+\}", path)
+    if len(pieces) == 1:
+        return None
+    return re.compile("[^/]+".join(re.escape(piece) for piece in pieces))
+
+
+class _TemplateNode:
+    """路径模板索引的节点：按路径模板开头的固定路径逐级建树，节点上挂以该前缀开头的模板规则"""
+
+    __slots__ = ("rules", "children")
+
+    def __init__(self):
+        # (添加顺序, 规则)，按添加顺序递增
+        self.rules: List[Tuple[int, "MockRule"]] = []
+        self.children: Dict[str, "_TemplateNode"] = {}
+
+
+def _literal_prefix(path: str) -> List[str]:
+    """路径模板开头不含参数的各级路径，如 /api/users/{id}/orders -> ["api", "users"]"""
+    prefix = []
+    for segment in path.strip("/").split("/"):
+        if "{" in segment:
+            break
+        prefix.append(segment)
+    return prefix
+
+
 class MockRule:
     """Mock规则类"""
 
@@ -66,6 +150,25 @@ class MockRule:
         self.query_params = query_params or {}
         self.request_body = request_body or {}
         self.call_count = 0
+        self._count_lock = threading.Lock()
+        # 路径模板（如 /users/{id}）对应的正则，普通路径为None
+        self.path_pattern = _compile_path_template(path)
+
+    def __getstate__(self):
+        # 锁对象无法序列化，传递给工作进程时去掉并重建
+        state = self.__dict__.copy()
+        del state["_count_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._count_lock = threading.Lock()
+
+    def record_call(self) -> int:
+        """线程安全地累加调用次数，返回累加后的次数"""
+        with self._count_lock:
+            self.call_count += 1
+            return self.call_count
 
     def matches(
         self,
@@ -87,7 +190,12 @@ class MockRule:
             是否匹配
         """
         # 检查方法和路径
-        if self.method != method.upper() or self.path != path:
+        if self.method != method.upper():
+            return False
+        if self.path_pattern is None:
+            if self.path != path:
+                return False
+        elif not self.path_pattern.fullmatch(path):
             return False
 
         # 检查查询参数
@@ -107,12 +215,277 @@ class MockRule:
         return True
 
 
+@dataclass
+class MockRequestRecord:
+    """Mock服务器收到的请求记录"""
+
+    timestamp: float
+    method: str
+    path: str
+    query_params: Dict = field(default_factory=dict)
+    body: Any = None
+    status_code: int = 404
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        按点号路径读取字段，如 body.name、query_params.page
+
+        Args:
+            key: 字段路径
+            default: 字段不存在时的默认值
+
+        Returns:
+            字段值
+        """
+        value: Any = self
+        for part in key.split("."):
+            if isinstance(value, dict):
+                if part not in value:
+                    return default
+                value = value[part]
+            elif isinstance(value, MockRequestRecord) and hasattr(value, part):
+                value = getattr(value, part)
+            else:
+                return default
+        return value
+
+
+def _parse_query_value(value: str) -> Any:
+    """将查询参数/路径参数按JSON解析（如 "2" -> 2），解析失败时保留原字符串"""
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def _resource_response(
+    status_code: int, message: str, data: Any = None
+) -> MockResponse:
+    """构造资源接口的统一响应体"""
+    return MockResponse(
+        status_code, body={"code": status_code, "message": message, "data": data}
+    )
+
+
+def _index_key(value: Any) -> Any:
+    """将字段值转换为可哈希的索引键"""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+
+class MockResource:
+    """有状态的Mock资源集合（内存存储，支持索引、过滤查询与分页）"""
+
+    def __init__(
+        self,
+        name: str,
+        id_field: str = "id",
+        indexes: List[str] = None,
+    ):
+        """
+        初始化Mock资源集合
+
+        Args:
+            name: 资源名称，如 product
+            id_field: 主键字段名
+            indexes: 需要建立索引的字段列表
+        """
+        self.name = name
+        self.id_field = id_field
+        self.items: Dict[Any, Dict] = {}
+        self.indexes: Dict[str, Dict[Any, set]] = {field: {} for field in indexes or []}
+        self._sequence: Dict[Any, int] = {}
+        self._next_id = 1
+        self._next_seq = 0
+        self._lock = threading.RLock()
+
+    def _add_to_indexes(self, item_id: Any, item: Dict):
+        for field, index in self.indexes.items():
+            if field in item:
+                index.setdefault(_index_key(item[field]), set()).add(item_id)
+
+    def _remove_from_indexes(self, item_id: Any, item: Dict):
+        for field, index in self.indexes.items():
+            if field not in item:
+                continue
+            key = _index_key(item[field])
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(item_id)
+                if not ids:
+                    del index[key]
+
+    def create(self, data: Dict) -> Optional[Dict]:
+        """
+        创建资源
+
+        Args:
+            data: 资源数据，未指定主键时自动分配自增ID
+
+        Returns:
+            创建后的资源，主键冲突时返回None
+        """
+        with self._lock:
+            item = dict(data)
+            item_id = item.get(self.id_field)
+            if item_id is None:
+                while self._next_id in self.items:
+                    self._next_id += 1
+                item_id = self._next_id
+                self._next_id += 1
+                item[self.id_field] = item_id
+            elif item_id in self.items:
+                return None
+
+            self.items[item_id] = item
+            self._sequence[item_id] = self._next_seq
+            self._next_seq += 1
+            self._add_to_indexes(item_id, item)
+            return dict(item)
+
+    def get(self, item_id: Any) -> Optional[Dict]:
+        """根据主键获取资源"""
+        with self._lock:
+            item = self.items.get(item_id)
+            return dict(item) if item is not None else None
+
+    def update(self, item_id: Any, data: Dict) -> Optional[Dict]:
+        """
+        更新资源（合并更新，主键不可修改）
+
+        Args:
+            item_id: 资源主键
+            data: 需要更新的字段
+
+        Returns:
+            更新后的资源，不存在时返回None
+        """
+        with self._lock:
+            item = self.items.get(item_id)
+            if item is None:
+                return None
+            self._remove_from_indexes(item_id, item)
+            item.update({k: v for k, v in data.items() if k != self.id_field})
+            self._add_to_indexes(item_id, item)
+            return dict(item)
+
+    def delete(self, item_id: Any) -> bool:
+        """删除资源，返回是否删除成功"""
+        with self._lock:
+            item = self.items.pop(item_id, None)
+            if item is None:
+                return False
+            self._sequence.pop(item_id, None)
+            self._remove_from_indexes(item_id, item)
+            return True
+
+    def search(
+        self,
+        filters: Dict = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> Dict:
+        """
+        按字段过滤查询资源（值为None的条件会被忽略）
+
+        索引字段通过索引集合求交集，其余字段在候选集中逐条比较
+
+        Args:
+            filters: 过滤条件，字段名 -> 期望值
+            page: 页码，从1开始
+            page_size: 每页条数
+
+        Returns:
+            包含 items、total、page、page_size 的分页结果
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        page = max(int(page), 1)
+        page_size = max(int(page_size), 1)
+
+        with self._lock:
+            indexed = [
+                (field, value)
+                for field, value in filters.items()
+                if field in self.indexes
+            ]
+            scanned = [
+                (field, value)
+                for field, value in filters.items()
+                if field not in self.indexes
+            ]
+
+            if indexed:
+                # 从最小的候选集开始求交集，减少比较次数
+                id_sets = sorted(
+                    (
+                        self.indexes[field].get(_index_key(value), set())
+                        for field, value in indexed
+                    ),
+                    key=len,
+                )
+                candidates = set(id_sets[0])
+                for ids in id_sets[1:]:
+                    candidates &= ids
+                    if not candidates:
+                        break
+                candidate_ids = sorted(candidates, key=self._sequence.__getitem__)
+            else:
+                candidate_ids = list(self.items)
+
+            if scanned:
+                candidate_ids = [
+                    item_id
+                    for item_id in candidate_ids
+                    if all(
+                        self.items[item_id].get(field) == value
+                        for field, value in scanned
+                    )
+                ]
+
+            start = (page - 1) * page_size
+            items = [
+                dict(self.items[item_id])
+                for item_id in candidate_ids[start : start + page_size]
+            ]
+            return {
+                "items": items,
+                "total": len(candidate_ids),
+                "page": page,
+                "page_size": page_size,
+            }
+
+    def count(self) -> int:
+        """资源总数"""
+        with self._lock:
+            return len(self.items)
+
+    def clear(self):
+        """清空资源"""
+        with self._lock:
+            self.items.clear()
+            self._sequence.clear()
+            for index in self.indexes.values():
+                index.clear()
+            self._next_id = 1
+            self._next_seq = 0
+
+
 class MockRequestHandler(BaseHTTPRequestHandler):
     """Mock请求处理器"""
 
+    # 开启长连接，压测客户端复用连接时无需每次握手
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写出，关闭Nagle算法避免与延迟ACK叠加产生40ms停顿
+    disable_nagle_algorithm = True
+
     def log_message(self, format, *args):
-        """重写日志方法，使用自定义logger"""
-        logger.info(f"Mock Server: {format % args}")
+        """重写日志方法，使用自定义logger（仅在开启log_requests时逐条记录）"""
+        mock_server = getattr(self.server, "mock_server", None)
+        if mock_server is None or mock_server.log_requests:
+            logger.info(f"Mock Server: {format % args}")
 
     def do_GET(self):
         """处理GET请求"""
@@ -142,16 +515,15 @@ class MockRequestHandler(BaseHTTPRequestHandler):
             path = parsed_url.path
             query_params = parse_qs(parsed_url.query)
 
-            # 读取请求体
+            # 读取请求体（长连接下必须读完，否则会污染下一个请求）
             request_body = {}
-            if method in ["POST", "PUT", "PATCH"]:
-                content_length = int(self.headers.get("Content-Length", 0))
-                if content_length > 0:
-                    body_data = self.rfile.read(content_length)
-                    try:
-                        request_body = json.loads(body_data.decode("utf-8"))
-                    except json.JSONDecodeError:
-                        request_body = {"raw": body_data.decode("utf-8")}
+            content_length = int(self.headers.get("Content-Length", 0))
+            if content_length > 0:
+                body_data = self.rfile.read(content_length)
+                try:
+                    request_body = json.loads(body_data.decode("utf-8"))
+                except json.JSONDecodeError:
+                    request_body = {"raw": body_data.decode("utf-8")}
 
             # 查找匹配的规则
             mock_server = getattr(self.server, "mock_server", None)
@@ -165,53 +537,154 @@ class MockRequestHandler(BaseHTTPRequestHandler):
                         time.sleep(response.delay)
 
                     # 发送响应
-                    self.send_response(response.status_code)
-                    for key, value in response.headers.items():
-                        self.send_header(key, value)
-                    self.end_headers()
-
-                    # 发送响应体
                     if isinstance(response.body, (dict, list)):
                         response_data = json.dumps(response.body, ensure_ascii=False)
                     else:
                         response_data = str(response.body)
 
-                    self.wfile.write(response_data.encode("utf-8"))
+                    self._write_response(
+                        response.status_code,
+                        response.headers,
+                        response_data.encode("utf-8"),
+                    )
                     return
 
             # 没有找到匹配的规则，返回404
-            self.send_response(404)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
             error_response = {
                 "error": "Not Found",
                 "message": f"No mock rule found for {method} {path}",
             }
-            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+            self._write_response(
+                404,
+                {"Content-Type": "application/json"},
+                json.dumps(error_response).encode("utf-8"),
+            )
 
         except Exception as e:
             logger.error(f"Mock服务器处理请求失败: {e}")
-            self.send_response(500)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
             error_response = {"error": "Internal Server Error", "message": str(e)}
-            self.wfile.write(json.dumps(error_response).encode("utf-8"))
+            self._write_response(
+                500,
+                {"Content-Type": "application/json"},
+                json.dumps(error_response).encode("utf-8"),
+            )
+
+    def _write_response(self, status_code: int, headers: Dict[str, str], data: bytes):
+        """发送响应（带Content-Length，以支持HTTP/1.1长连接）"""
+        if status_code in (204, 304) or status_code < 200:
+            data = b""
+        self.send_response(status_code)
+        for key, value in headers.items():
+            if key.lower() != "content-length":
+                self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    """多线程HTTP服务器"""
+
+    daemon_threads = True
+
+
+class _ReusePortHTTPServer(_MockHTTPServer):
+    """开启SO_REUSEPORT的HTTP服务器，多个进程可监听同一端口，由内核分发连接"""
+
+    allow_reuse_port = True
+
+
+def _run_worker(
+    host: str,
+    port: int,
+    rules: List[MockRule],
+    journal_size: int,
+    log_requests: bool,
+    conn,
+):
+    """
+    Mock服务器工作进程入口
+
+    通过管道接收控制命令，并回传调用计数和请求日志
+    """
+    server = MockServer(
+        host, port, journal_size=journal_size, log_requests=log_requests
+    )
+    for rule in rules:
+        server._add_rule_object(rule)
+
+    try:
+        server._serve(_ReusePortHTTPServer)
+    except Exception as e:
+        conn.send(("error", str(e)))
+        conn.close()
+        return
+    conn.send(("ready", os.getpid()))
+
+    while True:
+        try:
+            command, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        if command == "stop":
+            break
+        try:
+            conn.send(("ok", server._handle_command(command, *args)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+    server.stop()
+    conn.close()
 
 
 class MockServer:
     """Mock服务器类"""
 
-    def __init__(self, host: str = "localhost", port: int = 8888):
+    RESOURCE_ACTIONS = ("create", "get", "update", "delete", "search")
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 8888,
+        journal_size: int = 0,
+        log_requests: bool = False,
+        workers: int = 1,
+    ):
         """
         初始化Mock服务器
 
         Args:
             host: 服务器主机
-            port: 服务器端口
+            port: 服务器端口，0表示由系统分配空闲端口（启动后可通过 port 或 base_url 获取）
+            journal_size: 请求日志环形缓冲区的容量，0表示不记录
+            log_requests: 是否逐条打印请求日志（高并发压测时建议关闭）
+            workers: 工作进程数，大于1时多个进程通过SO_REUSEPORT共享端口
         """
         self.host = host
         self.port = port
+        self.log_requests = log_requests
+        self.journal_size = journal_size
+        self.workers = workers
+        # 多进程模式下的 (进程, 控制管道) 列表
+        self._worker_procs: List[Tuple[Any, Any]] = []
+        self._control_lock = threading.Lock()
         self.rules: List[MockRule] = []
+        # (方法, 路径) -> 规则列表，按添加顺序匹配
+        self._rule_index: Dict[Tuple[str, str], List[MockRule]] = {}
+        # 方法 -> 路径模板规则的前缀树，精确路径未命中时只对前缀相同的模板做正则匹配
+        self._template_index: Dict[str, _TemplateNode] = {}
+        self._template_count = 0
+        # deque 的 append 在多线程下是原子的，超出容量时自动丢弃最早的记录
+        self.journal: Optional[Deque[MockRequestRecord]] = (
+            deque(maxlen=journal_size) if journal_size > 0 else None
+        )
+        self.resources: Dict[str, MockResource] = {}
+        # (方法, 路径) -> (资源, 操作, 是否REST路由)，用于集合级路由及自定义动作路由
+        self._resource_routes: Dict[Tuple[str, str], Tuple[MockResource, str, bool]] = (
+            {}
+        )
+        # 集合路径 -> 资源，用于 {path}/{id} 形式的单条资源路由
+        self._resource_paths: Dict[str, MockResource] = {}
         self.server = None
         self.server_thread = None
         self.logger = logger
@@ -238,10 +711,78 @@ class MockServer:
             Mock服务器实例（支持链式调用）
         """
         rule = MockRule(method, path, response, query_params, request_body)
-        self.rules.append(rule)
+        self._add_rule_object(rule)
+        if self._worker_procs:
+            self._broadcast("add_rules", [rule])
         self.logger.info(f"添加Mock规则: {method} {path}")
         return self
 
+    def _add_rule_object(self, rule: MockRule):
+        self.rules.append(rule)
+        self._rule_index.setdefault((rule.method, rule.path), []).append(rule)
+        if rule.path_pattern is not None:
+            node = self._template_index.setdefault(rule.method, _TemplateNode())
+            for segment in _literal_prefix(rule.path):
+                node = node.children.setdefault(segment, _TemplateNode())
+            node.rules.append((self._template_count, rule))
+            self._template_count += 1
+
+    def _template_candidates(self, method: str, path: str) -> Iterable[MockRule]:
+        """固定前缀与请求路径一致的模板规则，按添加顺序返回"""
+        node = self._template_index.get(method)
+        if node is None:
+            return ()
+        buckets = [node.rules] if node.rules else []
+        for segment in path.strip("/").split("/"):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.rules:
+                buckets.append(node.rules)
+        if len(buckets) == 1:
+            return (rule for _, rule in buckets[0])
+        return (rule for _, rule in heapq.merge(*buckets, key=lambda item: item[0]))
+
+    def load_openapi(
+        self, spec: Union[str, Path, Dict], base_path: str = None
+    ) -> "MockServer":
+        """
+        根据OpenAPI 3文档为每个接口生成Mock规则
+
+        响应取自文档中最小的2xx响应：优先使用example/examples，
+        否则根据schema生成；响应体在首次请求时生成并缓存
+
+        Args:
+            spec: 文档路径（.json/.yaml/.yml）或已解析的字典
+            base_path: 路径前缀，默认取 servers[0].url 中的路径
+
+        Returns:
+            Mock服务器实例（支持链式调用）
+        """
+        from src.utils.openapi import OpenAPISpec
+
+        api = OpenAPISpec(spec)
+        prefix = api.base_path if base_path is None else base_path.rstrip("/")
+
+        rules = []
+        for method, path, operation in api.iter_operations():
+            status_code, content_type, media = api.select_response(operation)
+            headers = {"Content-Type": content_type or "application/json"}
+            if media:
+                response = LazyMockResponse(
+                    partial(api.example_from_media, media), status_code, headers
+                )
+            else:
+                response = MockResponse(status_code, headers)
+            rules.append(MockRule(method, prefix + path, response))
+
+        for rule in rules:
+            self._add_rule_object(rule)
+        if self._worker_procs:
+            self._broadcast("add_rules", rules)
+        self.logger.info(f"从OpenAPI文档加载了 {len(rules)} 条Mock规则")
+        return self
+
     def find_response(
         self,
         method: str,
@@ -261,26 +802,206 @@ class MockServer:
         Returns:
             匹配的响应或None
         """
-        for rule in self.rules:
+        response = None
+        method = method.upper()
+        candidates = itertools.chain(
+            self._rule_index.get((method, path), ()),
+            self._template_candidates(method, path),
+        )
+        for rule in candidates:
             if rule.matches(method, path, query_params, request_body):
-                rule.call_count += 1
-                self.logger.info(
-                    f"匹配Mock规则: {method} {path} (调用次数: {rule.call_count})"
+                call_count = rule.record_call()
+                if self.log_requests:
+                    self.logger.debug(
+                        f"匹配Mock规则: {method} {path} (调用次数: {call_count})"
+                    )
+                response = rule.response
+                break
+        else:
+            response = self._dispatch_resource(method, path, query_params, request_body)
+
+        if self.journal is not None:
+            self.journal.append(
+                MockRequestRecord(
+                    timestamp=time.time(),
+                    method=method.upper(),
+                    path=path,
+                    query_params=query_params or {},
+                    body=request_body,
+                    status_code=response.status_code if response else 404,
                 )
-                return rule.response
+            )
 
-        self.logger.warning(f"未找到匹配的Mock规则: {method} {path}")
-        return None
+        # 未匹配的请求同样记录在请求日志中（状态码404），逐条打印只在 log_requests 时开启
+        if response is None and self.log_requests:
+            self.logger.warning(f"未找到匹配的Mock规则: {method} {path}")
+        return response
+
+    def add_resource(
+        self,
+        name: str,
+        path: str = None,
+        id_field: str = "id",
+        indexes: List[str] = None,
+        actions: Dict[str, Tuple[str, str]] = None,
+    ) -> "MockServer":
+        """
+        添加有状态的Mock资源集合
+
+        指定path时自动注册REST路由:
+            POST {path}             创建
+            GET {path}              过滤查询（查询参数为过滤条件，支持page/page_size分页）
+            GET {path}/{id}         获取
+            PUT/PATCH {path}/{id}   更新
+            DELETE {path}/{id}      删除
+
+        actions 用于适配非REST风格的接口，操作名为 create/get/update/delete/search，
+        主键从请求体的 id_field 或 {name}_id 字段中读取，例如:
+            actions={
+                "create": ("POST", "/api/product/add"),
+                "delete": ("POST", "/api/product/delete"),
+                "search": ("POST", "/api/product/search"),
+            }
+
+        Args:
+            name: 资源名称
+            path: REST风格的集合路径，如 /api/products
+            id_field: 主键字段名
+            indexes: 需要建立索引的字段列表，查询条件命中索引时无需全量扫描
+            actions: 操作名 -> (HTTP方法, 请求路径)
+
+        Returns:
+            Mock服务器实例（支持链式调用）
+        """
+        resource = MockResource(name, id_field=id_field, indexes=indexes)
+        self.resources[name] = resource
+
+        if path:
+            path = path.rstrip("/")
+            self._resource_routes[("POST", path)] = (resource, "create", True)
+            self._resource_routes[("GET", path)] = (resource, "search", True)
+            self._resource_paths[path] = resource
+
+        for action, (method, action_path) in (actions or {}).items():
+            if action not in self.RESOURCE_ACTIONS:
+                raise ValueError(f"不支持的资源操作: {action}")
+            self._resource_routes[(method.upper(), action_path)] = (
+                resource,
+                action,
+                False,
+            )
+
+        self.logger.info(f"添加Mock资源: {name} {path or ''}")
+        return self
+
+    def get_resource(self, name: str) -> MockResource:
+        """获取指定名称的Mock资源集合"""
+        return self.resources[name]
+
+    def _dispatch_resource(
+        self,
+        method: str,
+        path: str,
+        query_params: Dict = None,
+        request_body: Dict = None,
+    ) -> Optional[MockResponse]:
+        """将请求分发到有状态资源，未命中资源路由时返回None"""
+        method = method.upper()
+        request_body = request_body if isinstance(request_body, dict) else {}
+
+        route = self._resource_routes.get((method, path))
+        if route:
+            resource, action, rest = route
+            if rest and action == "search":
+                # REST集合查询：查询参数作为过滤条件
+                payload = {
+                    key: _parse_query_value(values[-1])
+                    for key, values in (query_params or {}).items()
+                    if values
+                }
+                return self._run_resource_action(resource, action, None, payload, 200)
+            item_id = request_body.get(
+                resource.id_field, request_body.get(f"{resource.name}_id")
+            )
+            status = 201 if rest else 200
+            return self._run_resource_action(
+                resource, action, item_id, request_body, status
+            )
+
+        prefix, _, raw_id = path.rpartition("/")
+        resource = self._resource_paths.get(prefix)
+        if resource is None or not raw_id:
+            return None
+        action = {
+            "GET": "get",
+            "PUT": "update",
+            "PATCH": "update",
+            "DELETE": "delete",
+        }.get(method)
+        if action is None:
+            return None
+        return self._run_resource_action(
+            resource, action, _parse_query_value(raw_id), request_body, 200
+        )
+
+    @staticmethod
+    def _run_resource_action(
+        resource: MockResource,
+        action: str,
+        item_id: Any,
+        payload: Dict,
+        success_status: int,
+    ) -> MockResponse:
+        """执行资源操作并构造统一格式的响应"""
+        if action == "create":
+            item = resource.create(payload)
+            if item is None:
+                return _resource_response(409, f"{resource.name} 已存在")
+            return _resource_response(success_status, "success", item)
+
+        if action == "search":
+            filters = {
+                k: v for k, v in payload.items() if k not in ("page", "page_size")
+            }
+            result = resource.search(
+                filters,
+                page=payload.get("page") or 1,
+                page_size=payload.get("page_size") or 20,
+            )
+            return _resource_response(success_status, "success", result)
+
+        if item_id is None:
+            return _resource_response(400, f"缺少主键字段: {resource.id_field}")
+
+        if action == "get":
+            item = resource.get(item_id)
+        elif action == "update":
+            item = resource.update(item_id, payload)
+        else:
+            item = {resource.id_field: item_id} if resource.delete(item_id) else None
+
+        if item is None:
+            return _resource_response(404, f"{resource.name} 不存在: {item_id}")
+        return _resource_response(success_status, "success", item)
+
+    def _serve(self, server_class=_MockHTTPServer):
+        # 多线程处理请求，资源集合内部加锁保证并发正确性
+        self.server = server_class((self.host, self.port), MockRequestHandler)
+        # port=0 时由系统分配空闲端口
+        self.port = self.server.server_address[1]
+        self.server.mock_server = self  # 将Mock服务器实例传递给请求处理器
+
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
 
     def start(self):
         """启动Mock服务器"""
         try:
-            self.server = HTTPServer((self.host, self.port), MockRequestHandler)
-            self.server.mock_server = self  # 将Mock服务器实例传递给请求处理器
-
-            self.server_thread = threading.Thread(target=self.server.serve_forever)
-            self.server_thread.daemon = True
-            self.server_thread.start()
+            if self.workers > 1:
+                self._start_workers()
+            else:
+                self._serve()
 
             self.logger.info(f"Mock服务器已启动: http://{self.host}:{self.port}")
 
@@ -288,18 +1009,125 @@ class MockServer:
             self.logger.error(f"Mock服务器启动失败: {e}")
             raise
 
+    def _start_workers(self, timeout: float = 10):
+        """启动多个工作进程，通过SO_REUSEPORT共享同一端口"""
+        if not hasattr(socket, "SO_REUSEPORT"):
+            raise RuntimeError("当前平台不支持SO_REUSEPORT，无法启动多进程Mock服务器")
+        if self.resources:
+            # 资源集合的数据保存在进程内存中，多进程间无法保持一致
+            raise RuntimeError("多进程模式不支持有状态资源集合，请使用workers=1")
+        placeholder = None
+        if not self.port:
+            # 先占住系统分配的空闲端口，所有工作进程监听后再释放
+            placeholder = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            placeholder.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            placeholder.bind((self.host, 0))
+            self.port = placeholder.getsockname()[1]
+        try:
+            self._spawn_workers(timeout)
+        finally:
+            if placeholder is not None:
+                placeholder.close()
+
+    def _spawn_workers(self, timeout: float):
+        context = multiprocessing.get_context()
+        for _ in range(self.workers):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_run_worker,
+                args=(
+                    self.host,
+                    self.port,
+                    self.rules,
+                    self.journal_size,
+                    self.log_requests,
+                    child_conn,
+                ),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._worker_procs.append((process, parent_conn))
+
+        for process, conn in self._worker_procs:
+            if not conn.poll(timeout):
+                self.stop()
+                raise RuntimeError(f"Mock工作进程启动超时: pid={process.pid}")
+            status, detail = conn.recv()
+            if status != "ready":
+                self.stop()
+                raise RuntimeError(f"Mock工作进程启动失败: {detail}")
+
+    def _broadcast(self, command: str, *args) -> List[Any]:
+        """向所有工作进程发送控制命令，返回各进程的结果"""
+        results = []
+        with self._control_lock:
+            for _, conn in self._worker_procs:
+                conn.send((command, args))
+            for process, conn in self._worker_procs:
+                status, detail = conn.recv()
+                if status != "ok":
+                    raise RuntimeError(f"Mock工作进程执行{command}失败: {detail}")
+                results.append(detail)
+        return results
+
+    def _handle_command(self, command: str, *args) -> Any:
+        """工作进程内执行控制命令"""
+        if command == "add_rules":
+            for rule in args[0]:
+                self._add_rule_object(rule)
+        elif command == "reset_rules":
+            self.reset_rules()
+        elif command == "clear_journal":
+            self.clear_journal()
+        elif command == "enable_journal":
+            self.enable_journal(*args)
+        elif command == "call_counts":
+            return [rule.call_count for rule in self.rules]
+        elif command == "journal":
+            return list(self.journal.copy()) if self.journal is not None else None
+        else:
+            raise ValueError(f"未知的控制命令: {command}")
+        return None
+
     def stop(self):
         """停止Mock服务器"""
+        if self._worker_procs:
+            with self._control_lock:
+                for process, conn in self._worker_procs:
+                    try:
+                        conn.send(("stop", ()))
+                    except (BrokenPipeError, OSError):
+                        pass
+                for process, conn in self._worker_procs:
+                    process.join(timeout=5)
+                    if process.is_alive():
+                        process.terminate()
+                    conn.close()
+                self._worker_procs = []
+            self.logger.info("Mock服务器已停止")
         if self.server:
             self.server.shutdown()
             self.server.server_close()
+            self.server = None
             self.logger.info("Mock服务器已停止")
 
     def reset_rules(self):
         """重置所有规则"""
         self.rules.clear()
+        self._rule_index.clear()
+        self._template_index.clear()
+        self._template_count = 0
+        if self._worker_procs:
+            self._broadcast("reset_rules")
         self.logger.info("Mock规则已重置")
 
+    def reset_resources(self):
+        """清空所有资源集合中的数据（保留路由配置）"""
+        for resource in self.resources.values():
+            resource.clear()
+        self.logger.info("Mock资源数据已清空")
+
     def get_call_count(self, method: str, path: str) -> int:
         """
         获取指定规则的调用次数
@@ -311,10 +1139,99 @@ class MockServer:
         Returns:
             调用次数
         """
-        for rule in self.rules:
-            if rule.method == method.upper() and rule.path == path:
-                return rule.call_count
-        return 0
+        if self._worker_procs:
+            # 多进程模式下汇总各工作进程的计数（规则在各进程中的顺序一致）
+            method = method.upper()
+            return sum(
+                count
+                for counts in self._broadcast("call_counts")
+                for rule, count in zip(self.rules, counts)
+                if rule.method == method and rule.path == path
+            )
+        return sum(
+            rule.call_count for rule in self._rule_index.get((method.upper(), path), ())
+        )
+
+    def enable_journal(self, size: int = 10000):
+        """
+        开启请求日志，记录最近 size 条请求
+
+        Args:
+            size: 环形缓冲区容量
+        """
+        self.journal = deque(self.journal or (), maxlen=size)
+        self.journal_size = size
+        if self._worker_procs:
+            self._broadcast("enable_journal", size)
+
+    def clear_journal(self):
+        """清空请求日志"""
+        if self.journal is not None:
+            self.journal.clear()
+        if self._worker_procs:
+            self._broadcast("clear_journal")
+
+    def _journal_records(self) -> Optional[List[MockRequestRecord]]:
+        """获取请求日志快照，多进程模式下按时间合并各工作进程的日志"""
+        if self._worker_procs:
+            journals = [j for j in self._broadcast("journal") if j is not None]
+            if not journals:
+                return None
+            return list(heapq.merge(*journals, key=lambda record: record.timestamp))
+        return list(self.journal.copy()) if self.journal is not None else None
+
+    def get_requests(
+        self,
+        method: str = None,
+        path: str = None,
+        where: Dict[str, Any] = None,
+        predicate: Callable[[MockRequestRecord], bool] = None,
+    ) -> List[MockRequestRecord]:
+        """
+        查询请求日志
+
+        示例:
+            mock_server.get_requests("POST", "/api/users", where={"body.name": "张三"})
+
+        Args:
+            method: HTTP方法
+            path: 请求路径
+            where: 点号路径 -> 期望值，如 {"body.name": "张三", "status_code": 201}
+            predicate: 自定义过滤函数
+
+        Returns:
+            匹配的请求记录列表（按时间先后排序）
+        """
+        journal = self._journal_records()
+        if journal is None:
+            raise RuntimeError("请求日志未开启，请设置journal_size或调用enable_journal")
+
+        method = method.upper() if method else None
+        missing = object()
+        records = []
+        for record in journal:
+            if method and record.method != method:
+                continue
+            if path and record.path != path:
+                continue
+            if where and any(
+                record.get(key, missing) != value for key, value in where.items()
+            ):
+                continue
+            if predicate and not predicate(record):
+                continue
+            records.append(record)
+        return records
+
+    def count_requests(
+        self,
+        method: str = None,
+        path: str = None,
+        where: Dict[str, Any] = None,
+        predicate: Callable[[MockRequestRecord], bool] = None,
+    ) -> int:
+        """统计请求日志中匹配的请求数，参数同 get_requests"""
+        return len(self.get_requests(method, path, where, predicate))
 
     @property
     def base_url(self) -> str:
@@ -336,10 +1253,12 @@ def create_mock_response(
     return MockResponse(status_code, headers, body, delay)
 
 
-def start_mock_server(host: str = "localhost", port: int = 8888) -> MockServer:
+def start_mock_server(
+    host: str = "localhost", port: int = 8888, workers: int = 1
+) -> MockServer:
     """启动Mock服务器的便捷函数"""
     global mock_server
-    mock_server = MockServer(host, port)
+    mock_server = MockServer(host, port, workers=workers)
     mock_server.start()
     return mock_server
 
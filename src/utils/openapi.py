@@ -0,0 +1,235 @@
+"""
+OpenAPI文档工具模块
+
+提供OpenAPI 3文档的加载、$ref解析、接口遍历以及根据Schema生成示例数据的功能
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import yaml
+
+HTTP_METHODS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
+
+# 各格式字符串的示例值
+STRING_FORMAT_EXAMPLES = {
+    "date": "2024-01-01",
+    "date-time": "2024-01-01T00:00:00Z",
+    "time": "00:00:00",
+    "email": "user@example.com",
+    "uuid": "00000000-0000-0000-0000-000000000000",
+    "uri": "https://example.com",
+    "url": "https://example.com",
+    "hostname": "example.com",
+    "ipv4": "127.0.0.1",
+    "ipv6": "::1",
+    "byte": "c3RyaW5n",
+    "password": "password",
+}
+
+
+def load_openapi_spec(spec: Union[str, Path, Dict]) -> Dict:
+    """
+    加载OpenAPI文档
+
+    Args:
+        spec: 文档路径（.json/.yaml/.yml）或已解析的字典
+
+    Returns:
+        OpenAPI文档字典
+    """
+    if isinstance(spec, dict):
+        return spec
+
+    path = Path(spec)
+    with open(path, "r", encoding="utf-8") as file:
+        if path.suffix.lower() == ".json":
+            return json.load(file)
+        return yaml.safe_load(file)
+
+
+def get_base_path(spec: Dict) -> str:
+    """从 servers[0].url 中取出路径前缀，如 https://api.example.com/v1 -> /v1"""
+    servers = spec.get("servers") or []
+    if not servers:
+        return ""
+    return urlparse(servers[0].get("url", "")).path.rstrip("/")
+
+
+class OpenAPISpec:
+    """OpenAPI文档封装，负责$ref解析与接口遍历"""
+
+    def __init__(self, spec: Union[str, Path, Dict]):
+        """
+        初始化OpenAPI文档
+
+        Args:
+            spec: 文档路径或已解析的字典
+        """
+        self.spec = load_openapi_spec(spec)
+        self._ref_cache: Dict[str, Any] = {}
+
+    @property
+    def base_path(self) -> str:
+        """文档声明的路径前缀"""
+        return get_base_path(self.spec)
+
+    def resolve(self, node: Any) -> Any:
+        """
+        解析本地 $ref 引用（如 #/components/schemas/User）
+
+        Args:
+            node: 可能包含$ref的节点
+
+        Returns:
+            引用指向的节点，非引用节点原样返回
+        """
+        seen = set()
+        while isinstance(node, dict) and "$ref" in node:
+            ref = node["$ref"]
+            if ref in seen:
+                raise ValueError(f"OpenAPI循环引用: {ref}")
+            seen.add(ref)
+            if ref not in self._ref_cache:
+                if not ref.startswith("#/"):
+                    raise ValueError(f"不支持的外部引用: {ref}")
+                target: Any = self.spec
+                for part in ref[2:].split("/"):
+                    target = target[part.replace("~1", "/").replace("~0", "~")]
+                self._ref_cache[ref] = target
+            node = self._ref_cache[ref]
+        return node
+
+    def iter_operations(self) -> Iterator[Tuple[str, str, Dict]]:
+        """
+        遍历所有接口
+
+        Returns:
+            (HTTP方法, 路径模板, operation对象) 迭代器
+        """
+        for path, path_item in (self.spec.get("paths") or {}).items():
+            path_item = self.resolve(path_item)
+            for method in HTTP_METHODS:
+                operation = path_item.get(method)
+                if operation is not None:
+                    yield method.upper(), path, operation
+
+    def select_response(self, operation: Dict) -> Tuple[int, Optional[str], Dict]:
+        """
+        选择接口的成功响应
+
+        优先选择最小的2xx状态码，其次是default
+
+        Args:
+            operation: operation对象
+
+        Returns:
+            (状态码, Content-Type, media type对象)
+        """
+        responses = operation.get("responses") or {}
+        # YAML中的状态码可能是int也可能是str，按字符串排序
+        success_codes = sorted(
+            (code for code in responses if str(code).isdigit() and str(code)[0] == "2"),
+            key=str,
+        )
+        if success_codes:
+            code = success_codes[0]
+            status_code = int(code)
+        elif "default" in responses:
+            code, status_code = "default", 200
+        else:
+            return 200, None, {}
+
+        response = self.resolve(responses[code]) or {}
+        content = response.get("content") or {}
+        if not content:
+            return status_code, None, {}
+        content_type = next((ct for ct in content if "json" in ct), next(iter(content)))
+        return status_code, content_type, self.resolve(content[content_type]) or {}
+
+    def example_from_media(self, media: Dict) -> Any:
+        """
+        从media type对象中取示例：example > examples > schema生成
+
+        Args:
+            media: media type对象
+
+        Returns:
+            示例数据
+        """
+        if "example" in media:
+            return media["example"]
+        examples = media.get("examples")
+        if examples:
+            first = self.resolve(next(iter(examples.values())))
+            if isinstance(first, dict) and "value" in first:
+                return first["value"]
+        if "schema" in media:
+            return self.example_from_schema(media["schema"])
+        return None
+
+    def example_from_schema(self, schema: Any, depth: int = 0) -> Any:
+        """
+        根据JSON Schema生成示例数据
+
+        Args:
+            schema: schema对象
+            depth: 当前嵌套深度（防止自引用结构无限展开）
+
+        Returns:
+            示例数据
+        """
+        schema = self.resolve(schema)
+        if not isinstance(schema, dict) or depth > 10:
+            return None
+
+        for key in ("example", "default", "const"):
+            if key in schema:
+                return schema[key]
+        if schema.get("examples"):
+            return schema["examples"][0]
+        if schema.get("enum"):
+            return schema["enum"][0]
+
+        if "allOf" in schema:
+            merged: Dict = {}
+            for sub_schema in schema["allOf"]:
+                value = self.example_from_schema(sub_schema, depth + 1)
+                if isinstance(value, dict):
+                    merged.update(value)
+            return merged
+        for key in ("oneOf", "anyOf"):
+            if schema.get(key):
+                return self.example_from_schema(schema[key][0], depth + 1)
+
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            schema_type = next((t for t in schema_type if t != "null"), None)
+        if schema_type is None:
+            schema_type = "object" if "properties" in schema else None
+
+        if schema_type == "object":
+            return {
+                name: self.example_from_schema(prop, depth + 1)
+                for name, prop in (schema.get("properties") or {}).items()
+            }
+        if schema_type == "array":
+            item = self.example_from_schema(schema.get("items", {}), depth + 1)
+            return [item] * max(schema.get("minItems", 1), 1)
+        if schema_type == "string":
+            if schema.get("format") in STRING_FORMAT_EXAMPLES:
+                return STRING_FORMAT_EXAMPLES[schema["format"]]
+            return (
+                "x" * schema.get("minLength", 0)
+                if schema.get("minLength")
+                else "string"
+            )
+        if schema_type == "integer":
+            return int(schema.get("minimum", 0))
+        if schema_type == "number":
+            return float(schema.get("minimum", 0))
+        if schema_type == "boolean":
+            return True
+        return None
@@ -7,13 +7,16 @@
 import statistics
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
 
 import requests
 
 from src.utils.log_moudle import logger
 
+if TYPE_CHECKING:
+    from src.utils.datasovle import ResultWriter
+
 
 @dataclass
 class PerformanceMetrics:
@@ -63,9 +66,15 @@ class RequestResult:
 class PerformanceTester:
     """性能测试器"""
 
-    def __init__(self):
-        """初始化性能测试器"""
+    def __init__(self, result_writer: "ResultWriter" = None):
+        """
+        初始化性能测试器
+
+        Args:
+            result_writer: 结果写入器，设置后每次请求的结果都会写入（见 DataSovle.result_writer）
+        """
         self.logger = logger
+        self.result_writer = result_writer
 
     def _execute_request(
         self, request_func: Callable, *args, **kwargs
@@ -96,7 +105,7 @@ class PerformanceTester:
                 success = True
                 status_code = None
 
-            return RequestResult(
+            result = RequestResult(
                 success=success, response_time=response_time, status_code=status_code
             )
 
@@ -104,10 +113,14 @@ class PerformanceTester:
             end_time = time.time()
             response_time = end_time - start_time
 
-            return RequestResult(
+            result = RequestResult(
                 success=False, response_time=response_time, error_message=str(e)
             )
 
+        if self.result_writer is not None:
+            self.result_writer.write({"timestamp": start_time, **asdict(result)})
+        return result
+
     def load_test(
         self,
         request_func: Callable,
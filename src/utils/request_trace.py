@@ -0,0 +1,139 @@
+"""
+请求追踪日志模块
+
+每次HTTP请求写一行紧凑的JSONL记录（方法、URL、状态码、耗时、大小、用例nodeid、可选的截断body），
+比 logger_hook 打印多行格式化的请求/响应内容开销小得多，并且可以直接用 DataSovle 做耗时分析。
+
+使用说明：
+    # 配置追踪文件即可为所有 BaseClient 开启（xdist下每个worker写自己的文件）
+    DYNACONF_REQUEST_TRACE=logs/trace.jsonl pytest tests/
+    # 同时记录响应body的前256个字符
+    DYNACONF_REQUEST_TRACE_BODY=256
+
+    from src.utils.datasovle import DataSovle
+
+    solve = DataSovle()
+    solve.read_traces("logs")  # 读取目录下全部 .jsonl 文件
+    solve.df_group_report(["method", "path"], "elapsed_ms", file="output/latency.csv")
+"""
+
+import atexit
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+from requests import Response
+
+from conf.config import settings
+from src.utils.log_moudle import worker_log_path
+
+
+def _body_size(body) -> int:
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    if isinstance(body, (bytes, bytearray)):
+        return len(body)
+    # 文件对象、生成器等流式body无法获取大小
+    return -1
+
+
+def _response_size(resp: Response, stream: bool) -> int:
+    if not stream:
+        # 非流式请求随后也会读取全部内容，这里提前读取不增加开销；
+        # 分块传输、gzip压缩时 Content-Length 缺失或不是解压后的大小
+        return len(resp.content)
+    # 流式请求不能替调用方读取body，只能参考响应头
+    try:
+        return int(resp.headers.get("Content-Length", -1))
+    except ValueError:
+        return -1
+
+
+class RequestTracer(object):
+    """把每次请求写为一行JSONL记录，作为 requests 的 response hook 使用"""
+
+    def __init__(
+        self,
+        file: str,
+        body_limit: int = 0,
+        batch_size: int = 500,
+        flush_interval: Optional[float] = 1.0,
+    ):
+        """
+        :param file: 追踪文件，xdist下会自动加上worker id（trace.gw0.jsonl）
+        :param body_limit: 记录请求/响应body的前多少个字符，0表示不记录
+        :param batch_size: 缓冲多少条写入一次
+        :param flush_interval: 后台定时写入的间隔（秒）
+        """
+        # 避免导入 base_client 时就加载pandas
+        from src.utils.datasovle import ResultWriter
+
+        worker_id = os.getenv("PYTEST_XDIST_WORKER")
+        self.file = worker_log_path(file, worker_id) if worker_id else file
+        os.makedirs(os.path.dirname(os.path.abspath(self.file)), exist_ok=True)
+        self.body_limit = body_limit
+        self.writer = ResultWriter(
+            self.file,
+            file_type="jsonl",
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+        )
+
+    def hook(self, resp: Response, *args, **kwargs) -> None:
+        """requests的response hook"""
+        req = resp.request
+        elapsed = resp.elapsed.total_seconds()
+        url = resp.url or req.url
+        record = {
+            # 请求开始时间（响应头到达时间减去耗时）
+            "ts": round(time.time() - elapsed, 6),
+            "method": req.method,
+            "url": url,
+            "path": urlsplit(url).path,
+            "status": resp.status_code,
+            "elapsed_ms": round(elapsed * 1000, 3),
+            "request_bytes": _body_size(req.body),
+            "response_bytes": _response_size(resp, kwargs.get("stream", False)),
+            "nodeid": os.getenv("PYTEST_CURRENT_TEST", "").rsplit(" (", 1)[0],
+        }
+        if self.body_limit:
+            body = req.body
+            if isinstance(body, bytes):
+                body = body.decode("utf-8", errors="replace")
+            record["request_body"] = (
+                body[: self.body_limit] if isinstance(body, str) else None
+            )
+            record["response_body"] = resp.text[: self.body_limit]
+        self.writer.write(record)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+
+_tracer: Optional[RequestTracer] = None
+_tracer_lock = threading.Lock()
+
+
+def get_request_tracer() -> Optional[RequestTracer]:
+    """
+    根据配置 request_trace（环境变量 DYNACONF_REQUEST_TRACE）返回进程内共享的追踪器，
+    未配置时返回None
+    """
+    global _tracer
+    file = settings.get("request_trace")
+    if not file:
+        return None
+    with _tracer_lock:
+        if _tracer is None:
+            _tracer = RequestTracer(
+                file, body_limit=int(settings.get("request_trace_body", 0))
+            )
+            atexit.register(_tracer.close)
+        return _tracer
@@ -0,0 +1,462 @@
+"""
+HTTP响应缓存模块
+
+用例中反复调用的只读接口（如查询当前用户、配置查询）的 GET/HEAD 响应缓存在客户端，
+作为 requests 的传输适配器挂载到会话上，所有经过该会话的请求（包括 FlaskClient、生成的接口客户端）都会经过缓存：
+    - 遵循响应的 Cache-Control（no-store 不缓存，no-cache 每次重新验证，max-age）和 Expires
+    - 过期的响应带 ETag/Last-Modified 时发送条件请求（If-None-Match/If-Modified-Since），
+      服务端返回304时直接复用缓存的响应体
+    - 可以按路径配置缓存时间，覆盖服务端的缓存头（服务端通常不返回缓存头）
+    - 内存中为有大小上限的LRU缓存，可选同时写入磁盘，多个xdist worker共享；
+      开启磁盘缓存时，内存命中前会检查磁盘文件，其他worker删除或更新的缓存不会继续使用
+    - 不同鉴权信息（Authorization、Cookie）的响应分开缓存；同一URL的 POST/PUT/DELETE 成功后删除该URL的缓存
+    - 按路径统计命中、未命中和重新验证次数，用例结束时输出
+
+使用说明：
+    # 配置后所有 BaseClient 开启缓存（默认关闭）
+    DYNACONF_RESPONSE_CACHE=1 pytest tests/
+    # 按路径的缓存时间（秒），支持通配符
+    DYNACONF_RESPONSE_CACHE_RULES='@json {"/api/user/currentUser": 60, "/api/config/*": 300}'
+
+    from src.utils.response_cache import ResponseCache
+
+    cache = ResponseCache(max_entries=256, rules={"/api/user/currentUser": 60})
+    client = BaseClient(host, response_cache=cache)
+    client.get("/api/user/currentUser").from_cache  # 第二次起为True
+    cache.stats.totals()  # {"hits": 1, "misses": 1, "revalidated": 0, "hit_rate": 0.5}
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlsplit
+
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from conf.config import settings
+from src.utils.log_moudle import logger
+
+# 可以缓存的请求方法和状态码
+CACHEABLE_METHODS = ("GET", "HEAD")
+CACHEABLE_STATUSES = (200, 203)
+# 成功后需要删除同一URL缓存的请求方法
+UNSAFE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+# 304响应中不能覆盖缓存条目的响应头
+BODY_HEADERS = (
+    "content-length",
+    "content-type",
+    "content-encoding",
+    "transfer-encoding",
+)
+# 磁盘缓存格式版本，格式变化时递增，旧缓存自动失效
+CACHE_VERSION = 1
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """解析 Cache-Control 头，如 "max-age=60, no-cache" -> {"max-age": "60", "no-cache": None}"""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else None
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+class ResponseCacheStats(object):
+    """按路径统计缓存命中（hits）、未命中（misses）和304重新验证（revalidated）次数"""
+
+    EVENTS = ("hits", "misses", "revalidated")
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, path: str, event: str):
+        with self._lock:
+            counts = self._counts.setdefault(path, dict.fromkeys(self.EVENTS, 0))
+            counts[event] += 1
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """:return: 路径 -> {hits, misses, revalidated}"""
+        with self._lock:
+            return {path: dict(counts) for path, counts in self._counts.items()}
+
+    def totals(self) -> Dict[str, float]:
+        """
+        :return: {hits, misses, revalidated, hit_rate}，
+            hit_rate 为不需要请求服务端的比例，没有请求时为0
+        """
+        totals = dict.fromkeys(self.EVENTS, 0)
+        for counts in self.summary().values():
+            for event in self.EVENTS:
+                totals[event] += counts[event]
+        requests_count = sum(totals.values())
+        totals["hit_rate"] = (
+            round(totals["hits"] / requests_count, 4) if requests_count else 0
+        )
+        return totals
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+class ResponseCache(object):
+    """GET/HEAD响应缓存，内存LRU + 可选的磁盘缓存"""
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        cache_dir: Union[str, Path] = None,
+        max_disk_entries: int = 4096,
+        rules: Dict[str, float] = None,
+        stats: ResponseCacheStats = None,
+    ):
+        """
+        :param max_entries: 内存中最多缓存多少个响应，超出时淘汰最久未使用的
+        :param cache_dir: 磁盘缓存目录，为None时只缓存在内存中
+        :param max_disk_entries: 磁盘最多缓存多少个响应，超出时删除最早写入的
+        :param rules: 路径（支持通配符）-> 缓存时间（秒），覆盖服务端的缓存头，按顺序匹配第一条；
+            0表示每次都重新验证
+        :param stats: 命中统计，默认新建
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_entries = max_disk_entries
+        self.rules = dict(rules or {})
+        self.stats = stats if stats is not None else ResponseCacheStats()
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        # 缓存键 -> 读取/写入时磁盘文件的修改时间，用于发现其他worker的删除和更新
+        self._disk_mtimes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # ---------- 缓存键 ----------
+
+    @staticmethod
+    def key(request: PreparedRequest) -> str:
+        """
+        URL哈希-方法和鉴权信息（Authorization、Cookie）哈希；同一URL的缓存前缀相同，方便整体删除
+        """
+        headers = request.headers
+        auth = "|".join(
+            (
+                request.method,
+                headers.get("Authorization", ""),
+                headers.get("Cookie", ""),
+            )
+        )
+        return f"{_digest(request.url)}-{_digest(auth)}"
+
+    # ---------- 存取 ----------
+
+    def _disk_file(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.pkl"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        读取缓存条目（不判断是否过期），内存未命中时读取磁盘
+
+        开启磁盘缓存时，内存中的条目只在磁盘文件未被删除、未被改写时使用：
+        其他worker执行 invalidate() 或写入新响应后，本进程不会继续返回旧的响应
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if self.cache_dir is None:
+            return entry
+        if entry is not None:
+            try:
+                mtime = os.stat(self._disk_file(key)).st_mtime_ns
+            except OSError:
+                self._forget(key)
+                return None
+            if mtime == self._disk_mtimes.get(key):
+                return entry
+        try:
+            with open(self._disk_file(key), "rb") as file:
+                mtime = os.fstat(file.fileno()).st_mtime_ns
+                entry = pickle.load(file)
+        except Exception:
+            self._forget(key)
+            return None
+        if entry.get("version") != CACHE_VERSION:
+            self._forget(key)
+            return None
+        self._remember(key, entry, mtime)
+        return entry
+
+    def _remember(self, key: str, entry: Dict, mtime: int = None):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if mtime is not None:
+                self._disk_mtimes[key] = mtime
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._disk_mtimes.pop(evicted, None)
+
+    def _forget(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._disk_mtimes.pop(key, None)
+
+    def set(self, key: str, entry: Dict):
+        """写入缓存条目，开启磁盘缓存时同时原子写入磁盘"""
+        entry["version"] = CACHE_VERSION
+        if self.cache_dir is None:
+            self._remember(key, entry)
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    file.flush()
+                    mtime = os.fstat(file.fileno()).st_mtime_ns
+                os.replace(tmp_path, self._disk_file(key))
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+            self._remember(key, entry, mtime)
+            self._prune_disk()
+        except Exception as e:
+            logger.warning(f"写入响应缓存失败: {self.cache_dir}, 错误: {e}")
+
+    def _prune_disk(self):
+        files = list(self.cache_dir.glob("*.pkl"))
+        if len(files) <= self.max_disk_entries:
+            return
+        files.sort(key=lambda file: file.stat().st_mtime)
+        for file in files[: len(files) - self.max_disk_entries]:
+            file.unlink(missing_ok=True)
+
+    def invalidate(self, url: str):
+        """删除URL的全部缓存（所有方法和鉴权信息）"""
+        prefix = f"{_digest(url)}-"
+        with self._lock:
+            for key in [key for key in self._entries if key.startswith(prefix)]:
+                del self._entries[key]
+                self._disk_mtimes.pop(key, None)
+        if self.cache_dir is not None:
+            for file in self.cache_dir.glob(f"{prefix}*.pkl"):
+                file.unlink(missing_ok=True)
+
+    def clear(self):
+        """清空内存和磁盘缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._disk_mtimes.clear()
+        if self.cache_dir is not None:
+            for file in self.cache_dir.glob("*.pkl"):
+                file.unlink(missing_ok=True)
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---------- 缓存策略 ----------
+
+    def rule_ttl(self, path: str) -> Optional[float]:
+        """路径匹配的缓存时间，没有匹配的规则时返回None"""
+        for pattern, ttl in self.rules.items():
+            if fnmatchcase(path, pattern):
+                return float(ttl)
+        return None
+
+    def freshness(self, response: Response, path: str, now: float) -> float:
+        """响应的有效期（秒）：路径规则 > Cache-Control > Expires，没有时为0（每次重新验证）"""
+        ttl = self.rule_ttl(path)
+        if ttl is not None:
+            return ttl
+        directives = parse_cache_control(response.headers.get("Cache-Control"))
+        if "no-cache" in directives:
+            return 0
+        if "max-age" in directives:
+            try:
+                return max(0.0, float(directives["max-age"]))
+            except (TypeError, ValueError):
+                return 0
+        expires = _http_date(response.headers.get("Expires"))
+        if expires is not None:
+            return max(0.0, expires - now)
+        return 0
+
+    def make_entry(self, response: Response, path: str) -> Optional[Dict]:
+        """根据响应生成缓存条目，不可缓存时返回None"""
+        headers = response.headers
+        if response.status_code not in CACHEABLE_STATUSES:
+            return None
+        if "no-store" in parse_cache_control(headers.get("Cache-Control")):
+            return None
+        vary = [name.strip() for name in headers.get("Vary", "").split(",") if name]
+        if "*" in vary:
+            return None
+        now = time.time()
+        ttl = self.freshness(response, path, now)
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if ttl <= 0 and not (etag or last_modified):
+            return None
+        request_headers = response.request.headers
+        return {
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": dict(headers),
+            "content": response.content,
+            "encoding": response.encoding,
+            "url": response.url,
+            "vary": {name: request_headers.get(name) for name in vary},
+            "expires_at": now + ttl,
+        }
+
+    def revalidated(self, entry: Dict, response: Response, path: str) -> Dict:
+        """服务端返回304后，用新的响应头更新缓存条目的响应头和有效期"""
+        headers = CaseInsensitiveDict(entry["headers"])
+        # 304响应没有响应体，与响应体相关的头仍使用缓存的
+        headers.update(
+            (name, value)
+            for name, value in response.headers.items()
+            if name.lower() not in BODY_HEADERS
+        )
+        cached = Response()
+        cached.headers = headers
+        now = time.time()
+        return dict(
+            entry,
+            headers=dict(headers),
+            expires_at=now + self.freshness(cached, path, now),
+        )
+
+    @staticmethod
+    def to_response(entry: Dict, request: PreparedRequest) -> Response:
+        """根据缓存条目构造响应，response.from_cache 为True"""
+        response = Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        response._content = entry["content"] if request.method != "HEAD" else b""
+        response.encoding = entry["encoding"]
+        response.url = entry["url"]
+        response.request = request
+        response.from_cache = True
+        return response
+
+
+class CachingAdapter(HTTPAdapter):
+    """带响应缓存的传输适配器"""
+
+    def __init__(self, cache: ResponseCache, **kwargs):
+        """
+        :param cache: 响应缓存，多个会话可以共享
+        :param kwargs: 传给 HTTPAdapter，如 pool_maxsize
+        """
+        super(CachingAdapter, self).__init__(**kwargs)
+        self.cache = cache
+
+    @staticmethod
+    def _bypass(request: PreparedRequest, stream: bool) -> bool:
+        """带请求体、流式下载、调用方自己发条件请求或要求不缓存时不经过缓存"""
+        headers = request.headers
+        return (
+            stream
+            or request.body is not None
+            or "If-None-Match" in headers
+            or "If-Modified-Since" in headers
+            or "no-store" in parse_cache_control(headers.get("Cache-Control"))
+        )
+
+    def send(self, request: PreparedRequest, stream=False, **kwargs) -> Response:
+        cache = self.cache
+        if request.method not in CACHEABLE_METHODS:
+            response = super(CachingAdapter, self).send(
+                request, stream=stream, **kwargs
+            )
+            if request.method in UNSAFE_METHODS and response.status_code < 400:
+                cache.invalidate(request.url)
+            return response
+        if self._bypass(request, stream):
+            return super(CachingAdapter, self).send(request, stream=stream, **kwargs)
+
+        path = urlsplit(request.url).path
+        key = cache.key(request)
+        entry = cache.get(key)
+        if entry is not None and any(
+            request.headers.get(name) != value for name, value in entry["vary"].items()
+        ):
+            entry = None
+        if entry is not None:
+            directives = parse_cache_control(request.headers.get("Cache-Control"))
+            force = "no-cache" in directives or directives.get("max-age") == "0"
+            if not force and time.time() < entry["expires_at"]:
+                cache.stats.record(path, "hits")
+                return cache.to_response(entry, request)
+            # 过期后带上验证信息发送条件请求
+            etag = entry["headers"].get("ETag")
+            last_modified = entry["headers"].get("Last-Modified")
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = super(CachingAdapter, self).send(request, stream=stream, **kwargs)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            entry = cache.revalidated(entry, response, path)
+            cache.set(key, entry)
+            cache.stats.record(path, "revalidated")
+            return cache.to_response(entry, request)
+
+        response.from_cache = False
+        cache.stats.record(path, "misses")
+        new_entry = cache.make_entry(response, path)
+        if new_entry is not None:
+            cache.set(key, new_entry)
+        return response
+
+
+# 进程内共享的命中统计，用例结束时输出
+response_cache_stats = ResponseCacheStats()
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """
+    根据配置 response_cache（环境变量 DYNACONF_RESPONSE_CACHE）返回进程内共享的响应缓存，
+    未开启时返回None；response_cache_size、response_cache_dir、response_cache_rules
+    分别配置内存缓存条数、磁盘缓存目录和按路径的缓存时间
+    """
+    global _cache
+    if not settings.get("response_cache"):
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(
+                max_entries=int(settings.get("response_cache_size", 256)),
+                cache_dir=settings.get("response_cache_dir"),
+                rules=settings.get("response_cache_rules"),
+                stats=response_cache_stats,
+            )
+        return _cache
@@ -0,0 +1,212 @@
+"""
+HTTP请求重试策略模块
+
+指数退避 + 全抖动（full jitter）：第n次重试前等待 [0, min(max_delay, base_delay * 2^n)] 间的随机时间，
+多个线程/进程同时失败时不会在同一时刻一起重试；响应带 Retry-After 时按服务端要求等待。
+所有请求共享一个重试预算：每个请求只能"挣到"一定比例的重试机会，
+后端整体不可用时重试不会把请求量放大数倍。重试次数按接口统计，用例结束时输出。
+
+使用说明：
+    from src.utils.retry_policy import RetryPolicy
+
+    policy = RetryPolicy(max_attempts=4, base_delay=0.2)
+    resp = policy.call("GET /api/users", session.get, "http://localhost/api/users")
+    policy.metrics.summary()  # {"GET /api/users": {"requests": 1, "retries": 2, "retry:503": 2}}
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Type
+
+from requests.exceptions import ConnectionError, Timeout
+
+from src.utils.log_moudle import logger
+
+# 默认重试的状态码：限流、网关错误、服务不可用、网关超时
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class RetryBudget(object):
+    """
+    重试预算
+
+    每个请求存入 ratio 个令牌，每次重试消耗1个令牌，令牌不足时不再重试；
+    初始有 initial 个令牌，保证请求量很小时也能重试
+    """
+
+    def __init__(self, ratio: float = 0.2, initial: int = 10, max_tokens: int = 100):
+        """
+        :param ratio: 重试次数最多占请求数的比例
+        :param initial: 初始令牌数
+        :param max_tokens: 令牌上限，避免长时间正常运行后积累过多重试机会
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.exhausted = 0
+        self._tokens = float(min(initial, max_tokens))
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """记录一次请求"""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """申请一次重试，预算不足时返回False"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            self.exhausted += 1
+            return False
+
+
+class RetryMetrics(object):
+    """按接口统计请求次数、重试次数及重试原因"""
+
+    def __init__(self):
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, *events: str):
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, {})
+            for event in events:
+                counts[event] = counts.get(event, 0) + 1
+
+    def summary(self, retried_only: bool = False) -> Dict[str, Dict[str, int]]:
+        """
+        :param retried_only: 只返回发生过重试或放弃重试的接口
+        :return: 接口 -> {requests, retries, retry:原因, budget_exhausted, gave_up}
+        """
+        with self._lock:
+            return {
+                endpoint: dict(counts)
+                for endpoint, counts in self._counts.items()
+                if not retried_only or len(counts) > 1
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+class RetryPolicy(object):
+    """带退避、Retry-After和重试预算的重试策略"""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        retry_exceptions: Tuple[Type[BaseException], ...] = (ConnectionError, Timeout),
+        max_retry_after: float = 30,
+        budget: Optional[RetryBudget] = None,
+        metrics: Optional[RetryMetrics] = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        """
+        :param max_attempts: 最多请求次数（包含第一次）
+        :param base_delay: 退避的基础时间（秒）
+        :param max_delay: 单次退避的最长时间（秒）
+        :param retry_statuses: 需要重试的状态码
+        :param retry_exceptions: 需要重试的异常
+        :param max_retry_after: Retry-After 最多等待多少秒，服务端要求等待更久时不再重试，直接返回响应
+        :param budget: 重试预算，为None时不限制
+        :param metrics: 重试统计，默认新建
+        :param sleep: 等待函数，测试时可以替换
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_exceptions = retry_exceptions
+        self.max_retry_after = max_retry_after
+        self.budget = budget
+        self.metrics = metrics if metrics is not None else RetryMetrics()
+        self.sleep = sleep
+
+    def backoff(self, retry_number: int) -> float:
+        """第 retry_number 次重试（从0开始）前的等待时间，全抖动"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2**retry_number))
+
+    @staticmethod
+    def retry_after(response) -> Optional[float]:
+        """解析响应头中的 Retry-After（秒数或HTTP日期），没有或无法解析时返回None"""
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def call(self, endpoint: str, func: Callable, *args, **kwargs):
+        """
+        调用func，返回可重试的状态码或抛出可重试的异常时按策略重试
+
+        :param endpoint: 统计用的接口名，如 "POST /api/product/add"
+        :param func: 发送请求的函数，返回带 status_code 和 headers 的响应
+        :return: 最后一次的响应；重试用尽时返回最后一次响应或抛出最后一次的异常
+        """
+        if self.budget is not None:
+            self.budget.deposit()
+        self.metrics.record(endpoint, "requests")
+
+        for attempt in range(self.max_attempts):
+            error, response = None, None
+            try:
+                response = func(*args, **kwargs)
+            except self.retry_exceptions as e:
+                error = e
+                reason = type(e).__name__
+            else:
+                status = getattr(response, "status_code", None)
+                if status not in self.retry_statuses:
+                    return response
+                reason = str(status)
+
+            if attempt == self.max_attempts - 1:
+                self.metrics.record(endpoint, "gave_up")
+                break
+            delay = self.retry_after(response) if response is not None else None
+            if delay is not None and delay > self.max_retry_after:
+                # 等满上限后重试大概率仍会被拒绝，不如直接把响应交给调用方
+                self.metrics.record(endpoint, "retry_after_exceeded")
+                logger.warning(
+                    f"{endpoint} 要求{delay:.0f}秒后重试，超过上限"
+                    f"{self.max_retry_after:.0f}秒，不再重试: {reason}"
+                )
+                break
+            if self.budget is not None and not self.budget.withdraw():
+                self.metrics.record(endpoint, "budget_exhausted")
+                logger.warning(f"{endpoint} 重试预算已用完，不再重试: {reason}")
+                break
+
+            if response is not None:
+                # 释放连接，重试时复用
+                getattr(response, "close", lambda: None)()
+            if delay is None:
+                delay = self.backoff(attempt)
+            self.metrics.record(endpoint, "retries", f"retry:{reason}")
+            logger.warning(
+                f"{endpoint} 第{attempt + 1}次请求失败({reason})，{delay:.2f}秒后重试"
+            )
+            self.sleep(delay)
+
+        if error is not None:
+            raise error
+        return response
+
+
+# 进程内共享的重试预算和统计，FlaskClient默认使用
+retry_budget = RetryBudget()
+retry_metrics = RetryMetrics()
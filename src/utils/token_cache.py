@@ -0,0 +1,159 @@
+"""
+登录token的跨进程缓存模块
+
+同一台机器上的多个进程（如xdist的多个worker）按 host + account + 凭据摘要 共享登录得到的token，
+缓存文件记录token的过期时间和刷新时间，过了刷新时间才重新登录；
+登录时加文件锁，N个进程同时启动也只会登录一次。
+缓存目录默认位于项目根目录的 .cache/tokens 下，缓存文件只有当前用户可读。
+
+使用说明：
+    from src.utils.token_cache import TokenCache
+
+    cache = TokenCache("/tmp/tokens")
+    entry = cache.get_or_login("http://localhost:5000", "admin", login, credential=digest)
+    entry["token"]
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from filelock import FileLock
+
+from conf.constants import base_dir
+from src.utils.log_moudle import logger
+
+# 默认缓存目录
+TOKEN_CACHE_DIR = Path(base_dir) / ".cache" / "tokens"
+
+
+class TokenCache:
+    """
+    按 host + account + 凭据摘要 缓存token的文件缓存
+
+    credential 为密码等凭据的摘要（不要传入明文），凭据不同时不共享缓存，
+    避免用错误密码创建的客户端拿到其他客户端登录得到的token
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = TOKEN_CACHE_DIR):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存目录
+        """
+        self.cache_dir = Path(cache_dir)
+        self.logger = logger
+
+    def _cache_file(self, host: str, account: str, credential: str = "") -> Path:
+        key = hashlib.blake2b(
+            f"{host}|{account}|{credential}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    @staticmethod
+    def _read(cache_file: Path) -> Optional[Dict]:
+        """读取缓存文件，文件不存在或格式错误时返回None"""
+        try:
+            with open(cache_file, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _is_valid(entry: Optional[Dict]) -> bool:
+        return bool(entry) and time.time() < entry.get("refresh_at", 0)
+
+    def _write(self, cache_file: Path, entry: Dict):
+        """原子写入缓存文件，其他进程不会读到写了一半的文件"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # mkstemp创建的文件权限为0600
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as file:
+                    json.dump(entry, file)
+                os.replace(tmp_path, cache_file)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except Exception as e:
+            self.logger.warning(f"写入token缓存失败: {cache_file}, 错误: {e}")
+
+    def get(self, host: str, account: str, credential: str = "") -> Optional[Dict]:
+        """
+        读取未到刷新时间的缓存
+
+        Args:
+            host: 服务地址
+            account: 账号
+            credential: 凭据摘要
+
+        Returns:
+            {"token": ..., "expires_at": ..., "refresh_at": ...}，没有有效缓存时返回None
+        """
+        entry = self._read(self._cache_file(host, account, credential))
+        return entry if self._is_valid(entry) else None
+
+    def get_or_login(
+        self,
+        host: str,
+        account: str,
+        login: Callable[[], Dict],
+        credential: str = "",
+    ) -> Dict:
+        """
+        读取缓存，没有有效缓存时调用login登录并写入缓存
+
+        Args:
+            host: 服务地址
+            account: 账号
+            login: 登录函数，返回 {"token": ..., "expires_at": ..., "refresh_at": ...}
+            credential: 凭据摘要
+
+        Returns:
+            缓存条目
+        """
+        cache_file = self._cache_file(host, account, credential)
+        entry = self._read(cache_file)
+        if self._is_valid(entry):
+            return entry
+
+        with FileLock(f"{cache_file}.lock"):
+            # 等锁期间可能已有其他进程登录并写好了缓存
+            entry = self._read(cache_file)
+            if self._is_valid(entry):
+                return entry
+
+            entry = login()
+            self._write(cache_file, entry)
+            self.logger.debug(f"已缓存登录token: {account}@{host}")
+            return entry
+
+    def invalidate(
+        self, host: str, account: str, token: str = None, credential: str = ""
+    ):
+        """
+        删除缓存的token，如退出登录、接口返回401后
+
+        Args:
+            host: 服务地址
+            account: 账号
+            token: 只有缓存中仍是该token时才删除，避免删掉其他进程刚登录得到的token
+            credential: 凭据摘要
+        """
+        cache_file = self._cache_file(host, account, credential)
+        with FileLock(f"{cache_file}.lock"):
+            entry = self._read(cache_file)
+            if entry and (token is None or entry.get("token") == token):
+                cache_file.unlink(missing_ok=True)
+
+    def clear(self):
+        """清空缓存目录"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self.logger.info(f"token缓存已清空: {self.cache_dir}")
@@ -0,0 +1,228 @@
+"""
+根据接口描述生成客户端测试
+"""
+
+import asyncio
+import inspect
+import time
+import timeit
+
+import pytest
+import requests
+
+import src.client.base_client as base_client_module
+import src.client.flask_client.flask_client as flask_client_module
+from src.client.endpoint_client import generate_client
+from src.client.flask_client.flask_client import FlaskClient
+from src.utils.mock_server import MockServer, create_mock_response
+from src.utils.retry_policy import RetryBudget, RetryMetrics, RetryPolicy
+
+
+class TestEndpointClient:
+    """根据接口描述生成客户端测试"""
+
+    SPEC = {
+        "base_path": "/api",
+        "headers": {"X-Client": "qa"},
+        "endpoints": {
+            "add_product": {
+                "method": "POST",
+                "path": "/product/add",
+                "body": ["name", "price", "type", "description", "status"],
+                "required": ["name", "price", "type"],
+                "defaults": {"status": 2},
+            },
+            "get_product": {
+                "method": "GET",
+                "path": "/product/{productId}",
+                "query": ["fields", "from"],
+                "header_params": {"trace_id": "X-Trace-Id"},
+            },
+        },
+    }
+
+    @staticmethod
+    def capture_session(client):
+        """替换会话的发送函数，返回记录的请求参数"""
+        calls = []
+        response = requests.Response()
+        response.status_code = 200
+
+        def request(method, url, **kwargs):
+            calls.append((method, url, kwargs))
+            return response
+
+        client.session.request = request
+        return calls
+
+    def test_generate_from_spec(self):
+        """测试生成的方法签名、URL拼接及参数归属"""
+        ProductApi = generate_client(self.SPEC, "ProductApi")
+        signature = inspect.signature(ProductApi.get_product)
+        assert list(signature.parameters)[:5] == [
+            "self",
+            "product_id",
+            "fields",
+            "from_",
+            "trace_id",
+        ]
+
+        api = ProductApi("http://localhost:1/")
+        calls = self.capture_session(api)
+        api.add_product("商品", 9.9, "book")
+        api.add_product("商品", 9.9, "book", description="描述", status=1, timeout=3)
+        api.get_product("a/b", fields="name", from_=1, trace_id=42)
+        api.get_product(1, headers={"X-Client": "ui"})
+
+        assert calls[0] == (
+            "POST",
+            "http://localhost:1/api/product/add",
+            {
+                "params": None,
+                "json": {"name": "商品", "price": 9.9, "type": "book", "status": 2},
+                "headers": {"X-Client": "qa"},
+                "timeout": 10,
+            },
+        )
+        assert calls[1][2]["json"]["description"] == "描述"
+        assert calls[1][2]["timeout"] == 3
+        assert calls[2][1] == "http://localhost:1/api/product/a%2Fb"
+        assert calls[2][2]["params"] == {"fields": "name", "from": 1}
+        assert calls[2][2]["headers"] == {"X-Client": "qa", "X-Trace-Id": "42"}
+        assert calls[3][2]["params"] == {}
+        assert calls[3][2]["headers"] == {"X-Client": "ui"}
+        # 公共请求头不会被单次调用修改
+        assert ProductApi.endpoints["get_product"].headers == {}
+        with pytest.raises(TypeError):
+            api.add_product("商品", 9.9)
+
+    def test_generate_from_openapi(self):
+        """测试根据OpenAPI文档生成客户端"""
+        spec = {
+            "openapi": "3.0.0",
+            "servers": [{"url": "https://api.example.com/v1"}],
+            "paths": {
+                "/pets/{petId}": {
+                    "parameters": [{"name": "petId", "in": "path", "required": True}],
+                    "put": {
+                        "operationId": "updatePet",
+                        "parameters": [
+                            {"name": "dryRun", "in": "query"},
+                            {"name": "X-Request-Id", "in": "header", "required": True},
+                        ],
+                        "requestBody": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/Pet"}
+                                }
+                            }
+                        },
+                    },
+                },
+                "/pets": {
+                    "post": {
+                        "requestBody": {
+                            "required": True,
+                            "content": {
+                                "application/json": {"schema": {"type": "array"}}
+                            },
+                        }
+                    }
+                },
+            },
+            "components": {
+                "schemas": {
+                    "Pet": {
+                        "type": "object",
+                        "required": ["name"],
+                        "properties": {"name": {}, "tag": {}},
+                    }
+                }
+            },
+        }
+        PetApi = generate_client(spec)
+        assert sorted(PetApi.endpoints) == ["post_pets", "update_pet"]
+        assert str(inspect.signature(PetApi.update_pet)).startswith(
+            "(self, pet_id, name, x_request_id, *, dry_run=UNSET, tag=UNSET"
+        )
+
+        api = PetApi("http://localhost:1")
+        calls = self.capture_session(api)
+        api.update_pet(7, "旺财", "req-1", dry_run=True)
+        api.post_pets([{"name": "a"}])
+        assert calls[0][:2] == ("PUT", "http://localhost:1/v1/pets/7")
+        assert calls[0][2]["params"] == {"dryRun": True}
+        assert calls[0][2]["headers"] == {"X-Request-Id": "req-1"}
+        assert calls[0][2]["json"] == {"name": "旺财"}
+        assert calls[1][2]["json"] == [{"name": "a"}]
+
+    def test_async_client(self):
+        """测试异步客户端并发请求"""
+        server = MockServer(port=0, journal_size=100)
+        server.add_rule(
+            "GET", "/api/product/{id}", create_mock_response(200, {"code": 0})
+        )
+        server.start()
+        try:
+            AsyncProductApi = generate_client(self.SPEC, asynchronous=True)
+            assert inspect.iscoroutinefunction(AsyncProductApi.get_product)
+
+            async def fetch_all():
+                async with AsyncProductApi(server.base_url, max_workers=5) as api:
+                    return await asyncio.gather(
+                        *(api.get_product(i, fields="name") for i in range(10))
+                    )
+
+            responses = asyncio.run(fetch_all())
+        finally:
+            server.stop()
+        assert [resp.status_code for resp in responses] == [200] * 10
+        assert server.count_requests("GET") == 10
+
+    def test_shared_session(self, monkeypatch):
+        """测试复用会话时不再新建会话，沿用原会话的钩子和请求头"""
+        ProductApi = generate_client(self.SPEC, "ProductApi")
+        session = requests.Session()
+        session.headers["Authorization"] = "token"
+        created = []
+        monkeypatch.setattr(
+            base_client_module,
+            "Session",
+            lambda: created.append(1) or requests.Session(),
+        )
+
+        api = ProductApi("http://localhost:1", session=session)
+
+        assert api.session is session
+        assert not created
+        assert session.hooks["response"] == []
+        assert session.headers["Authorization"] == "token"
+        assert ProductApi("http://localhost:1").session is not session
+        assert len(created) == 1
+
+    @pytest.mark.perf
+    def test_call_overhead(self, monkeypatch):
+        """
+        测试生成的方法比手写的业务方法调用开销小（不发送真实请求）
+
+        两者都经过默认配置的重试策略，与实际使用一致；耗时比较受机器负载影响，
+        标记为 perf 默认不执行：pytest -m perf
+        """
+        monkeypatch.setattr(flask_client_module, "FlaskValidatable", lambda resp: resp)
+        # 与默认配置相同的重试策略，使用独立的预算和统计，不影响用例结束时的重试统计
+        policy = RetryPolicy(budget=RetryBudget(), metrics=RetryMetrics())
+        client = FlaskClient(
+            "http://localhost:1", "admin", "123456", retry_policy=policy
+        )
+        self.capture_session(client)
+        assert client.api.retry_policy is policy
+
+        def best(func) -> float:
+            # 统计CPU时间，排除其他进程抢占造成的抖动
+            return min(
+                timeit.repeat(func, number=2000, repeat=5, timer=time.process_time)
+            )
+
+        legacy = best(lambda: client.add_product("商品", 9.9, "book", "novel"))
+        generated = best(lambda: client.api.add_product("商品", 9.9, "book", "novel"))
+        assert generated < legacy
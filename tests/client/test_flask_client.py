@@ -0,0 +1,254 @@
+"""
+FlaskClient懒登录、token共享与失败重试测试
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.client.flask_client.exceptions import FlaskClientException
+from src.client.flask_client.flask_auth import FlaskToken
+from src.client.flask_client.flask_client import (
+    FlaskClient,
+    _credential_key,
+    get_flask_client,
+    reset_flask_clients,
+)
+from src.client.flask_client.flask_validatable import FlaskValidatable
+from src.utils.mock_server import MockServer, create_mock_response
+from src.utils.retry_policy import RetryPolicy
+from src.utils.token_cache import TokenCache
+
+
+def make_jwt(exp: float) -> str:
+    """生成只用于解析exp的测试JWT（不签名）"""
+    payload = json.dumps({"sub": "test", "exp": int(exp)}).encode()
+    return "e30." + base64.urlsafe_b64encode(payload).decode().rstrip("=") + ".sig"
+
+
+def current_user_token(host: str, cache_dir: str) -> str:
+    """在子进程中使用共享token缓存请求接口，返回使用的token"""
+    client = FlaskClient(
+        host,
+        "admin",
+        "123456",
+        token_cache=TokenCache(os.path.join(cache_dir, "tokens")),
+    )
+    client.get_current_user()
+    return client.token.token
+
+
+class TestFlaskClient:
+    """FlaskClient懒登录与token共享测试"""
+
+    @pytest.fixture
+    def auth_server(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("FLASK_TOKEN_CACHE", "1")
+        monkeypatch.setenv("FLASK_TOKEN_CACHE_DIR", str(tmp_path / "tokens"))
+        reset_flask_clients()
+        server = MockServer(port=0)
+        server.add_rule(
+            "POST",
+            "/api/user/login",
+            create_mock_response(
+                200, {"code": 0, "data": {"token": make_jwt(time.time() + 3600)}}
+            ),
+        )
+        server.add_rule(
+            "GET",
+            "/api/user/currentUser",
+            create_mock_response(200, {"code": 0, "data": {"name": "admin"}}),
+        )
+        server.start()
+        yield server
+        server.stop()
+        reset_flask_clients()
+
+    def test_lazy_shared_token(self, auth_server):
+        """测试第一次请求时才登录，同账号的客户端共享token"""
+        host = auth_server.base_url
+        client = FlaskClient(host, "admin", "123456")
+        assert auth_server.get_call_count("POST", "/api/user/login") == 0
+
+        client.get_current_user()
+        FlaskClient(host, "admin", "123456").get_current_user()
+        assert auth_server.get_call_count("POST", "/api/user/login") == 1
+        assert (
+            client.resp.request_headers["Authorization"]
+            == f"Bearer {client.token.token}"
+        )
+        assert client.token.expires_at == pytest.approx(time.time() + 3600, abs=5)
+
+        # 其他账号单独登录
+        FlaskClient(host, "guest", "123456").get_current_user()
+        assert auth_server.get_call_count("POST", "/api/user/login") == 2
+        # 密码不同的客户端不共享进程内和缓存中的token
+        other = FlaskClient(host, "admin", "wrong")
+        assert other.token is not client.token
+        other.get_current_user()
+        assert auth_server.get_call_count("POST", "/api/user/login") == 3
+        assert get_flask_client("admin", "wrong", host=host) is not get_flask_client(
+            "admin", "123456", host=host
+        )
+
+    def test_token_get_during_invalidate(self):
+        """测试其他线程同时 invalidate() 时 get() 不会返回None"""
+        token = FlaskToken(lambda: make_jwt(time.time() + 3600))
+        stop = threading.Event()
+
+        def invalidate():
+            while not stop.is_set():
+                token.invalidate()
+
+        thread = threading.Thread(target=invalidate)
+        thread.start()
+        try:
+            assert all(token.get() for _ in range(2000))
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_refresh_before_expiry(self, auth_server):
+        """测试token即将过期时自动重新登录"""
+        token = FlaskToken(lambda: make_jwt(time.time() + 100), refresh_margin=30)
+        first = token.get()
+        assert token.get() == first
+        assert token.refresh_at == pytest.approx(token.expires_at - 30)
+
+        token.refresh_at = time.time() - 1
+        token.get()
+        assert token.login_count == 2
+
+        # 有效期短于刷新提前量时，最多提前一半有效期刷新
+        short = FlaskToken(lambda: make_jwt(time.time() + 20), refresh_margin=60)
+        short.get()
+        assert short.refresh_at == pytest.approx(short.expires_at - 10, abs=1)
+
+        client = get_flask_client("admin", "123456", host=auth_server.base_url)
+        assert get_flask_client("admin", "123456", host=auth_server.base_url) is client
+        client.get_current_user()
+        assert client.token.login_count == 1
+        # 缓存中的token仍然有效，直接复用
+        client.token.refresh_at = time.time() - 1
+        client.get_current_user()
+        assert client.token.login_count == 1
+        # token失效（如退出登录）后重新登录
+        client.token.invalidate()
+        client.get_current_user()
+        assert client.token.login_count == 2
+        assert auth_server.get_call_count("POST", "/api/user/login") == 2
+
+    def test_token_cache_across_processes(self, auth_server, tmp_path):
+        """测试多个进程共享token缓存，只登录一次"""
+        with ProcessPoolExecutor(4) as executor:
+            tokens = list(
+                executor.map(
+                    current_user_token, [auth_server.base_url] * 8, [str(tmp_path)] * 8
+                )
+            )
+        assert len(set(tokens)) == 1
+        assert auth_server.get_call_count("POST", "/api/user/login") == 1
+
+        cache = TokenCache(tmp_path / "tokens")
+        key = _credential_key(auth_server.base_url, "admin", "123456")
+        entry = cache.get(*key)
+        assert entry["token"] == tokens[0]
+        assert entry["refresh_at"] == pytest.approx(entry["expires_at"] - 60)
+        assert oct(os.stat(cache._cache_file(*key)).st_mode)[-3:] == "600"
+        # 凭据不同时不读取缓存
+        assert cache.get(auth_server.base_url, "admin") is None
+
+        cache.invalidate(*key[:2], token="other", credential=key[2])
+        assert cache.get(*key) is not None
+        cache.invalidate(*key[:2], credential=key[2])
+        assert cache.get(*key) is None
+
+    def test_token_cache_opt_in(self, auth_server, monkeypatch):
+        """测试跨进程token缓存默认关闭"""
+        monkeypatch.delenv("FLASK_TOKEN_CACHE")
+        assert FlaskClient(auth_server.base_url, "admin", "123456").token.cache is None
+
+    def test_unauthorized_drops_token(self, auth_server, tmp_path):
+        """测试接口返回401时丢弃进程内和缓存中的token，下次请求重新登录"""
+        auth_server.reset_rules()
+        auth_server.add_rule(
+            "POST",
+            "/api/user/login",
+            create_mock_response(
+                200, {"code": 0, "data": {"token": make_jwt(time.time() + 3600)}}
+            ),
+        )
+        auth_server.add_rule(
+            "GET",
+            "/api/user/currentUser",
+            create_mock_response(401, {"code": 401, "message": "token expired"}),
+        )
+        client = FlaskClient(auth_server.base_url, "admin", "123456")
+        assert client.get_current_user().status_code == 401
+        assert client.token.token is None
+        cache = TokenCache(tmp_path / "tokens")
+        assert (
+            cache.get(*_credential_key(auth_server.base_url, "admin", "123456")) is None
+        )
+
+        client.get_current_user()
+        assert auth_server.get_call_count("POST", "/api/user/login") == 2
+
+    def test_send_requests_retry(self, auth_server):
+        """测试send_requests对503按Retry-After重试，重试用尽后返回最后一次响应"""
+        auth_server.add_rule(
+            "POST",
+            "/api/product/add",
+            create_mock_response(
+                503, {"code": 1, "message": "busy"}, headers={"Retry-After": "0"}
+            ),
+        )
+        sleeps = []
+        policy = RetryPolicy(max_attempts=3, sleep=sleeps.append)
+        client = FlaskClient(
+            auth_server.base_url, "admin", "123456", retry_policy=policy
+        )
+
+        resp = client.add_product("商品", 9.9, "book", "novel")
+        assert resp.status_code == 503
+        assert sleeps == [0.0, 0.0]
+        assert auth_server.get_call_count("POST", "/api/product/add") == 3
+        assert policy.metrics.summary() == {
+            "POST /api/product/add": {
+                "requests": 1,
+                "retries": 2,
+                "retry:503": 2,
+                "gave_up": 1,
+            }
+        }
+
+    def test_generated_api(self, auth_server):
+        """测试FlaskClient.api与客户端共享登录态和重试策略"""
+        client = FlaskClient(auth_server.base_url, "admin", "123456")
+        resp = client.api.get_current_user()
+        assert isinstance(resp, FlaskValidatable)
+        assert resp.data == {"name": "admin"}
+        assert resp.request_headers["Authorization"] == f"Bearer {client.token.token}"
+        assert client.api.session is client.session
+        assert client.api.retry_policy is client.retry_policy
+
+    def test_login_failure(self, tmp_path, monkeypatch):
+        """测试登录失败时抛出异常"""
+        monkeypatch.setenv("FLASK_TOKEN_CACHE_DIR", str(tmp_path))
+        server = MockServer(port=0)
+        server.add_rule(
+            "POST",
+            "/api/user/login",
+            create_mock_response(200, {"code": 1, "data": {}}),
+        )
+        server.start()
+        try:
+            with pytest.raises(FlaskClientException):
+                FlaskClient(server.base_url, "admin", "wrong").get_current_user()
+        finally:
+            server.stop()
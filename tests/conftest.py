@@ -1,6 +1,7 @@
 import logging
 import os
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -8,8 +9,11 @@ import pytest
 from filelock import FileLock
 
 from conf.config import settings
+from src.client.flask_client.flask_client import get_flask_client
 from src.utils import util
-from src.utils.log_moudle import logger
+from src.utils.log_moudle import logger, merge_worker_logs, my_logger
+from src.utils.response_cache import response_cache_stats
+from src.utils.retry_policy import retry_budget, retry_metrics
 
 # 在conftest.py文件中，使用sys.path.append()方法将当前工作目录添加到Python的模块搜索路径中，这样就可以在测试文件中导入自定义的模块了。
 # sys.path.append(os.getcwd())
@@ -37,6 +41,54 @@ def propagate_loguru():
     logger.remove(handler_id)
 
 
+# 本次运行的开始时间，合并worker日志时排除之前运行残留的记录
+session_start = pytest.StashKey[float]()
+
+
+def pytest_sessionstart(session):
+    session.config.stash[session_start] = time.time()
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_sessionfinish(session):
+    suppressed = my_logger.sampling_summary()
+    if suppressed:
+        logger.warning(f"日志采样规则（LOG_SAMPLING）抑制的日志条数: {suppressed}")
+    retried = retry_metrics.summary(retried_only=True)
+    if retried:
+        logger.warning(
+            f"接口重试统计: {retried}，重试预算不足被拒绝 {retry_budget.exhausted} 次"
+        )
+    cache_totals = response_cache_stats.totals()
+    # 开启缓存时总是输出：全部未命中说明缓存规则没有生效，同样值得关注
+    if settings.get("response_cache") or cache_totals["misses"]:
+        logger.info(
+            f"接口响应缓存统计: {cache_totals}，按路径: {response_cache_stats.summary()}"
+        )
+    # 异步日志模式（LOG_ASYNC=1）下，等待后台线程把队列中的日志全部写入
+    my_logger.flush()
+    # xdist主进程：各worker已结束，把本次运行的 tests.gw*.log 按时间合并为 tests.merged.log，
+    # 合并后删除worker文件，避免下次运行时混入旧日志
+    numprocesses = getattr(session.config.option, "numprocesses", None)
+    if not hasattr(session.config, "workerinput") and numprocesses:
+        merged = merge_worker_logs(
+            workers=numprocesses,
+            since=session.config.stash[session_start],
+            remove=True,
+        )
+        for output, count in merged.items():
+            logger.info(f"已合并 {count} 条worker日志: {output}")
+
+
+@pytest.fixture(scope="session")
+def flask_client():
+    """
+    会话内共享的FlaskClient（配置中的默认账号），第一次发请求时才登录，token过期前自动刷新
+    其他账号使用 get_flask_client(account, password)
+    """
+    return get_flask_client()
+
+
 @pytest.fixture(scope="session", autouse=True)
 def faker_session_locale():
     """set faker fixture locale
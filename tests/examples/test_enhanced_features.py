@@ -184,7 +184,7 @@ class TestMockServer:
     @pytest.fixture(scope="class")
     def mock_server(self):
         """Mock服务器fixture"""
-        server = MockServer(host="localhost", port=9999)
+        server = MockServer(host="localhost", port=0)
 
         # 添加Mock规则
         server.add_rule(
@@ -0,0 +1,246 @@
+"""
+数据驱动测试：流式读取、解析缓存、JSONL/Parquet与批量数据生成
+"""
+
+import json
+import os
+import types
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from src.utils import data_driver as data_driver_module
+from src.utils.data_driver import (
+    DataDriver,
+    YamlLoader,
+    _row_seed,
+    cli,
+    data_driver,
+    load_test_data,
+)
+from src.utils.log_moudle import logger
+
+
+class TestDataDriver:
+    """数据驱动测试"""
+
+    def test_seeded_bulk_generation(self):
+        """测试按行种子生成的数据与分批、并行方式无关"""
+        template = {"name": "faker.name", "email": "faker.email", "age": 25}
+
+        rows = data_driver.generate_test_data(template, count=30, seed=7)
+        parallel_rows = data_driver.generate_test_data(
+            template, count=30, seed=7, workers=2
+        )
+        batched_rows = [
+            row
+            for batch in data_driver.iter_generated_batches(
+                template, count=30, batch_size=8, seed=7
+            )
+            for row in batch
+        ]
+
+        assert rows == parallel_rows == batched_rows
+        assert len({row["email"] for row in rows}) > 1
+
+    def test_nested_template_constraints(self, tmp_path):
+        """测试嵌套模板、字段引用与唯一性约束"""
+        template = {
+            "user_id": {"$unique": "faker.random_int:1:50"},
+            "name": "faker.name",
+            "email": "fmt:user{user_id}@example.com",
+            "level": {"$choice": ["gold", "silver"], "weights": [1, 0]},
+            "address": {"city": "faker.city", "owner": "ref.name"},
+            "orders": {
+                "$array": {"sku": "faker.random_element:A,B,C", "qty": 2},
+                "min": 1,
+                "max": 3,
+            },
+            "age_next_year": lambda row: row["user_id"] + 1,
+        }
+
+        rows = data_driver.generate_test_data(template, count=50, seed=3)
+
+        assert len({row["user_id"] for row in rows}) == 50
+        for row in rows:
+            assert row["email"] == f"user{row['user_id']}@example.com"
+            assert row["level"] == "gold"
+            assert row["address"]["owner"] == row["name"]
+            assert 1 <= len(row["orders"]) <= 3
+            assert all(order["sku"] in "ABC" for order in row["orders"])
+            assert row["age_next_year"] == row["user_id"] + 1
+        with pytest.raises(ValueError):
+            data_driver.generate_test_data(template, count=51)
+
+        data_driver.generate_to_file(
+            template, 50, str(tmp_path / "users.jsonl"), seed=3
+        )
+        assert data_driver.load_jsonl(str(tmp_path / "users.jsonl")) == rows
+
+    def test_parallel_callable_fields(self):
+        """测试包含自定义函数的模板在多进程参数下退回单进程生成"""
+        template = {"a": "faker.random_int:1:100", "b": lambda row: row["a"] + 1}
+        messages = []
+        handler_id = logger.add(
+            messages.append,
+            format="{message}",
+            filter=lambda record: "自定义函数" in record["message"],
+        )
+        try:
+            rows = data_driver.generate_test_data(template, count=10, workers=2, seed=5)
+        finally:
+            logger.remove(handler_id)
+
+        assert len(messages) == 1
+        assert rows == data_driver.generate_test_data(template, count=10, seed=5)
+        assert all(row["b"] == row["a"] + 1 for row in rows)
+
+    def test_iter_rows(self, tmp_path):
+        """测试流式读取CSV/JSONL/Excel"""
+        openpyxl = pytest.importorskip("openpyxl")
+
+        (tmp_path / "users.csv").write_text(
+            "name,age\n张三,25\n李四,30\n", encoding="utf-8"
+        )
+        (tmp_path / "users.jsonl").write_text(
+            "\n".join(json.dumps({"name": f"用户{i}"}) for i in range(3)) + "\n\n",
+            encoding="utf-8",
+        )
+        workbook = openpyxl.Workbook()
+        workbook.active.append(["name", "age"])
+        workbook.active.append(["王五", 28])
+        workbook.active.append([None, None])
+        workbook.active.append(["赵六", None])
+        workbook.save(tmp_path / "users.xlsx")
+
+        driver = DataDriver(data_dir=str(tmp_path))
+        rows = driver.iter_csv("users.csv")
+        assert isinstance(rows, types.GeneratorType)
+        assert list(rows) == [
+            {"name": "张三", "age": "25"},
+            {"name": "李四", "age": "30"},
+        ]
+        assert [row["name"] for row in driver.iter_jsonl("users.jsonl")] == [
+            "用户0",
+            "用户1",
+            "用户2",
+        ]
+        assert list(driver.iter_excel("users.xlsx")) == [
+            {"name": "王五", "age": 28},
+            {"name": "赵六", "age": None},
+        ]
+
+    def test_jsonl_and_parquet_sources(self, tmp_path):
+        """测试JSONL/Parquet的读写、列裁剪与格式转换"""
+        pytest.importorskip("pyarrow")
+
+        driver = DataDriver(data_dir=str(tmp_path))
+        users = [{"name": f"用户{i}", "age": 20 + i, "city": "北京"} for i in range(25)]
+
+        driver.save_data(iter(users), "users.jsonl", file_type="jsonl")
+        assert load_test_data("users.jsonl", driver=driver) == users
+
+        driver.convert_file("users.jsonl", "users.parquet")
+        assert driver.load_parquet("users.parquet") == users
+        assert list(driver.iter_parquet("users.parquet", ["age"], batch_size=10))[
+            :2
+        ] == [
+            {"age": 20},
+            {"age": 21},
+        ]
+
+        driver.save_data({"cases": [1, 2]}, "cases.yaml", file_type="yaml")
+        driver.convert_file("cases.yaml", "cases.jsonl")
+        assert driver.load_jsonl("cases.jsonl") == [{"cases": [1, 2]}]
+
+    def test_parsed_data_cache(self, tmp_path, monkeypatch):
+        """测试YAML解析结果缓存及自动失效"""
+        calls = []
+        yaml_load = data_driver_module.yaml_load
+        monkeypatch.setattr(
+            data_driver_module,
+            "yaml_load",
+            lambda stream: calls.append(1) or yaml_load(stream),
+        )
+
+        data_file = tmp_path / "cases.yaml"
+        data_file.write_text("- name: 用例1\n", encoding="utf-8")
+        driver = DataDriver(data_dir=str(tmp_path), cache_dir=str(tmp_path / "cache"))
+
+        assert driver.load_yaml("cases.yaml") == [{"name": "用例1"}]
+        assert driver.load_yaml("cases.yaml") == [{"name": "用例1"}]
+        assert len(calls) == 1
+
+        # 仅修改时间变化、内容不变时仍命中缓存
+        stat = data_file.stat()
+        os.utime(data_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert driver.load_yaml("cases.yaml") == [{"name": "用例1"}]
+        assert len(calls) == 1
+
+        data_file.write_text("- name: 用例2\n", encoding="utf-8")
+        assert driver.load_yaml("cases.yaml") == [{"name": "用例2"}]
+        assert len(calls) == 2
+
+    def test_yaml_loaders(self, tmp_path):
+        """测试C加载器、预编译命令与基准测试命令"""
+        text = (data_driver.data_dir / "api_test_cases.yaml").read_text(
+            encoding="utf-8"
+        )
+        assert yaml.load(text, Loader=YamlLoader) == yaml.safe_load(text)
+        if yaml.__with_libyaml__:
+            assert YamlLoader is yaml.CSafeLoader
+
+        (tmp_path / "cases.yaml").write_text("- name: 用例1\n", encoding="utf-8")
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["precompile", "--data-dir", str(tmp_path)],
+            env={"DATA_DRIVER_CACHE_DIR": str(tmp_path / "cache")},
+        )
+        assert result.exit_code == 0, result.output
+        assert list((tmp_path / "cache").glob("*.pkl"))
+
+        result = runner.invoke(
+            cli,
+            ["bench-yaml", "cases.yaml", "--data-dir", str(tmp_path), "--repeat", "1"],
+        )
+        assert result.exit_code == 0, result.output
+        assert "precompiled cache" in result.output
+
+    def test_lazy_load_test_data(self):
+        """测试惰性加载模式"""
+        rows = load_test_data("test_users.json", lazy=True)
+        assert not isinstance(rows, list)
+        assert next(rows)["name"] == "张三"
+
+    def test_parquet_schema(self, tmp_path):
+        """测试Parquet分批写入时schema不会被第一批数据限定"""
+        pa = pytest.importorskip("pyarrow")
+
+        driver = DataDriver(data_dir=str(tmp_path))
+        rows = [{"name": f"用户{i}", "age": None} for i in range(3)]
+        rows += [{"name": "用户3", "age": 30}]
+
+        with pytest.raises(ValueError, match="schema"):
+            driver._write_parquet(iter(rows), tmp_path / "null.parquet", batch_size=2)
+        with pytest.raises(ValueError, match="vip"):
+            driver._write_parquet(
+                iter(rows[:2] + [{"name": "用户2", "age": 1, "vip": True}]),
+                tmp_path / "extra.parquet",
+                batch_size=2,
+            )
+
+        schema = pa.schema([("name", pa.string()), ("age", pa.int64())])
+        driver.save_data(
+            iter(rows), "users.parquet", file_type="parquet", schema=schema
+        )
+        assert driver.load_parquet("users.parquet") == rows
+
+    def test_row_seed_no_collision(self):
+        """测试不同种子的行种子不会因行号偏移而重合"""
+        assert _row_seed(1, 0) != _row_seed(0, 1_000_003)
+        assert _row_seed(-1, 0) != _row_seed(1, 0)
+        assert (
+            len({_row_seed(seed, i) for seed in range(5) for i in range(1000)}) == 5000
+        )
@@ -0,0 +1,53 @@
+"""
+data_file 标记参数化测试
+"""
+
+import pytest
+
+from src.utils.data_driver import DataDriver
+from src.utils.data_plugin import DataFileSource, DataRef, parse_shard
+
+
+class TestDataFilePlugin:
+    """按数据文件参数化测试"""
+
+    @pytest.mark.data_file("test_users.json", argname="user", id_key="email")
+    def test_data_file_parametrize(self, user, request):
+        """测试按数据文件参数化，用例ID取自email字段"""
+        assert isinstance(user, dict)
+        assert request.node.callspec.id == user["email"]
+        # 行数据由夹具读取，参数化的值保持为行引用
+        assert isinstance(request.node.callspec.params["user"], DataRef)
+
+    @pytest.mark.data_file("test_users.json", argname="shard_user", shard="1/2")
+    def test_data_file_shard(self, shard_user, request):
+        """测试标记中的分片参数与 --data-shard 使用相同的 INDEX/TOTAL 格式"""
+        assert int(request.node.callspec.id) % 2 == 1
+        assert isinstance(shard_user, dict)
+
+    def test_parse_shard(self):
+        """测试分片参数同时支持字符串与元组"""
+        assert parse_shard("1/4") == parse_shard((1, 4)) == (1, 4)
+        assert parse_shard(None) is None
+        for value in ["4/4", "a/b", "1"]:
+            with pytest.raises(pytest.UsageError):
+                parse_shard(value)
+
+    def test_data_file_source(self, tmp_path):
+        """测试数据文件行索引的分片与按需读取"""
+        driver = DataDriver(data_dir=str(tmp_path))
+        driver.save_data(
+            [{"id": f"case {i}", "value": i} for i in range(10)],
+            "cases.jsonl",
+            file_type="jsonl",
+        )
+        source = DataFileSource("cases.jsonl", driver=driver, window=2)
+
+        entries = source.scan("id", shard="1/3")
+        assert entries == [(1, "case_1"), (4, "case_4"), (7, "case_7")]
+
+        source.selected.update({position: 1 for position, _ in entries})
+        assert [source.get(position)["value"] for position, _ in entries] == [1, 4, 7]
+        assert source.selected == {}
+        # 乱序读取时重新打开文件
+        assert source.get(2)["value"] == 2
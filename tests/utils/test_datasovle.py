@@ -0,0 +1,205 @@
+"""
+数据统计与结果写入测试
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.datasovle import DataSovle
+
+
+class TestDataSovle:
+    """数据统计测试"""
+
+    @pytest.fixture
+    def result_dir(self, tmp_path):
+        """按接口拆分的压测结果目录"""
+        for index in range(6):
+            rows = [
+                f"/api/{index % 2},{200 if i % 4 else 500},{index * 10 + i}"
+                for i in range(10)
+            ]
+            (tmp_path / f"part_{index}.csv").write_text(
+                "endpoint,status,cost\n" + "\n".join(rows) + "\n", encoding="utf-8"
+            )
+        (tmp_path / "readme.txt").write_text("not a csv", encoding="utf-8")
+        return tmp_path
+
+    def test_read_csv_files(self, result_dir):
+        """测试并发读取多个csv文件，只合并一次"""
+        solve = DataSovle()
+
+        df = solve.read_csv(
+            str(result_dir), dtype={"status": "int32"}, usecols=["status", "cost"]
+        )
+        assert len(df) == 60
+        assert list(df.columns) == ["status", "cost"]
+        assert str(df["status"].dtype) == "int32"
+        assert df["cost"].tolist() == [i * 10 + j for i in range(6) for j in range(10)]
+
+        files = [str(result_dir / "part_1.csv"), str(result_dir / "part_0.csv")]
+        df = solve.read_csv(files + files[:1], use_processes=True, workers=2)
+        assert len(df) == 20
+        assert df["cost"].iloc[0] == 10
+        assert solve.df is df
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_chunked_aggregation(self, result_dir, workers):
+        """测试分块统计与内存统计结果一致，过滤条件对每一块生效"""
+        solve = DataSovle()
+        solve.read_csv(str(result_dir))
+        solve.df_filter_is("endpoint", "/api/1").df_filter_not("status", 500)
+
+        chunked = DataSovle().read_csv_chunked(str(result_dir), chunksize=7)
+        chunked.workers = workers
+        stats = (
+            chunked.df_filter_is("endpoint", "/api/1")
+            .df_filter_not("status", 500)
+            .aggregate(mean=["cost"], percentile=["cost"], value_counts=["status"])
+        )
+
+        assert stats.rows == len(solve.df)
+        assert stats.mean("cost") == pytest.approx(solve.df_mean("cost"))
+        costs = solve.df["cost"]
+        for num in (50, 95, 99):
+            # 草图按排名取值，误差不超过1%，不做线性插值
+            lower = np.percentile(costs, num, method="lower") * 0.99
+            higher = np.percentile(costs, num, method="higher") * 1.01
+            assert lower <= stats.percentile("cost", num) <= higher
+        assert stats.count_prentage("status", 200) == 1.0
+        assert DataSovle().read_csv_chunked(str(result_dir)).df_count_prentage(
+            "status", 500
+        ) == pytest.approx(0.3)
+
+    def test_group_report(self, result_dir, tmp_path):
+        """测试分组分位数报表与写入csv"""
+        solve = DataSovle()
+        solve.read_csv(str(result_dir))
+
+        report = solve.df_group_report(
+            ["endpoint", "status"],
+            "cost",
+            aggregates=["count", "mean"],
+            file=str(tmp_path / "report.csv"),
+        )
+
+        assert list(report.columns) == [
+            "endpoint",
+            "status",
+            "cost_count",
+            "cost_mean",
+            "cost_p50",
+            "cost_p95",
+            "cost_p99",
+        ]
+        assert len(report) == 4
+        for row in report.itertuples():
+            costs = solve.df.loc[
+                (solve.df["endpoint"] == row.endpoint)
+                & (solve.df["status"] == row.status),
+                "cost",
+            ]
+            assert row.cost_count == len(costs)
+            assert row.cost_p99 == pytest.approx(np.percentile(costs, 99))
+        saved = pd.read_csv(tmp_path / "report.csv")
+        assert saved["cost_p95"].tolist() == pytest.approx(report["cost_p95"].tolist())
+
+    @pytest.mark.parametrize("file_type", ["csv", "jsonl", "parquet"])
+    def test_result_writer(self, tmp_path, file_type):
+        """测试多线程缓冲写入结果，文件只打开一次"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        if file_type == "parquet":
+            pytest.importorskip("pyarrow")
+        file = str(tmp_path / f"results.{file_type}")
+
+        with DataSovle().result_writer(
+            file, batch_size=64, flush_interval=0.01
+        ) as writer:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                for worker in range(8):
+                    executor.submit(
+                        writer.write_many,
+                        [{"worker": worker, "seq": seq} for seq in range(500)],
+                    )
+
+        if file_type == "csv":
+            df = pd.read_csv(file)
+        elif file_type == "jsonl":
+            df = pd.read_json(file, lines=True)
+        else:
+            df = pd.read_parquet(file)
+        assert len(df) == writer.rows_written == 4000
+        assert (
+            df.groupby("worker")["seq"].apply(list).map(sorted).tolist()
+            == [list(range(500))] * 8
+        )
+
+    @pytest.mark.parametrize("file_type", ["csv", "parquet"])
+    def test_result_writer_columns(self, tmp_path, file_type):
+        """测试列在第一次写入时确定，之后出现的新键报错，追加时沿用已有文件的列"""
+        if file_type == "parquet":
+            pa = pytest.importorskip("pyarrow")
+            declared = {
+                "schema": pa.schema(
+                    [("id", pa.int64()), ("status", pa.int64()), ("error", pa.string())]
+                )
+            }
+            read = pd.read_parquet
+        else:
+            declared = {"columns": ["id", "status", "error"]}
+            read = pd.read_csv
+        file = str(tmp_path / f"results.{file_type}")
+
+        with DataSovle().result_writer(
+            file, batch_size=1, flush_interval=None
+        ) as writer:
+            writer.write({"id": 1, "status": 200})
+            with pytest.raises(ValueError, match="error"):
+                writer.write({"id": 2, "status": 500, "error": "timeout"})
+
+        with DataSovle().result_writer(
+            file, batch_size=1, flush_interval=None, mode="w", **declared
+        ) as writer:
+            writer.write({"id": 1, "status": 200})
+            writer.write({"id": 2, "status": 500, "error": "timeout"})
+        with DataSovle().result_writer(file, flush_interval=None) as writer:
+            writer.write({"id": 3, "status": 200})
+        df = read(file)
+        assert df["id"].tolist() == [1, 2, 3]
+        assert df["error"].tolist()[1] == "timeout"
+
+    @pytest.mark.parametrize("file_type", ["csv", "parquet"])
+    def test_save_file_modes(self, tmp_path, file_type):
+        """测试save_file在csv和parquet上的追加、覆盖行为一致"""
+        if file_type == "parquet":
+            pytest.importorskip("pyarrow")
+            read = pd.read_parquet
+        else:
+            read = pd.read_csv
+        file = str(tmp_path / f"report.{file_type}")
+        solve = DataSovle()
+
+        solve.save_file(file, {"endpoint": ["/a"], "cost": [1]})
+        solve.save_file(file, {"cost": [2], "endpoint": ["/b"]})
+        assert read(file).to_dict("list") == {"endpoint": ["/a", "/b"], "cost": [1, 2]}
+
+        with pytest.raises(ValueError, match="status"):
+            solve.save_file(file, {"endpoint": ["/c"], "status": [200]})
+        solve.save_file(file, {"endpoint": ["/c"], "status": [200]}, mode="w")
+        assert read(file).to_dict("list") == {"endpoint": ["/c"], "status": [200]}
+
+    def test_performance_result_writer(self, tmp_path):
+        """测试性能测试器逐条写入请求结果"""
+        from src.utils.performance import PerformanceTester
+
+        file = str(tmp_path / "requests.csv")
+        with DataSovle().result_writer(file) as writer:
+            PerformanceTester(result_writer=writer).load_test(
+                lambda: None, concurrent_users=4, total_requests=50
+            )
+
+        df = pd.read_csv(file)
+        assert len(df) == 50
+        assert {"timestamp", "success", "response_time"} <= set(df.columns)
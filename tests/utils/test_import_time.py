@@ -0,0 +1,91 @@
+"""
+导入耗时与导入副作用测试
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+class TestImportTime:
+    """导入耗时回归测试，基于 python -X importtime"""
+
+    # 模块 -> 导入耗时预算（毫秒，包含依赖），CI机器较慢时可用 IMPORT_TIME_SCALE 放宽
+    BUDGETS = {
+        "src.utils.data_plugin": 500,
+        "src.utils.data_driver": 400,
+        "src.client.base_client": 400,
+        "src.client.flask_client.flask_client": 500,
+    }
+    # 只应在使用时才导入的重量级依赖
+    LAZY_MODULES = ("pandas", "numpy", "faker", "pyarrow", "openpyxl")
+
+    @staticmethod
+    def import_times(module: str) -> dict:
+        """在新的解释器中导入模块，返回 模块名 -> 累计导入耗时（毫秒）"""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        times = {}
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line.split("|")
+            times[name.strip()] = int(cumulative) / 1000
+        return times
+
+    @pytest.mark.parametrize("module", list(BUDGETS))
+    def test_lazy_imports(self, module):
+        """测试导入框架模块时不加载重量级依赖（检查 sys.modules，不受机器快慢影响）"""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        code = (
+            f"import sys, {module};"
+            f"print(','.join(m for m in {self.LAZY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout.strip() == ""
+
+    @pytest.mark.perf
+    @pytest.mark.parametrize("module", list(BUDGETS))
+    def test_import_budget(self, module):
+        """测试框架模块导入耗时不超过预算（耗时断言，默认不执行：pytest -m perf）"""
+        budget = self.BUDGETS[module] * float(os.getenv("IMPORT_TIME_SCALE", "1"))
+        # 取多次中的最小值，减少机器抖动的影响
+        runs = [self.import_times(module) for _ in range(3)]
+        elapsed = min(times[module] for times in runs)
+
+        assert (
+            elapsed <= budget
+        ), f"{module} 导入耗时 {elapsed:.0f}ms 超过预算 {budget:.0f}ms"
+
+    def test_no_import_side_effects(self, tmp_path):
+        """测试导入时不登录、不创建日志目录"""
+        root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        code = (
+            "import sys, conf.constants as c; c.base_dir = sys.argv[1];"
+            "import src.client.flask_client.flask_client as f;"
+            "import src.utils.log_moudle as m;"
+            "f.flask_clinet._client is None or sys.exit('logged in')"
+        )
+        subprocess.run(
+            [sys.executable, "-c", code, str(tmp_path)],
+            cwd=root,
+            env={**os.environ, "DYNACONF_FLASK__HOST": "http://127.0.0.1:9"},
+            check=True,
+            capture_output=True,
+        )
+        assert not (tmp_path / "logs").exists()
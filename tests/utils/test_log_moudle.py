@@ -0,0 +1,177 @@
+"""
+高并发日志测试
+"""
+
+import os
+import time
+
+import pytest
+
+
+class TestAsyncLogging:
+    """高并发日志测试"""
+
+    @pytest.mark.parametrize("overflow", ["block", "drop"])
+    def test_async_sink(self, tmp_path, overflow):
+        """测试多线程写入异步sink，背压模式不丢日志，丢弃模式计数准确"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from src.utils.log_moudle import AsyncSink, logger
+
+        log_file = tmp_path / "async.log"
+        sink = AsyncSink(str(log_file), maxsize=16, overflow=overflow)
+        handler_id = logger.add(
+            sink,
+            format="{message}",
+            filter=lambda record: record["extra"].get("async_test"),
+        )
+        test_logger = logger.bind(async_test=True)
+
+        def work(index):
+            for seq in range(200):
+                test_logger.info(f"{index}-{seq}")
+
+        with ThreadPoolExecutor(max_workers=10) as executor:
+            list(executor.map(work, range(10)))
+        logger.remove(handler_id)
+        sink.close()
+
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert len(lines) + sink.dropped == 2000
+        if overflow == "block":
+            assert sink.dropped == 0
+            assert sorted(lines) == sorted(
+                f"{i}-{s}" for i in range(10) for s in range(200)
+            )
+
+    def test_log_sampling(self):
+        """测试按等级采样与令牌桶限流，WARNING及以上不采样"""
+        from src.utils.log_moudle import LogSampler, logger
+
+        sampler = LogSampler("*:INFO=1/10;*:DEBUG=5/s")
+        messages = []
+        handler_id = logger.add(
+            messages.append,
+            format="{message}",
+            filter=lambda record: record["extra"].get("sampling_test")
+            and sampler(record),
+        )
+        test_logger = logger.bind(sampling_test=True)
+        for seq in range(100):
+            test_logger.info(f"info {seq}")
+            test_logger.debug(f"debug {seq}")
+            test_logger.warning(f"warning {seq}")
+        logger.remove(handler_id)
+
+        info = [m for m in messages if m.startswith("info")]
+        debug = [m for m in messages if m.startswith("debug")]
+        assert [m.strip() for m in info] == [f"info {seq}" for seq in range(0, 100, 10)]
+        assert 5 <= len(debug) <= 6
+        assert len([m for m in messages if m.startswith("warning")]) == 100
+        summary = sampler.summary()
+        assert summary["*:INFO"] == 90
+        assert summary["*:DEBUG"] == 100 - len(debug)
+
+    def test_merge_worker_logs(self, tmp_path):
+        """测试按时间戳k路归并各worker的日志，多行记录保持完整"""
+        from src.utils.log_moudle import merge_worker_logs, worker_log_path
+
+        assert worker_log_path("logs/tests.log", "gw1") == "logs/tests.gw1.log"
+
+        def record(second, worker, extra=""):
+            return f"20240101 00:00:{second:02d}.000000 - {worker} | msg{extra}\n"
+
+        (tmp_path / "tests.gw0.log").write_text(
+            record(1, "gw0") + record(4, "gw0", '\n{\n  "a": 1\n}'),
+            encoding="utf-8",
+        )
+        (tmp_path / "tests.gw1.log").write_text(
+            record(2, "gw1") + record(3, "gw1") + record(5, "gw1"), encoding="utf-8"
+        )
+
+        result = merge_worker_logs(str(tmp_path))
+
+        merged = tmp_path / "tests.merged.log"
+        assert result == {str(merged): 5}
+        lines = merged.read_text(encoding="utf-8").splitlines()
+        assert [line[15:17] for line in lines if line.startswith("2024")] == [
+            "01",
+            "02",
+            "03",
+            "04",
+            "05",
+        ]
+        assert lines[4:7] == ["{", '  "a": 1', "}"]
+
+    def test_merge_worker_logs_between_runs(self, tmp_path):
+        """测试两次运行的worker数不同时，只合并本次运行的worker和记录"""
+        from src.utils.log_moudle import merge_worker_logs
+
+        def record(timestamp, worker):
+            text = time.strftime("%Y%m%d %H:%M:%S", time.localtime(timestamp))
+            return f"{text}.000000 - {worker} | msg\n"
+
+        first_run = time.time() - 3600
+        for index in range(3):
+            (tmp_path / f"tests.gw{index}.log").write_text(
+                record(first_run + index, f"gw{index}"), encoding="utf-8"
+            )
+        merged = str(tmp_path / "tests.merged.log")
+        assert merge_worker_logs(str(tmp_path), workers=3, remove=True) == {merged: 3}
+        assert not list(tmp_path.glob("tests.gw*.log"))
+
+        # 上次运行残留的文件：gw2没有被合并，gw0轮转出的旧文件
+        for name in ("tests.gw2.log", "tests.gw0.2024-01-01_00-00-00_000000.log"):
+            (tmp_path / name).write_text(record(first_run, "old"), encoding="utf-8")
+            os.utime(tmp_path / name, (first_run, first_run))
+        second_run = time.time() - 1
+        (tmp_path / "tests.gw0.log").write_text(
+            record(first_run, "old") + record(second_run + 1, "gw0"), encoding="utf-8"
+        )
+        (tmp_path / "tests.gw1.log").write_text(
+            record(second_run + 1, "gw1"), encoding="utf-8"
+        )
+
+        result = merge_worker_logs(
+            str(tmp_path), workers=2, since=second_run, remove=True
+        )
+
+        assert result == {merged: 2}
+        lines = (tmp_path / "tests.merged.log").read_text(encoding="utf-8")
+        assert "old" not in lines and "gw2" not in lines
+        assert sorted(path.name for path in tmp_path.glob("tests.gw*.log")) == [
+            "tests.gw0.2024-01-01_00-00-00_000000.log",
+            "tests.gw2.log",
+        ]
+
+    @pytest.mark.skipif(not hasattr(os, "fork"), reason="需要fork")
+    def test_async_sink_after_fork(self, tmp_path):
+        """测试fork后只重建未关闭的sink，子进程的日志照常写入"""
+        from src.utils.log_moudle import AsyncSink, _live_sinks, logger
+
+        sink = AsyncSink(str(tmp_path / "live.log"))
+        closed = AsyncSink(str(tmp_path / "closed.log"))
+        closed.close()
+        assert sink in _live_sinks and closed not in _live_sinks
+        handler_id = logger.add(
+            sink,
+            format="{message}",
+            filter=lambda record: record["extra"].get("fork_test"),
+        )
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - 子进程
+            code = 1
+            try:
+                if sink._thread.is_alive() and not closed._thread.is_alive():
+                    logger.bind(fork_test=True).info("child")
+                    sink.close()
+                    code = 0
+            finally:
+                os._exit(code)
+        _, status = os.waitpid(pid, 0)
+        logger.remove(handler_id)
+        sink.close()
+
+        assert os.waitstatus_to_exitcode(status) == 0
+        assert (tmp_path / "live.log").read_text(encoding="utf-8") == "child\n"
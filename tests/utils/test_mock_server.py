@@ -0,0 +1,281 @@
+"""
+Mock服务器测试：有状态资源、调用计数与请求日志、OpenAPI规则
+"""
+
+import pytest
+import requests
+
+from src.utils.mock_server import MockServer, create_mock_response
+
+
+@pytest.fixture(scope="module")
+def resource_server():
+    """带商品资源的Mock服务器fixture"""
+    server = MockServer(host="localhost", port=0)
+    server.add_resource(
+        "product",
+        indexes=["type", "status"],
+        actions={
+            "create": ("POST", "/api/product/add"),
+            "update": ("POST", "/api/product/update"),
+            "delete": ("POST", "/api/product/delete"),
+            "search": ("POST", "/api/product/search"),
+        },
+    )
+    server.add_resource("user", path="/api/users", indexes=["city"])
+    server.start()
+    yield server
+    server.stop()
+
+
+class TestMockResource:
+    """有状态Mock资源测试"""
+
+    def test_product_crud_flow(self, resource_server):
+        """测试商品增删改查流程"""
+        base_url = resource_server.base_url
+        product = {"name": "测试商品", "price": 12, "type": "食品", "status": 2}
+        response = requests.post(f"{base_url}/api/product/add", json=product)
+        assert response.status_code == 200
+        product_id = response.json()["data"]["id"]
+
+        response = requests.post(
+            f"{base_url}/api/product/update",
+            json={"product_id": product_id, "status": 1},
+        )
+        assert response.json()["data"]["status"] == 1
+
+        response = requests.post(
+            f"{base_url}/api/product/search",
+            json={"name": None, "type": "食品", "status": 1},
+        )
+        assert response.json()["data"]["total"] == 1
+
+        response = requests.post(
+            f"{base_url}/api/product/delete", json={"product_id": product_id}
+        )
+        assert response.status_code == 200
+        response = requests.post(
+            f"{base_url}/api/product/delete", json={"product_id": product_id}
+        )
+        assert response.status_code == 404
+
+    def test_rest_search_with_pagination(self, resource_server):
+        """测试REST路由的过滤查询与分页"""
+        base_url = resource_server.base_url
+        for i in range(5):
+            city = "北京" if i % 2 == 0 else "上海"
+            response = requests.post(
+                f"{base_url}/api/users", json={"name": f"用户{i}", "city": city}
+            )
+            assert response.status_code == 201
+
+        response = requests.get(
+            f"{base_url}/api/users", params={"city": "北京", "page": 2, "page_size": 2}
+        )
+        data = response.json()["data"]
+        assert data["total"] == 3
+        assert [item["name"] for item in data["items"]] == ["用户4"]
+
+        user_id = data["items"][0]["id"]
+        assert requests.get(f"{base_url}/api/users/{user_id}").status_code == 200
+        assert requests.delete(f"{base_url}/api/users/{user_id}").status_code == 200
+        assert requests.get(f"{base_url}/api/users/{user_id}").status_code == 404
+
+    def test_concurrent_create(self):
+        """测试并发创建时主键唯一且索引一致"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        resource = (
+            MockServer().add_resource("order", indexes=["status"]).get_resource("order")
+        )
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            items = list(
+                executor.map(lambda i: resource.create({"status": i % 2}), range(200))
+            )
+
+        assert len({item["id"] for item in items}) == 200
+        assert resource.search({"status": 0}, page_size=1000)["total"] == 100
+
+
+class TestMockJournal:
+    """Mock调用计数与请求日志测试"""
+
+    def test_concurrent_call_count_and_journal(self):
+        """测试并发请求下的调用计数与请求日志查询"""
+        from concurrent.futures import ThreadPoolExecutor
+
+        server = MockServer(journal_size=100)
+        server.add_rule("POST", "/api/users", create_mock_response(201, {"id": 1}))
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(
+                executor.map(
+                    lambda i: server.find_response(
+                        "POST", "/api/users", request_body={"name": f"用户{i % 3}"}
+                    ),
+                    range(300),
+                )
+            )
+        server.find_response("GET", "/api/missing")
+
+        assert server.get_call_count("POST", "/api/users") == 300
+        assert len(server.journal) == 100
+        assert server.count_requests("GET", "/api/missing", {"status_code": 404}) == 1
+        records = server.get_requests(
+            "POST", "/api/users", where={"body.name": "用户0"}
+        )
+        assert records
+        assert all(record.status_code == 201 for record in records)
+
+    def test_miss_logging(self):
+        """测试未匹配的请求只在 log_requests 时逐条打印日志"""
+        from src.utils.log_moudle import logger
+
+        messages = []
+        handler_id = logger.add(
+            messages.append,
+            format="{message}",
+            filter=lambda record: "未找到匹配的Mock规则" in record["message"],
+        )
+        try:
+            for _ in range(100):
+                MockServer().find_response("GET", "/api/missing")
+            MockServer(log_requests=True).find_response("GET", "/api/missing")
+        finally:
+            logger.remove(handler_id)
+        assert len(messages) == 1
+
+    def test_multi_process_aggregation(self):
+        """测试多进程模式下规则同步及计数、日志汇总"""
+        server = MockServer(port=0, workers=2, journal_size=100)
+        server.add_rule("GET", "/api/ping", create_mock_response(200, {"pong": True}))
+        server.start()
+        try:
+            # 启动后添加的规则同样会同步到所有工作进程
+            server.add_rule("GET", "/api/late", create_mock_response(200, {}))
+            for _ in range(10):
+                assert requests.get(f"{server.base_url}/api/ping").status_code == 200
+            assert requests.get(f"{server.base_url}/api/late").status_code == 200
+
+            assert server.get_call_count("GET", "/api/ping") == 10
+            assert server.get_call_count("GET", "/api/late") == 1
+            records = server.get_requests()
+            assert len(records) == 11
+            assert records == sorted(records, key=lambda record: record.timestamp)
+        finally:
+            server.stop()
+
+
+class TestMockOpenAPI:
+    """OpenAPI文档生成Mock规则测试"""
+
+    spec = {
+        "openapi": "3.0.0",
+        "servers": [{"url": "https://api.example.com/v1"}],
+        "paths": {
+            "/users": {
+                "post": {
+                    "responses": {
+                        "201": {
+                            "content": {
+                                "application/json": {
+                                    "example": {"id": 1, "name": "张三"}
+                                }
+                            }
+                        }
+                    }
+                }
+            },
+            "/users/{user_id}": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/User"}
+                                }
+                            }
+                        }
+                    }
+                },
+                "delete": {"responses": {"204": {"description": "deleted"}}},
+            },
+        },
+        "components": {
+            "schemas": {
+                "User": {
+                    "type": "object",
+                    "properties": {
+                        "id": {"type": "integer", "minimum": 1},
+                        "email": {"type": "string", "format": "email"},
+                        "tags": {"type": "array", "items": {"type": "string"}},
+                        "status": {"type": "string", "enum": ["active", "inactive"]},
+                    },
+                }
+            }
+        },
+    }
+
+    def test_load_openapi_rules(self):
+        """测试按文档生成规则及响应体"""
+        server = MockServer().load_openapi(self.spec)
+
+        response = server.find_response("GET", "/v1/users/42")
+        assert response.status_code == 200
+        assert response.body == {
+            "id": 1,
+            "email": "user@example.com",
+            "tags": ["string"],
+            "status": "active",
+        }
+        assert server.find_response("GET", "/v1/users/42") is response
+        assert server.find_response("POST", "/v1/users").body["name"] == "张三"
+        assert server.find_response("DELETE", "/v1/users/42").status_code == 204
+        assert server.find_response("GET", "/v1/users/42/orders") is None
+        assert server.get_call_count("GET", "/v1/users/{user_id}") == 2
+
+    def test_load_large_spec(self):
+        """测试1000个接口的文档：模板规则按固定前缀索引，每次请求只匹配前缀相同的规则"""
+        spec = {
+            "openapi": "3.0.0",
+            "paths": {
+                f"/api/resource{i}/{{item_id}}": {
+                    "get": {
+                        "responses": {
+                            # YAML中的状态码可能混用int和str
+                            200 if i % 2 else "200": {
+                                "content": {
+                                    "application/json": {
+                                        "schema": {"type": "object", "properties": {}}
+                                    }
+                                }
+                            }
+                        }
+                    }
+                }
+                for i in range(1000)
+            },
+        }
+
+        spec["paths"]["/api/resource0/{item_id}"]["get"]["responses"]["201"] = {}
+        server = MockServer().load_openapi(spec)
+        assert len(server.rules) == 1000
+        assert server.find_response("GET", "/api/resource999/1").status_code == 200
+        assert server.find_response("GET", "/api/resource0/1").status_code == 200
+        assert [
+            rule.path for rule in server._template_candidates("GET", "/api/resource7/1")
+        ] == ["/api/resource7/{item_id}"]
+
+    def test_template_rule_order(self):
+        """测试不同前缀的模板规则仍按添加顺序匹配"""
+        server = MockServer()
+        server.add_rule("GET", "/{tenant}/users/{id}", create_mock_response(200, 1))
+        server.add_rule("GET", "/api/users/{id}", create_mock_response(200, 2))
+        server.add_rule("GET", "/api/{name}", create_mock_response(200, 3))
+
+        assert server.find_response("GET", "/api/users/1").body == 1
+        assert server.find_response("GET", "/api/orders").body == 3
+        assert server.find_response("GET", "/api/users/1/orders") is None
+        server.reset_rules()
+        assert server.find_response("GET", "/api/users/1") is None
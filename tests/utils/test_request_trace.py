@@ -0,0 +1,56 @@
+"""
+请求追踪日志测试
+"""
+
+from src.client.base_client import BaseClient
+from src.utils.datasovle import DataSovle
+from src.utils.mock_server import MockServer, create_mock_response
+
+
+class TestRequestTrace:
+    """请求追踪日志测试"""
+
+    def test_request_trace(self, tmp_path):
+        """测试请求追踪写入JSONL并由DataSovle读取分析"""
+        from src.utils.request_trace import RequestTracer
+
+        server = MockServer(port=0)
+        server.add_rule("POST", "/api/users", create_mock_response(201, {"id": 1}))
+        server.add_rule("GET", "/api/users/1", create_mock_response(200, {"id": 1}))
+        server.start()
+        tracer = RequestTracer(str(tmp_path / "trace.jsonl"), body_limit=8)
+        try:
+            client = BaseClient(server.base_url)
+            client.session.hooks["response"].append(tracer.hook)
+            for _ in range(3):
+                client.post("/api/users", json={"name": "张三"})
+            client.get("/api/users/1", params={"verbose": 1})
+        finally:
+            tracer.close()
+            server.stop()
+
+        solve = DataSovle()
+        df = solve.read_traces(str(tmp_path))
+        assert len(df) == 4
+        assert df["path"].tolist() == ["/api/users"] * 3 + ["/api/users/1"]
+        assert df["status"].tolist() == [201, 201, 201, 200]
+        assert (df["elapsed_ms"] >= 0).all()
+        assert df["request_body"].iloc[0] == '{"name":'
+        assert df["response_bytes"].tolist() == [len(b'{"id": 1}')] * 4
+        assert df["nodeid"].iloc[0].endswith("test_request_trace")
+        report = solve.df_group_report("path", "elapsed_ms", aggregates=["count"])
+        assert report["elapsed_ms_count"].tolist() == [3, 1]
+
+    def test_response_size(self):
+        """测试响应大小取实际内容长度，流式请求的异常响应头不影响请求"""
+        from requests import Response
+
+        from src.utils.request_trace import _response_size
+
+        resp = Response()
+        resp._content = b"x" * 10
+        resp.headers["Content-Length"] = "4"
+        assert _response_size(resp, stream=False) == 10
+        assert _response_size(resp, stream=True) == 4
+        resp.headers["Content-Length"] = "4, 4"
+        assert _response_size(resp, stream=True) == -1
@@ -0,0 +1,194 @@
+"""
+GET/HEAD响应缓存测试
+"""
+
+import requests
+
+from src.client.base_client import BaseClient
+from src.utils.mock_server import MockServer, create_mock_response
+from src.utils.response_cache import CachingAdapter, ResponseCache
+
+
+class TestResponseCache:
+    """GET/HEAD响应缓存测试"""
+
+    @staticmethod
+    def stub_server(monkeypatch, handler):
+        """替换真实的网络发送，handler(request) 返回 (状态码, 响应头, 响应体)"""
+        sent = []
+
+        def send(adapter, request, **kwargs):
+            sent.append(dict(request.headers))
+            status, headers, body = handler(request)
+            response = requests.Response()
+            response.status_code = status
+            response.headers = requests.structures.CaseInsensitiveDict(headers)
+            response._content = body
+            response._content_consumed = True
+            response.url = request.url
+            response.request = request
+            return response
+
+        monkeypatch.setattr(requests.adapters.HTTPAdapter, "send", send)
+        return sent
+
+    @staticmethod
+    def cached_session(cache):
+        session = requests.Session()
+        session.mount("http://", CachingAdapter(cache))
+        return session
+
+    def test_rules_and_invalidation(self):
+        """测试按路径的缓存时间，以及写请求后删除同一URL的缓存"""
+        server = MockServer(port=0)
+        server.add_rule(
+            "GET", "/api/config/site", create_mock_response(200, {"name": "qa"})
+        )
+        server.add_rule("POST", "/api/config/site", create_mock_response(200, {}))
+        server.add_rule("GET", "/api/user/list", create_mock_response(200, []))
+        server.start()
+        try:
+            cache = ResponseCache(rules={"/api/config/*": 60})
+            client = BaseClient(server.base_url, response_cache=cache)
+            responses = [client.get("/api/config/site") for _ in range(3)]
+            client.get("/api/user/list")
+            client.get("/api/user/list")
+            client.post("/api/config/site", json={"name": "dev"})
+            client.get("/api/config/site")
+
+            assert [resp.from_cache for resp in responses] == [False, True, True]
+            assert responses[2].json() == {"name": "qa"}
+            # 没有缓存规则和缓存头的接口不缓存
+            assert server.get_call_count("GET", "/api/user/list") == 2
+            assert server.get_call_count("GET", "/api/config/site") == 2
+        finally:
+            server.stop()
+        assert cache.stats.totals() == {
+            "hits": 2,
+            "misses": 4,
+            "revalidated": 0,
+            "hit_rate": 0.3333,
+        }
+        assert cache.stats.summary()["/api/config/site"]["hits"] == 2
+
+    def test_cache_control_and_revalidation(self, monkeypatch):
+        """测试Cache-Control、ETag条件请求、Vary和鉴权信息隔离"""
+
+        def handler(request):
+            if request.url.endswith("/nostore"):
+                return 200, {"Cache-Control": "no-store, max-age=60"}, b"{}"
+            if request.headers.get("If-None-Match") == '"v1"':
+                return 304, {"ETag": '"v1"', "Cache-Control": "max-age=60"}, b""
+            return (
+                200,
+                {"ETag": '"v1"', "Content-Type": "application/json"},
+                b'{"v": 1}',
+            )
+
+        sent = self.stub_server(monkeypatch, handler)
+        cache = ResponseCache()
+        session = self.cached_session(cache)
+        url = "http://localhost:1/api/user/currentUser"
+
+        first = session.get(url)
+        revalidated = session.get(url)
+        hit = session.get(url)
+        assert "If-None-Match" not in sent[0]
+        assert sent[1]["If-None-Match"] == '"v1"'
+        assert len(sent) == 2
+        assert revalidated.status_code == 200 and revalidated.json() == {"v": 1}
+        assert revalidated.headers["Cache-Control"] == "max-age=60"
+        assert revalidated.headers["Content-Type"] == "application/json"
+        assert (first.from_cache, revalidated.from_cache, hit.from_cache) == (
+            False,
+            True,
+            True,
+        )
+
+        # 请求头要求不使用缓存、不同的鉴权信息都会请求服务端
+        session.get(url, headers={"Cache-Control": "no-cache"})
+        session.get(url, headers={"Authorization": "Bearer other"})
+        session.get("http://localhost:1/nostore")
+        session.get("http://localhost:1/nostore")
+        assert len(sent) == 6
+        assert cache.stats.totals()["revalidated"] == 2
+
+    def test_vary(self, monkeypatch):
+        """测试响应的Vary头：请求头不同时不使用缓存"""
+        self.stub_server(
+            monkeypatch,
+            lambda request: (
+                200,
+                {"Cache-Control": "max-age=60", "Vary": "Accept"},
+                b"",
+            ),
+        )
+        session = self.cached_session(ResponseCache())
+        url = "http://localhost:1/api/items"
+        assert not session.get(url, headers={"Accept": "a"}).from_cache
+        assert session.get(url, headers={"Accept": "a"}).from_cache
+        assert not session.get(url, headers={"Accept": "b"}).from_cache
+
+    def test_lru_and_disk(self, monkeypatch, tmp_path):
+        """测试内存LRU淘汰，以及磁盘缓存在新的缓存实例（如其他worker）中复用"""
+        sent = self.stub_server(
+            monkeypatch, lambda request: (200, {"Cache-Control": "max-age=60"}, b"ok")
+        )
+        cache = ResponseCache(max_entries=2, cache_dir=tmp_path, max_disk_entries=3)
+        session = self.cached_session(cache)
+        urls = [f"http://localhost:1/api/items/{i}" for i in range(4)]
+        for url in urls:
+            session.get(url)
+        assert len(cache) == 2
+        assert len(list(tmp_path.glob("*.pkl"))) == 3
+
+        other = self.cached_session(ResponseCache(cache_dir=tmp_path))
+        assert other.get(urls[-1]).from_cache
+        assert other.get(urls[-1]).text == "ok"
+        assert len(sent) == 4
+
+    def test_shared_disk_invalidation(self, monkeypatch, tmp_path):
+        """测试共享磁盘缓存时，其他worker的删除和更新对本进程的内存缓存生效"""
+        bodies = iter([b"v1", b"v2", b"v3"])
+        sent = self.stub_server(
+            monkeypatch,
+            lambda request: (
+                (200, {"Cache-Control": "max-age=60"}, next(bodies))
+                if request.method == "GET"
+                else (200, {}, b"")
+            ),
+        )
+        url = "http://localhost:1/api/config"
+        worker = self.cached_session(ResponseCache(cache_dir=tmp_path))
+        other = self.cached_session(ResponseCache(cache_dir=tmp_path))
+
+        assert worker.get(url).text == "v1"
+        assert other.get(url).text == "v1"
+        assert len(sent) == 1
+
+        # 其他worker修改数据后删除缓存，本进程内存中的响应随之失效
+        other.post(url)
+        assert worker.get(url).text == "v2"
+        assert worker.get(url).from_cache
+        # 其他worker写入了新的响应，本进程读取磁盘上的新响应
+        other.adapters["http://"].cache.clear()
+        assert other.get(url).text == "v3"
+        assert worker.get(url).text == "v3"
+        assert len(sent) == 4
+
+    def test_cookie_in_key(self, monkeypatch):
+        """测试不同Cookie（登录态）的响应分开缓存"""
+        sent = self.stub_server(
+            monkeypatch,
+            lambda request: (
+                200,
+                {"Cache-Control": "max-age=60"},
+                request.headers.get("Cookie", "").encode(),
+            ),
+        )
+        session = self.cached_session(ResponseCache())
+        url = "http://localhost:1/api/user/currentUser"
+        assert session.get(url, cookies={"session": "a"}).text == "session=a"
+        assert session.get(url, cookies={"session": "b"}).text == "session=b"
+        assert session.get(url, cookies={"session": "a"}).from_cache
+        assert len(sent) == 2
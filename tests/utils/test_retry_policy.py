@@ -0,0 +1,105 @@
+"""
+重试策略测试
+"""
+
+import pytest
+import requests
+
+from src.utils.retry_policy import RetryBudget, RetryPolicy
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, headers: dict = None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class TestRetryPolicy:
+    """重试策略测试"""
+
+    @staticmethod
+    def sequence(*results):
+        """依次返回/抛出results中的结果"""
+        results = list(results)
+
+        def send():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        return send
+
+    def test_retry_statuses_and_retry_after(self):
+        """测试按状态码重试，优先使用Retry-After"""
+        sleeps = []
+        policy = RetryPolicy(max_attempts=4, base_delay=1, sleep=sleeps.append)
+        send = self.sequence(
+            requests.ConnectionError("reset"),
+            FakeResponse(429, {"Retry-After": "2"}),
+            FakeResponse(502),
+            FakeResponse(200),
+        )
+
+        assert policy.call("GET /api/users", send).status_code == 200
+        assert len(sleeps) == 3
+        assert 0 <= sleeps[0] <= 1 and sleeps[1] == 2 and 0 <= sleeps[2] <= 4
+        assert policy.metrics.summary()["GET /api/users"] == {
+            "requests": 1,
+            "retries": 3,
+            "retry:ConnectionError": 1,
+            "retry:429": 1,
+            "retry:502": 1,
+        }
+
+        # 不重试的状态码和异常
+        assert policy.call("GET /", self.sequence(FakeResponse(500))).status_code == 500
+        with pytest.raises(ValueError):
+            policy.call("GET /", self.sequence(ValueError("bad")))
+        # 重试用尽后抛出最后一次的异常
+        with pytest.raises(requests.Timeout):
+            policy.call("GET /", self.sequence(*[requests.Timeout()] * 4))
+        assert policy.metrics.summary()["GET /"]["gave_up"] == 1
+
+    def test_backoff_full_jitter(self):
+        """测试全抖动退避时间的范围"""
+        policy = RetryPolicy(base_delay=0.5, max_delay=4)
+        for retry_number, cap in [(0, 0.5), (1, 1), (2, 2), (3, 4), (10, 4)]:
+            delays = [policy.backoff(retry_number) for _ in range(200)]
+            assert all(0 <= delay <= cap for delay in delays)
+            assert max(delays) > cap / 2
+
+        date = "Wed, 21 Oct 2015 07:28:00 GMT"
+        assert RetryPolicy.retry_after(FakeResponse(503, {"Retry-After": date})) == 0
+        assert RetryPolicy.retry_after(FakeResponse(503, {"Retry-After": "x"})) is None
+
+        # Retry-After 超过上限时不等待，直接返回响应
+        sleeps = []
+        policy = RetryPolicy(max_retry_after=5, sleep=sleeps.append)
+        response = policy.call(
+            "GET /",
+            self.sequence(FakeResponse(503, {"Retry-After": "60"}), FakeResponse(200)),
+        )
+        assert response.status_code == 503
+        assert sleeps == []
+        assert policy.metrics.summary()["GET /"] == {
+            "requests": 1,
+            "retry_after_exceeded": 1,
+        }
+
+    def test_retry_budget(self):
+        """测试重试预算限制重试放大"""
+        budget = RetryBudget(ratio=0.1, initial=2)
+        policy = RetryPolicy(max_attempts=3, budget=budget, sleep=lambda delay: None)
+        calls = []
+
+        def send():
+            calls.append(1)
+            return FakeResponse(503)
+
+        for _ in range(20):
+            policy.call("GET /api/down", send)
+        # 20个请求：初始2次 + 每个请求0.1次，最多约4次重试
+        assert len(calls) - 20 <= 4
+        assert budget.exhausted >= 16
+        assert policy.metrics.summary()["GET /api/down"]["budget_exhausted"] >= 16